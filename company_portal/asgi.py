@@ -3,6 +3,10 @@ ASGI config for company_portal project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve with an ASGI server (e.g. ``uvicorn company_portal.asgi:application``)
+so long-lived streams such as /api/employees/stream/ (people/stream.py) do not
+hold a thread each.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +17,7 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'company_portal.settings')
 
+# Async read views for the employee list/detail endpoints (people/async_views.py)
+os.environ.setdefault('PEOPLE_ASYNC_READS', 'True')
+
 application = get_asgi_application()
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import sys
+import tempfile
 from pathlib import Path
 from decouple import config
 from datetime import timedelta  # NEW: Added for JWT token lifetime configuration
@@ -39,6 +41,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',                     # NEW: pg_trgm lookups for fuzzy search
     'hr',
     'people',
     'rest_framework',
@@ -48,6 +51,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'people.metrics.MetricsMiddleware',  # NEW: First, so request latency covers every middleware
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # MOVED: Must be high in middleware stack for CORS
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -129,8 +133,16 @@ SIMPLE_JWT = {
     # Token classes
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    
+    # Stamp the HR role into tokens on login and re-resolve it on refresh
+    'TOKEN_OBTAIN_SERIALIZER': 'people.serializers.HRTokenObtainPairSerializer',
+    'TOKEN_REFRESH_SERIALIZER': 'people.serializers.HRTokenRefreshSerializer',
 }
 
+# Authorize employee endpoints from the JWT role claim alone (no auth_user/groups queries).
+# Set to False to load the user from the database on every request instead.
+HR_STATELESS_AUTH = config('HR_STATELESS_AUTH', default=True, cast=bool)
+
 
 ROOT_URLCONF = 'company_portal.urls'
 
@@ -188,11 +200,130 @@ DATABASES = {
         'HOST': config('DB_HOST', default='localhost'),
         'PORT': config('DB_PORT', default='5432'),
         'OPTIONS': {
-            'sslmode': 'require',  # Supabase requires SSL
+            'sslmode': config('DB_SSLMODE', default='require'),  # Supabase requires SSL
         }
     }
 }
 
+# NEW: Database connection handling (see people/pooling.py)
+#   DB_POOL=True  - each worker process keeps a psycopg 3 connection pool (Django's
+#                   "pool" option), so requests skip the TCP/TLS/auth handshake
+#   DB_POOL=False - a new connection per request, unless DB_CONN_MAX_AGE keeps it open
+DB_POOL = config('DB_POOL', default=False, cast=bool)
+if DB_POOL:
+    DATABASES['default']['OPTIONS']['pool'] = {
+        'min_size': config('DB_POOL_MIN_SIZE', default=2, cast=int),
+        'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+        # Seconds a request waits for a free connection before failing
+        'timeout': config('DB_POOL_TIMEOUT', default=10, cast=float),
+        # Seconds before idle connections above min_size are closed / any connection is replaced
+        'max_idle': config('DB_POOL_MAX_IDLE', default=600, cast=float),
+        'max_lifetime': config('DB_POOL_MAX_LIFETIME', default=3600, cast=float),
+    }
+else:
+    DATABASES['default']['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=0, cast=int)
+# Test a reused connection before handing it out (one round trip, replaces dead ones)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=DB_POOL, cast=bool)
+
+# NEW: Optional read replica (e.g. a Supabase read replica). Employee and user
+# list reads go there, writes and everything else to "default" (people/routers.py).
+# Credentials default to the primary's.
+if config('DB_REPLICA_HOST', default=''):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': config('DB_REPLICA_NAME', default=DATABASES['default']['NAME']),
+        'USER': config('DB_REPLICA_USER', default=DATABASES['default']['USER']),
+        'PASSWORD': config('DB_REPLICA_PASSWORD', default=DATABASES['default']['PASSWORD']),
+        'HOST': config('DB_REPLICA_HOST'),
+        'PORT': config('DB_REPLICA_PORT', default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},  # no test database on the replica host
+    }
+
+''' To test the read replica with sqlite (two files; copy dev.db to
+dev_replica.db to "replicate"). Run the test suite with PEOPLE_REPLICA_READS=False:
+the replica starts empty, and the routing tests in people/tests.py switch
+replica reads back on themselves.
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "dev.db",
+    },
+    "replica": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "dev_replica.db",
+    },
+}
+'''
+
+DATABASE_ROUTERS = ['people.routers.ReadReplicaRouter']
+
+# NEW: Send reads to the "replica" database when there is one (off = everything on the
+# primary). Turn it off to run the test suite against a configured replica.
+PEOPLE_REPLICA_READS = config('PEOPLE_REPLICA_READS', default=True, cast=bool)
+
+# NEW: After a write, the writer reads from the primary for this many seconds so
+# they see their own change despite replication lag. The pin is kept in the
+# "people" cache below, which must then be shared by every worker (system check people.E001)
+PEOPLE_REPLICA_STICKY_SECONDS = config('PEOPLE_REPLICA_STICKY_SECONDS', default=10, cast=int)
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+#
+# "people" holds cached PersonViewSet read responses and the people version
+# that invalidates them and the in-process indexes (see people/cache.py), plus
+# the replica read-your-writes pins (people/routers.py). Every worker must see
+# the same entries, so it defaults to FileBasedCache - shared by the workers of
+# one host. Across hosts use Redis or Memcached, e.g.
+#   PEOPLE_CACHE_BACKEND=django.core.cache.backends.redis.RedisCache
+#   PEOPLE_CACHE_LOCATION=redis://127.0.0.1:6379
+# The test suite (manage.py test) keeps a per-process LocMemCache.
+
+# NEW: True while running the test suite
+TESTING = sys.argv[1:2] == ['test']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'people': {
+        'BACKEND': config(
+            'PEOPLE_CACHE_BACKEND',
+            default='django.core.cache.backends.locmem.LocMemCache' if TESTING
+            else 'django.core.cache.backends.filebased.FileBasedCache',
+        ),
+        'LOCATION': config('PEOPLE_CACHE_LOCATION', default=str(Path(tempfile.gettempdir()) / 'acdc_people_cache')),
+        'TIMEOUT': config('PEOPLE_CACHE_TIMEOUT', default=300, cast=int),
+    },
+}
+
+PEOPLE_CACHE_ENABLED = config('PEOPLE_CACHE_ENABLED', default=True, cast=bool)
+PEOPLE_CACHE_ALIAS = 'people'
+
+# NEW: Delta sync (GET /api/employees/changes/) holds back rows updated in the
+# last N seconds so writes still committing are not skipped (see people/sync.py)
+PEOPLE_SYNC_SETTLE_SECONDS = config('PEOPLE_SYNC_SETTLE_SECONDS', default=5, cast=int)
+
+# NEW: Person change events for GET /api/employees/stream/ (see people/events.py)
+#   local    - fan-out inside each process (single worker)
+#   postgres - LISTEN/NOTIFY, so every worker sees every write
+PEOPLE_EVENTS_BACKEND = config('PEOPLE_EVENTS_BACKEND', default='local')
+
+# NEW: Departed people (end_date or inactive) untouched for this many days are
+# moved to people_archive by `python manage.py archive_people` (see people/archive.py)
+PEOPLE_ARCHIVE_AFTER_DAYS = config('PEOPLE_ARCHIVE_AFTER_DAYS', default=365, cast=int)
+
+# NEW: Serve list/retrieve/filter_employees from async views with the async ORM
+# (people/async_views.py). company_portal/asgi.py switches this on by default.
+PEOPLE_ASYNC_READS = config('PEOPLE_ASYNC_READS', default=False, cast=bool)
+
+# NEW: Per-route latency/query/response-size histograms, served to superusers
+# in the Prometheus format at GET /api/metrics/ (see people/metrics.py)
+PEOPLE_METRICS_ENABLED = config('PEOPLE_METRICS_ENABLED', default=True, cast=bool)
+
+# NEW: Static secret Prometheus scrapes /api/metrics/ with
+# (Authorization: Metrics <token>) - access tokens expire. Empty = superusers only
+PEOPLE_METRICS_TOKEN = config('PEOPLE_METRICS_TOKEN', default='')
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
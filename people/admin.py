@@ -1,7 +1,7 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Person
+from .models import ArchivedPerson, Person
 
 @admin.register(Person)
 class PersonAdmin(admin.ModelAdmin):
@@ -50,3 +50,20 @@ class PersonAdmin(admin.ModelAdmin):
     
     # How many items per page
     list_per_page = 25
+
+
+@admin.register(ArchivedPerson)
+class ArchivedPersonAdmin(admin.ModelAdmin):
+    # Departed people moved out of the people table (see people/archive.py).
+    # Read-only: restore through POST /api/employees/{id}/restore/
+    list_display = ['full_name', 'acdc_email', 'department', 'status', 'end_date', 'archived_at']
+    list_filter = ['department', 'status']
+    search_fields = ['full_name', 'acdc_email']
+    ordering = ['full_name']
+    list_per_page = 25
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -4,3 +4,17 @@ from django.apps import AppConfig
 class PeopleConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'people'
+
+    def ready(self):
+        # Register Person signal receivers (cache invalidation, in-process indexes)
+        from . import signals  # noqa: F401
+
+        # Count every query of every database connection for the request metrics
+        from django.db.backends.signals import connection_created
+        from .metrics import install_query_counter
+        connection_created.connect(install_query_counter, dispatch_uid='people_query_metrics')
+
+        # Replica reads need the read-your-writes pin in a shared cache
+        from django.core import checks
+        from .routers import check_sticky_cache
+        checks.register(check_sticky_cache, checks.Tags.caches)
@@ -0,0 +1,163 @@
+"""
+Archive of Departed People (hot / cold tables)
+
+Departed people stay in the people table forever otherwise, and every list,
+filter, search index and admin changelist pays for them. Archive passes move
+them to people_archive (ArchivedPerson, same columns and ids):
+
+    python manage.py archive_people            # e.g. nightly from cron
+
+A person is archived once they are departed - an end_date more than
+PEOPLE_ARCHIVE_AFTER_DAYS ago, or status "inactive" - and their record has
+not been updated for that long either. People who still manage someone in
+the people table are kept, so nobody loses their manager or org chart
+position. A restored person (updated_at = the restore) stays for another
+retention period.
+
+A pass walks the people table in id order (keyset, like the pagination) and
+moves ARCHIVE_BATCH_SIZE people per transaction: the rows are locked and
+re-checked, copied to people_archive with one INSERT and deleted with one
+DELETE by delete_people(), the bulk delete of people/bulk.py. It does what
+the delete signals would per person in a few statements: each person is
+recorded as deleted in the change history (changed_by = the archiver) - delta
+sync clients get tombstones, the live API simply no longer has them - and the
+headcount summary, hierarchy, search indexes and people version are updated. Short
+transactions keep the pass out of the way of API writes.
+
+Archived people stay reachable:
+- ?include_archived=1 on list, filter_employees and retrieve adds them
+  (with "archived_at")
+- POST /api/employees/{id}/restore/ (restore_person) moves one back, with its
+  original id, recorded as a create
+
+Settings:
+    PEOPLE_ARCHIVE_AFTER_DAYS = 365   # retention before departed people are archived
+"""
+
+import datetime
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, Exists, OuterRef, Q, Value
+from django.utils import timezone
+
+from .bulk import delete_people
+from .models import ArchivedPerson, Person
+
+# People moved per transaction
+ARCHIVE_BATCH_SIZE = 1000
+
+# Columns copied between people and people_archive (manager as the id)
+ARCHIVE_COLUMNS = [field.name for field in Person._meta.concrete_fields]
+
+
+class RestoreConflict(ValueError):
+    """The archived person's email now belongs to someone in the people table"""
+
+
+def retention_days():
+    return getattr(settings, 'PEOPLE_ARCHIVE_AFTER_DAYS', 365)
+
+
+def archive_cutoff(days=None, now=None):
+    """People departed (and untouched) before this moment are archived - days defaults to the setting"""
+    days = retention_days() if days is None else days
+    return (now or timezone.now()) - datetime.timedelta(days=days)
+
+
+def archivable(cutoff):
+    """Person queryset of everyone an archive pass would move at cutoff"""
+    departed = Q(end_date__lt=cutoff.date()) | Q(end_date__isnull=True, status='inactive')
+    manages_someone = Exists(Person.objects.filter(manager=OuterRef('pk')))
+    return Person.objects.filter(departed, updated_at__lt=cutoff).exclude(manages_someone)
+
+
+def archive_batch(ids, cutoff, actor=None):
+    """
+    Move the given people to the archive in one transaction - those still
+    archivable once locked. Returns the number moved.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        rows = list(
+            archivable(cutoff).filter(id__in=ids).select_for_update().values(*ARCHIVE_COLUMNS)
+        )
+        if not rows:
+            return 0
+        ArchivedPerson.objects.bulk_create([
+            ArchivedPerson(**row, archived_at=now, archived_by=actor) for row in rows
+        ])
+
+        # What the delete signals do per person, once per batch - nobody
+        # reports to them, so no manager is cleared
+        delete_people({row['id']: row for row in rows})
+    return len(rows)
+
+
+def archive_people(cutoff=None, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None, actor=None, progress=None):
+    """
+    One archive pass. Returns the number of people archived.
+
+    progress(archived_so_far) is called after every batch.
+    """
+    cutoff = cutoff or archive_cutoff()
+    archived = 0
+    batches = 0
+    last_id = 0
+    while max_batches is None or batches < max_batches:
+        ids = list(
+            archivable(cutoff).filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+        )
+        if not ids:
+            break
+        last_id = ids[-1]
+        archived += archive_batch(ids, cutoff, actor)
+        batches += 1
+        if progress:
+            progress(archived)
+    return archived
+
+
+def restore_person(person_id):
+    """
+    Move an archived person back to the people table with their original id.
+
+    Returns the Person. Raises ArchivedPerson.DoesNotExist when the id is not
+    archived and RestoreConflict when their email is taken meanwhile. The
+    manager is kept only if they are still in the people table.
+    """
+    with transaction.atomic():
+        row = ArchivedPerson.objects.select_for_update().filter(pk=person_id).values(*ARCHIVE_COLUMNS).first()
+        if row is None:
+            raise ArchivedPerson.DoesNotExist(f'Person {person_id} is not archived')
+
+        for field in ('acdc_email', 'personal_email'):
+            if row[field] and Person.objects.filter(
+                Q(acdc_email=row[field]) | Q(personal_email=row[field])
+            ).exists():
+                raise RestoreConflict(f'{row[field]} now belongs to another person')
+
+        manager_id = row.pop('manager')
+        if manager_id is not None and not Person.objects.filter(pk=manager_id).exists():
+            manager_id = None
+        created_at = row.pop('created_at')
+
+        # save(): validation, history "create", headcount, hierarchy, indexes
+        person = Person(**row, manager_id=manager_id)
+        person.save(force_insert=True)
+        # auto_now_add stamped created_at - keep the original
+        Person.objects.filter(pk=person.pk).update(created_at=created_at)
+        person.created_at = created_at
+
+        ArchivedPerson.objects.filter(pk=person_id).delete()
+    return person
+
+
+def archived_rows(queryset, columns):
+    """ArchivedPerson values() queryset with the given Person columns plus archived_at"""
+    return queryset.values(*columns, 'archived_at')
+
+
+def live_rows(queryset, columns):
+    """Person values() queryset lined up with archived_rows() (archived_at NULL)"""
+    return queryset.annotate(archived_at=Value(None, output_field=DateTimeField())).values(*columns, 'archived_at')
@@ -0,0 +1,280 @@
+"""
+Async Read Path for Employees (ASGI)
+
+DRF views are synchronous, so under ASGI every request to PersonViewSet runs
+through sync_to_async and waits its turn for a thread. The hot read endpoints
+have native async versions here, installed in front of the router when
+settings.PEOPLE_ASYNC_READS is on (company_portal/asgi.py turns it on):
+
+    GET /api/employees/                        → alist()
+    GET /api/employees/{id}/                   → aretrieve()
+    GET /api/employees/filter_employees/       → afilter_employees()
+
+They produce the same responses as PersonViewSet (PersonFastSerializer rows,
+cursor pagination, ETag/304, the versioned response cache) and await the async
+ORM (aaggregate, aget, async iteration) and async cache calls. That does not
+overlap database waits: in Django 5.2 the async ORM runs each query through
+sync_to_async(thread_sensitive=True), one at a time on the shared sync thread.
+What it saves is the thread itself - a request holds no worker thread while it
+waits on the cache or between queries, so the event loop keeps serving other
+requests and the SSE streams (people/events.py) in the meantime. retrieve
+costs one query instead of two (its validators come from the fetched row).
+
+Authentication and the HR permission check are async too. A JWT that carries
+the role claim (people/authentication.py) is checked without any query; other
+JWTs and sessions load the user asynchronously. Like PersonViewSet, the
+views read from the replica when one is configured (people/routers.py).
+
+Everything else on those URLs - writes, the browsable API (Accept: text/html),
+?format=, ?as_of=, ?include_archived= - is handed to PersonViewSet unchanged.
+"""
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import HttpResponse
+from django.urls import path, re_path
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+
+from .authentication import ROLE_CLAIM, HRClaimsAuthentication
+from .cache import (
+    aget_people_version, build_response_cache_key, cache_entry, entry_response, entry_timeout,
+    get_cache, is_cacheable, is_enabled as cache_enabled,
+)
+from .conditional import alist_validators, detail_etag, not_modified_response, set_validator_headers
+from .models import Person
+from .pagination import PersonCursorPagination
+from .permissions import IsReadOnlyOrAbove, get_token_role, get_user_role
+from .routers import ause_replica, release_replica
+from .serializers import PersonFastSerializer
+
+JSON_RENDERER = JSONRenderer()
+
+
+def json_response(data, status=200, headers=None):
+    """JSON HttpResponse that keeps .data (so it can be cached like a DRF Response)"""
+    response = HttpResponse(JSON_RENDERER.render(data), status=status, headers=headers,
+                            content_type=JSON_RENDERER.media_type)
+    response.data = data
+    patch_vary_headers(response, ('Accept',))
+    return response
+
+
+def exception_response(exc):
+    """Same body and status as DRF's exception handler"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = json_response(data, status=exc.status_code)
+    if isinstance(exc, AuthenticationFailed):
+        response['WWW-Authenticate'] = 'Bearer realm="api"'
+    return response
+
+
+def needs_user_query(user):
+    """True if role checks for user must read the groups table"""
+    return get_token_role(user) is None and not user.is_superuser
+
+
+# ============================================================================
+# AUTHENTICATION / PERMISSIONS
+# ============================================================================
+
+async def authorize_reader(request):
+    """
+    Authenticate the caller (JWT, else session) and require any HR role.
+
+    Returns (user, None), or (None, 401/403 response).
+    """
+    authentication = HRClaimsAuthentication()
+    user = None
+    try:
+        header = authentication.get_header(request)
+        raw_token = authentication.get_raw_token(header) if header is not None else None
+        if raw_token is not None:
+            token = authentication.get_validated_token(raw_token)
+            if getattr(settings, 'HR_STATELESS_AUTH', True) and ROLE_CLAIM in token:
+                user = authentication.get_user(token)          # built from claims, no query
+            else:
+                user = await sync_to_async(authentication.get_user)(token)
+    except AuthenticationFailed as e:
+        return None, exception_response(e)
+
+    if user is None and hasattr(request, 'auser'):
+        user = await request.auser()                       # session (AuthenticationMiddleware)
+    if not user or not user.is_authenticated:
+        return None, json_response({"detail": "Authentication credentials were not provided."}, status=401,
+                                   headers={'WWW-Authenticate': 'Bearer realm="api"'})
+
+    request.user = user
+    permission = IsReadOnlyOrAbove()
+    if needs_user_query(user):
+        allowed = await sync_to_async(permission.has_permission)(request, None)
+    else:
+        allowed = permission.has_permission(request, None)
+    if not allowed:
+        return None, json_response({"detail": permission.message}, status=403)
+    return user, None
+
+
+async def aget_user_role(user):
+    if needs_user_query(user):
+        return await sync_to_async(get_user_role)(user)
+    return get_user_role(user)
+
+
+# ============================================================================
+# RESPONSES
+# ============================================================================
+
+async def acached_response(request, action, build_response, use_last_modified=False):
+    """cached_response() (people/cache.py) for async views - same keys and entries"""
+    if not cache_enabled():
+        return await build_response()
+
+    cache = get_cache()
+    key = build_response_cache_key(
+        request, action, await aget_people_version(), await aget_user_role(request.user)
+    )
+    entry = await cache.aget(key)
+    if entry is not None:
+        return entry_response(request, entry, use_last_modified, response_class=json_response)
+
+    response = await build_response()
+    if is_cacheable(response):
+        await cache.aset(key, cache_entry(response), timeout=entry_timeout())
+    return response
+
+
+async def afast_page_response(request, queryset):
+    """PersonViewSet.fast_page_response() with an async fetch"""
+    serializer = PersonFastSerializer()
+    paginator = PersonCursorPagination()
+    page = await paginator.apaginate_queryset(queryset.values(*serializer.columns), request)
+    serializer.instance, serializer.many = page, True
+    return json_response(paginator.get_paginated_response(serializer.data).data)
+
+
+async def alist_response(request, queryset, action):
+    async def build_response():
+        etag, last_modified = await alist_validators(request, queryset)
+        not_modified = not_modified_response(request, etag)
+        if not_modified is not None:
+            return not_modified
+        try:
+            response = await afast_page_response(request, queryset)
+        except APIException as e:
+            return exception_response(e)
+        return set_validator_headers(response, etag, last_modified)
+
+    return await acached_response(request, action, build_response)
+
+
+# ============================================================================
+# VIEWS
+# ============================================================================
+
+async def alist(request):
+    """GET /api/employees/ (see PersonViewSet.list)"""
+    return await alist_response(request, Person.objects.all(), 'list')
+
+
+async def afilter_employees(request):
+    """GET /api/employees/filter_employees/ (see PersonViewSet.by_department)"""
+    department = request.query_params.get('department')
+    status_filter = request.query_params.get('status')
+    if not department and not status_filter:
+        return json_response(
+            {"error": "Please provide at least one filter: department or status"}, status=400
+        )
+
+    employees = Person.objects.all()
+    if department:
+        employees = employees.filter(department=department)
+    if status_filter:
+        employees = employees.filter(status=status_filter)
+    return await alist_response(request, employees, 'by_department')
+
+
+async def aretrieve(request, pk):
+    """
+    GET /api/employees/{id}/ (see PersonViewSet.retrieve)
+
+    One query: the validators come from the fetched row's updated_at.
+    """
+    async def build_response():
+        serializer = PersonFastSerializer()
+        try:
+            row = await Person.objects.values(*serializer.columns).aget(pk=pk)
+        except Person.DoesNotExist:
+            return json_response({"detail": "No Person matches the given query."}, status=404)
+
+        last_modified = row['updated_at']
+        etag = detail_etag(request, last_modified)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return set_validator_headers(json_response(serializer.to_representation(row)), etag, last_modified)
+
+    return await acached_response(request, 'retrieve', build_response, use_last_modified=True)
+
+
+def handles_async(request):
+    """True for plain JSON reads; everything else goes to PersonViewSet"""
+    accept = request.META.get('HTTP_ACCEPT', '*/*')
+    return (
+        request.method == 'GET'
+        and 'text/html' not in accept
+        and 'indent' not in accept
+        and 'format' not in request.GET
+        and 'as_of' not in request.GET
+        and 'include_archived' not in request.GET
+    )
+
+
+def async_read_view(handler, fallback):
+    """
+    Async view running handler for plain JSON reads and the DRF view
+    (fallback) for everything else.
+    """
+    actions = getattr(fallback, 'actions', {})
+    fallback = sync_to_async(fallback)
+
+    @csrf_exempt            # like DRF views - SessionAuthentication enforces CSRF on writes
+    async def view(request, *args, **kwargs):
+        if not handles_async(request):
+            return await fallback(request, *args, **kwargs)
+
+        _, error = await authorize_reader(request)
+        if error is not None:
+            return error
+
+        drf_request = Request(request)
+        drf_request.user = request.user
+        drf_request.accepted_renderer = JSON_RENDERER
+        drf_request.accepted_media_type = JSON_RENDERER.media_type
+        replica_token = await ause_replica(request.user)
+        try:
+            return await handler(drf_request, *args, **kwargs)
+        finally:
+            release_replica(replica_token)
+
+    # The PersonViewSet action, for the request metrics (people/metrics.py)
+    view.actions = actions
+    return view
+
+
+def async_read_urlpatterns(router):
+    """URL patterns that put the async read views in front of router's PersonViewSet routes"""
+    callbacks = {}
+    for pattern in router.urls:
+        callbacks.setdefault(pattern.name, pattern.callback)
+
+    return [
+        path('api/employees/', async_read_view(alist, callbacks['person-list']), name='person-list'),
+        path('api/employees/filter_employees/',
+             async_read_view(afilter_employees, callbacks['person-by-department']), name='person-by-department'),
+        re_path(r'^api/employees/(?P<pk>[0-9]+)/$', async_read_view(aretrieve, callbacks['person-detail']),
+                name='person-detail'),
+    ]
@@ -9,7 +9,8 @@ SECURITY:
 - User List: Requires superuser authentication
 """
 
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Group, User
+from django.db.models import Prefetch
 from rest_framework import status, generics, permissions
 from rest_framework.response import Response
 from rest_framework.views import APIView
@@ -22,9 +23,11 @@ from .serializers import (
     UserSerializer,
     ChangePasswordSerializer
 )
+from .pagination import UserCursorPagination
+from .routers import ReplicaReadsMixin
 
 
-class UserRegistrationView(generics.CreateAPIView):
+class UserRegistrationView(ReplicaReadsMixin, generics.CreateAPIView):
     """
     POST /api/register/
     
@@ -174,7 +177,7 @@ class ChangePasswordView(APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserListView(generics.ListAPIView):
+class UserListView(ReplicaReadsMixin, generics.ListAPIView):
     """
     GET /api/users/
     
@@ -187,22 +190,31 @@ class UserListView(generics.ListAPIView):
     
     Query Parameters:
     - is_active: Filter by active status (true/false)
+    - page_size: Users per page (default 50, max 500)
+    - cursor: Opaque token from the next/previous links
     
     Response:
-    [
-        {
-            "id": 1,
-            "username": "admin",
-            "email": "admin@acdcco.org",
-            "is_staff": true,
-            ...
-        },
-        {
-            "id": 2,
-            "username": "hr_manager",
+    {
+        "next": "http://.../api/users/?cursor=cD0yMDI0...",
+        "previous": null,
+        "results": [
+            {
+                "id": 1,
+                "username": "admin",
+                "email": "admin@acdcco.org",
+                "is_staff": true,
+                "role": "Superuser",
+                ...
+            },
             ...
-        }
-    ]
+        ]
+    }
+    
+    Roles for the whole page come from a single prefetch query on
+    auth_user_groups, regardless of how many users are listed.
+    
+    Served from the read replica when one is configured, except right after
+    the caller registered a user (see people/routers.py).
     
     Error Responses:
     - 401: Not authenticated
@@ -211,12 +223,17 @@ class UserListView(generics.ListAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsAdminUser]  # SECURED: Only superusers
+    pagination_class = UserCursorPagination
     
     def get_queryset(self):
         """
         Optionally filter users
+        
+        Groups are prefetched so UserSerializer.get_role never queries per user.
         """
-        queryset = User.objects.all().order_by('-date_joined')
+        queryset = User.objects.order_by('-date_joined').prefetch_related(
+            Prefetch('groups', queryset=Group.objects.order_by('id').only('id', 'name'))
+        )
         
         # Filter by active status if provided
         is_active = self.request.query_params.get('is_active', None)
@@ -0,0 +1,94 @@
+"""
+Stateless JWT Authentication with HR Role Claims
+
+Tokens issued by /api/token/ (HRTokenObtainPairSerializer) carry the user's
+resolved HR role, so requests can be authenticated AND authorized without
+touching auth_user or auth_user_groups:
+
+    {
+        "user_id": 5,
+        "username": "hr_manager",
+        "is_superuser": false,
+        "is_staff": false,
+        "role": "HR_ReadWrite",
+        ...
+    }
+
+HRClaimsAuthentication builds an HRTokenUser straight from those claims.
+The permission classes in permissions.py read request.user.hr_role instead of
+querying groups whenever it is present.
+
+Role changes take effect on the next /api/token/refresh/ - the refresh
+serializer re-resolves the role from the database.
+
+Tokens issued before role claims existed have no "role" claim; those fall back
+to the regular database lookup (same behaviour as JWTAuthentication).
+
+Set HR_STATELESS_AUTH = False in settings to always load the user from the
+database (e.g. if deactivated accounts must lose access immediately).
+
+Usage in views:
+    from .authentication import HRClaimsAuthentication
+
+    class PersonViewSet(viewsets.ModelViewSet):
+        authentication_classes = [HRClaimsAuthentication, SessionAuthentication]
+"""
+
+from django.conf import settings
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+# Claim names stamped into access/refresh tokens
+ROLE_CLAIM = 'role'
+USERNAME_CLAIM = 'username'
+SUPERUSER_CLAIM = 'is_superuser'
+STAFF_CLAIM = 'is_staff'
+
+
+def add_role_claims(token, user, role):
+    """
+    Stamp the HR role and basic identity claims into a token.
+
+    Args:
+        token: RefreshToken or AccessToken
+        user: Django User object
+        role: Role name from get_user_role()
+    """
+    token[ROLE_CLAIM] = role
+    token[USERNAME_CLAIM] = user.get_username()
+    token[SUPERUSER_CLAIM] = user.is_superuser
+    token[STAFF_CLAIM] = user.is_staff
+    return token
+
+
+class HRTokenUser(TokenUser):
+    """
+    Stateless user backed by a validated token.
+
+    Exposes hr_role so permission checks never need the groups table.
+    """
+
+    @cached_property
+    def hr_role(self):
+        return self.token.get(ROLE_CLAIM)
+
+
+class HRClaimsAuthentication(JWTAuthentication):
+    """
+    JWT authentication that trusts the role claims in the token.
+
+    - Token has a "role" claim → HRTokenUser (no database query)
+    - Token has no "role" claim → regular User lookup (one query)
+    """
+
+    def get_user(self, validated_token):
+        if not getattr(settings, 'HR_STATELESS_AUTH', True) or ROLE_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+
+        if api_settings.USER_ID_CLAIM not in validated_token:
+            raise InvalidToken("Token contained no recognizable user identification")
+
+        return HRTokenUser(validated_token)
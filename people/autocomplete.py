@@ -0,0 +1,150 @@
+"""
+People Autocomplete (prefix index)
+
+Answers as-you-type lookups for people pickers from worker memory:
+
+    from .autocomplete import autocomplete_people
+
+    autocomplete_people("jo", limit=10)
+    # [{'id': 7, 'full_name': 'John Doe', 'acdc_email': 'john.doe@acdcco.org', ...}, ...]
+
+Every person contributes normalized terms (case-folded, accents stripped,
+whitespace collapsed) to three sorted arrays, searched with bisect:
+1. Full name                       "mary ann smith"
+2. Name from each later word       "ann smith", "smith"
+3. ACDC and personal email         "mary.smith@acdcco.org"
+
+Matches come from the arrays in that order (alphabetical within each), one
+entry per person, so a lookup costs O(log n + limit) with no database access.
+
+The index is kept current from Person signals and the people version
+(see people/indexing.py).
+"""
+
+import unicodedata
+from bisect import bisect_left, insort
+
+from .indexing import PeopleIndex
+
+# Batches larger than this re-sort the arrays instead of inserting one by one
+RESORT_BATCH_SIZE = 1000
+
+# Fields returned for every suggestion
+SUGGESTION_FIELDS = ('id', 'full_name', 'acdc_email', 'department', 'status')
+
+
+def normalize(text):
+    """Lowercase, strip accents and collapse whitespace ("  José  Núñez" → "jose nunez")"""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.casefold().split())
+
+
+def person_terms(full_name, acdc_email, personal_email):
+    """{(tier, term), ...} indexed for one person"""
+    terms = set()
+    words = normalize(full_name).split(' ')
+    if words[0]:
+        terms.add((0, ' '.join(words)))
+        for start in range(1, len(words)):
+            terms.add((1, ' '.join(words[start:])))
+    for email in (acdc_email, personal_email):
+        email = normalize(email)
+        if email:
+            terms.add((2, email))
+    return terms
+
+
+class PrefixIndex(PeopleIndex):
+    """Sorted (term, person_id) arrays per tier, searched with bisect"""
+
+    FIELDS = ('full_name', 'acdc_email', 'personal_email', 'department', 'status')
+    TIERS = 3
+
+    def reset(self):
+        self.tiers = [[] for _ in range(self.TIERS)]   # sorted [(term, person_id), ...]
+        self.terms = {}                                # person id → {(tier, term), ...}
+        self.people = {}                               # person id → suggestion dict
+
+    def __len__(self):
+        return len(self.people)
+
+    def apply(self, people):
+        removed = [set() for _ in range(self.TIERS)]
+        added = [[] for _ in range(self.TIERS)]
+
+        for person_id, values in people.items():
+            for tier, term in self.terms.pop(person_id, ()):
+                removed[tier].add((term, person_id))
+            self.people.pop(person_id, None)
+
+            if values is None:
+                continue
+
+            full_name, acdc_email, personal_email, department, person_status = values
+            terms = person_terms(full_name, acdc_email, personal_email)
+            self.terms[person_id] = terms
+            self.people[person_id] = dict(zip(
+                SUGGESTION_FIELDS, (person_id, full_name, acdc_email, department, person_status)
+            ))
+            for tier, term in terms:
+                added[tier].append((term, person_id))
+
+        for tier, entries in enumerate(self.tiers):
+            gone, new = removed[tier], added[tier]
+            # Re-adding an unchanged term is a no-op
+            unchanged = gone.intersection(new)
+            gone -= unchanged
+            new = [entry for entry in new if entry not in unchanged]
+
+            if len(gone) + len(new) > RESORT_BATCH_SIZE:
+                if gone:
+                    entries[:] = [entry for entry in entries if entry not in gone]
+                entries.extend(new)
+                entries.sort()
+                continue
+
+            for entry in gone:
+                position = bisect_left(entries, entry)
+                if position < len(entries) and entries[position] == entry:
+                    del entries[position]
+            for entry in new:
+                insort(entries, entry)
+
+    def lookup(self, prefix, limit=10):
+        """Up to limit suggestion dicts whose name or email starts with prefix"""
+        prefix = normalize(prefix)
+        if not prefix or limit <= 0:
+            return []
+
+        results = []
+        seen = set()
+        for entries in self.tiers:
+            position = bisect_left(entries, (prefix,))
+            while position < len(entries) and len(results) < limit:
+                term, person_id = entries[position]
+                if not term.startswith(prefix):
+                    break
+                if person_id not in seen:
+                    seen.add(person_id)
+                    results.append(self.people[person_id])
+                position += 1
+        return results
+
+
+_index = PrefixIndex()
+
+
+def get_prefix_index():
+    """The process-wide PrefixIndex, refreshed if people changed"""
+    _index.refresh()
+    return _index
+
+
+def autocomplete_people(prefix, limit=10):
+    """Suggestions for prefix, best tier first (see module docstring)"""
+    index = get_prefix_index()
+    with index.lock:
+        return index.lookup(prefix, limit)
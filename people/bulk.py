@@ -0,0 +1,438 @@
+"""
+Bulk Person Writes (create / upsert / update / delete)
+
+Used by POST /api/employees/bulk/ to load onboarding waves in one request.
+
+Flow:
+1. Validate every row up front (PersonBulkSerializer + Person.clean) - no queries
+2. Check duplicates inside the batch, then against the database in ONE query
+3. Write all valid rows with bulk_create(update_conflicts=True) inside one transaction
+   - New acdc_email      → INSERT
+   - Existing acdc_email → UPDATE of every column except created_at and manager
+     (only the columns the caller sends, for partial sheets - see people/imports.py)
+4. In the same transaction, diff the affected rows before/after the write to
+   update the headcount summary and append change history
+
+Invalid rows are skipped and reported back with their index in the input, so
+HR can fix and resend just those rows.
+
+Identifier-based bulk update/delete (bulk_update_by_identifier,
+bulk_delete_by_identifier) resolve every email and name in ONE query, then
+apply a single UPDATE ... WHERE id IN (...) or DELETE inside one transaction.
+
+Deletes skip the per-person delete signals (people/signals.py) and do their
+work once per batch in delete_people() - also used by archive passes
+(people/archive.py): reports lose their manager, the
+hierarchy, headcount summary, history and search indexes are updated - a fixed
+number of statements however many people go.
+"""
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import connections, router, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework import serializers
+
+from .cache import bump_people_version
+from .headcount import HeadcountDelta, row_values
+from .hierarchy import detach_people
+from .history import diff_rows, history_columns, record_changes
+from .indexing import remove_from_people_indexes
+from .models import Person
+from .serializers import PersonBulkSerializer, PersonSerializer
+
+# Largest array accepted by a single bulk request
+BULK_MAX_ROWS = 1000
+
+# Rows per INSERT ... ON CONFLICT statement
+BULK_BATCH_SIZE = 500
+
+# Largest number of identifiers accepted by bulk update/delete
+BULK_MAX_IDENTIFIERS = 1000
+
+# Unique columns cannot be set to one value on many people at once;
+# manager changes re-parent whole subtrees and go through save() (see people/hierarchy.py)
+BULK_UPDATE_FORBIDDEN_FIELDS = ('acdc_email', 'personal_email', 'manager')
+
+# Columns overwritten when a row's acdc_email already exists (created_at and manager are kept)
+UPSERT_UPDATE_FIELDS = [
+    field.name for field in Person._meta.concrete_fields
+    if field.name not in ('id', 'acdc_email', 'created_at', 'manager')
+]
+
+
+def rows_by_id(queryset, lock=False):
+    """{id: values() row} with every Person column - locked until commit when lock=True"""
+    if lock:
+        queryset = queryset.select_for_update()
+    return {row['id']: row for row in queryset.values(*history_columns())}
+
+
+def record_bulk_write(before, after):
+    """
+    Headcount deltas and history rows for a bulk write, given {id: row}
+    before and after it (ids only in after are creates).
+    """
+    headcount = HeadcountDelta()
+    headcount.add_many([row_values(row) for row in before.values()], -1)
+    headcount.add_many([row_values(row) for row in after.values()])
+    headcount.apply()
+    record_changes(diff_rows(before, after))
+
+
+def row_error(index, errors):
+    """Format a rejected row for the response"""
+    return {"index": index, "errors": errors}
+
+
+def validate_rows(rows, start_index=0):
+    """
+    Validate raw input rows without touching the database.
+
+    Returns:
+        (people, errors) - people is a list of (index, unsaved Person) tuples,
+        errors is a list of row_error() dicts
+    """
+    people = []
+    errors = []
+    seen_acdc_emails = set()
+    seen_personal_emails = set()
+    # One serializer for the whole batch - building a ModelSerializer's fields
+    # costs more than validating a row. run_validation() is what is_valid() runs.
+    validator = PersonBulkSerializer()
+
+    for index, row in enumerate(rows, start=start_index):
+        if not isinstance(row, dict):
+            errors.append(row_error(index, {"non_field_errors": ["Expected an object."]}))
+            continue
+
+        try:
+            validated_data = validator.run_validation(row)
+        except serializers.ValidationError as exc:
+            errors.append(row_error(index, exc.detail))
+            continue
+
+        person = Person(**validated_data)
+        try:
+            # manager is read-only here, so only the in-memory rules apply
+            person.clean_values()
+        except DjangoValidationError as exc:
+            errors.append(row_error(index, exc.message_dict))
+            continue
+
+        # Duplicates inside the same batch would make the upsert ambiguous.
+        # Emails compare case-insensitively, like the identifier lookups.
+        acdc_key = person.acdc_email.lower() if person.acdc_email else None
+        personal_key = person.personal_email.lower() if person.personal_email else None
+        if acdc_key and acdc_key in seen_acdc_emails:
+            errors.append(row_error(index, {"acdc_email": ["Duplicate acdc_email in this batch."]}))
+            continue
+        if personal_key and personal_key in seen_personal_emails:
+            errors.append(row_error(index, {"personal_email": ["Duplicate personal_email in this batch."]}))
+            continue
+
+        if acdc_key:
+            seen_acdc_emails.add(acdc_key)
+        if personal_key:
+            seen_personal_emails.add(personal_key)
+        people.append((index, person))
+
+    return people, errors
+
+
+def check_existing(people):
+    """
+    Compare validated rows with the database in a single query.
+
+    Emails compare case-insensitively, like the identifier lookups: a row
+    whose acdc_email matches a stored one in another case takes the stored
+    spelling, so the upsert updates that person instead of adding a duplicate.
+
+    Returns:
+        (people, errors, existing_acdc_emails) - rows whose personal_email already
+        belongs to a different person are moved to errors
+    """
+    acdc_keys = {person.acdc_email.lower() for _, person in people if person.acdc_email}
+    personal_keys = {person.personal_email.lower() for _, person in people if person.personal_email}
+
+    if not acdc_keys and not personal_keys:
+        return people, [], set()
+
+    existing = Person.objects.annotate(
+        acdc_key=Lower('acdc_email'),
+        personal_key=Lower('personal_email'),
+    ).filter(
+        Q(acdc_key__in=acdc_keys) | Q(personal_key__in=personal_keys)
+    ).values_list('acdc_email', 'personal_email')
+
+    stored_acdc_emails = {}
+    personal_email_owner = {}
+    for acdc_email, personal_email in existing:
+        if acdc_email:
+            stored_acdc_emails.setdefault(acdc_email.lower(), []).append(acdc_email)
+        if personal_email:
+            personal_email_owner[personal_email.lower()] = acdc_email.lower() if acdc_email else None
+
+    accepted = []
+    errors = []
+    for index, person in people:
+        acdc_key = person.acdc_email.lower() if person.acdc_email else None
+        stored = stored_acdc_emails.get(acdc_key, [])
+        if len(stored) > 1:
+            # Case variants stored before emails were compared case-insensitively
+            errors.append(row_error(index, {
+                "acdc_email": ["Several people have this acdc_email in different case."]
+            }))
+            continue
+        if person.personal_email and person.personal_email.lower() in personal_email_owner:
+            owner = personal_email_owner[person.personal_email.lower()]
+            if acdc_key is None or owner != acdc_key:
+                errors.append(row_error(index, {
+                    "personal_email": ["A person with this personal email already exists."]
+                }))
+                continue
+        if stored:
+            person.acdc_email = stored[0]
+        accepted.append((index, person))
+
+    existing_acdc_emails = {emails[0] for emails in stored_acdc_emails.values()}
+    return accepted, errors, existing_acdc_emails
+
+
+def upsert_update_fields(fields=None):
+    """Columns overwritten on conflict - all of UPSERT_UPDATE_FIELDS, or those among fields"""
+    if fields is None:
+        return UPSERT_UPDATE_FIELDS
+    return [field for field in UPSERT_UPDATE_FIELDS if field in fields or field == 'updated_at']
+
+
+def bulk_upsert(rows, start_index=0, fields=None):
+    """
+    Validate and write a batch of person rows.
+
+    fields lists the columns the rows carry (e.g. the header of an imported
+    sheet). Existing people keep their other columns; None means every row is
+    a full record and replaces every column.
+
+    Returns a summary dict:
+        {"created": int, "updated": int, "errors": [row_error, ...]}
+    """
+    people, errors = validate_rows(rows, start_index)
+    people, conflict_errors, existing_acdc_emails = check_existing(people)
+    errors.extend(conflict_errors)
+    errors.sort(key=lambda error: error["index"])
+
+    to_write = [person for _, person in people]
+    updated = sum(1 for person in to_write if person.acdc_email in existing_acdc_emails)
+
+    if to_write:
+        with transaction.atomic():
+            before = rows_by_id(Person.objects.filter(
+                acdc_email__in=[person.acdc_email for person in to_write if person.acdc_email]
+            ), lock=True)
+
+            Person.objects.bulk_create(
+                to_write,
+                batch_size=BULK_BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['acdc_email'],
+                update_fields=upsert_update_fields(fields),
+            )
+            # bulk_create sends no post_save signals
+            after = rows_by_id(Person.objects.filter(pk__in=[person.pk for person in to_write]))
+            record_bulk_write(before, after)
+            bump_people_version()
+
+    return {
+        "created": len(to_write) - updated,
+        "updated": updated,
+        "errors": errors,
+    }
+
+
+# ============================================================================
+# IDENTIFIER-BASED BULK UPDATE / DELETE
+# ============================================================================
+
+def match_summary(person):
+    """Same shape as the 409 "matches" list of update/delete_by_identifier"""
+    return {
+        "full_name": person["full_name"],
+        "email": person["acdc_email"],
+        "department": person["department"],
+        "position": person["position"],
+    }
+
+
+def resolve_identifiers(emails=(), full_names=()):
+    """
+    Resolve emails and full names (case-insensitive) to people in one query.
+
+    Returns:
+        (people, results)
+        people  - {id: values dict} for identifiers that match exactly one person
+        results - one outcome per identifier, in input order:
+                  {"identifier": ..., "type": "email"|"full_name",
+                   "status": "matched"|"not_found"|"ambiguous", ...}
+    """
+    # Drop blanks and repeats while keeping the caller's order
+    emails = list(dict.fromkeys(email for email in emails if email))
+    full_names = list(dict.fromkeys(name for name in full_names if name))
+
+    email_keys = {email.lower() for email in emails}
+    name_keys = {name.lower() for name in full_names}
+
+    rows = Person.objects.annotate(
+        email_key=Lower('acdc_email'),
+        name_key=Lower('full_name'),
+    ).filter(
+        Q(email_key__in=email_keys) | Q(name_key__in=name_keys)
+    ).values()
+
+    by_email = {}
+    by_name = {}
+    for row in rows:
+        by_email.setdefault(row['email_key'], []).append(row)
+        by_name.setdefault(row['name_key'], []).append(row)
+
+    people = {}
+    results = []
+    lookups = [('email', email, by_email) for email in emails] + \
+              [('full_name', name, by_name) for name in full_names]
+
+    for identifier_type, identifier, index in lookups:
+        matches = index.get(identifier.lower(), [])
+        result = {"identifier": identifier, "type": identifier_type}
+
+        if not matches:
+            result["status"] = "not_found"
+        elif len(matches) > 1:
+            result["status"] = "ambiguous"
+            result["matches"] = [match_summary(match) for match in matches]
+        else:
+            person = matches[0]
+            result["status"] = "matched"
+            result["id"] = person["id"]
+            people[person["id"]] = person
+
+        results.append(result)
+
+    return people, results
+
+
+def validate_bulk_changes(changes):
+    """
+    Validate the fields to apply to every matched person.
+
+    Returns:
+        (validated_data, errors) - errors is None when the changes are valid
+    """
+    if not isinstance(changes, dict) or not changes:
+        return None, {"changes": ["Provide a non-empty object of fields to update."]}
+
+    forbidden = [field for field in BULK_UPDATE_FORBIDDEN_FIELDS if field in changes]
+    if forbidden:
+        return None, {field: ["Cannot be changed in a bulk update."] for field in forbidden}
+
+    serializer = PersonSerializer(data=changes, partial=True)
+    if not serializer.is_valid():
+        return None, serializer.errors
+    if not serializer.validated_data:
+        # Only unknown or read-only fields - nothing would change
+        return None, {"changes": [f"No updatable fields in: {', '.join(sorted(changes))}."]}
+
+    return serializer.validated_data, None
+
+
+def bulk_update_people(people, results, changes):
+    """
+    Apply validated changes to all resolved people with one UPDATE statement.
+
+    Person.clean_values() runs against each row's merged values first - in
+    memory, manager cannot change here - and rows that would break a model
+    rule are marked "invalid" in results.
+
+    Returns the number of rows updated.
+    """
+    valid_ids = set()
+    invalid = {}
+    for person_id, values in people.items():
+        merged = {
+            field.attname: values[field.attname] for field in Person._meta.concrete_fields
+        }
+        merged.update(changes)
+        try:
+            Person(**merged).clean_values()
+        except DjangoValidationError as exc:
+            invalid[person_id] = exc.message_dict
+        else:
+            valid_ids.add(person_id)
+
+    for result in results:
+        if result.get("id") in invalid:
+            result["status"] = "invalid"
+            result["errors"] = invalid[result["id"]]
+
+    if not valid_ids:
+        return 0
+
+    with transaction.atomic():
+        queryset = Person.objects.filter(id__in=valid_ids)
+        before = rows_by_id(queryset, lock=True)
+
+        # QuerySet.update() skips auto_now, so stamp updated_at explicitly
+        updated = queryset.update(**changes, updated_at=timezone.now())
+        # QuerySet.update() sends no post_save signals
+        record_bulk_write(before, rows_by_id(queryset))
+        bump_people_version()
+    return updated
+
+
+def delete_people(rows):
+    """
+    Delete people given as {id: values() row} (history_columns(), locked by the
+    caller) with one DELETE, doing once for the batch what the delete signals
+    do per person:
+    - people reporting to them lose their manager, recorded like a bulk update
+    - closure-table links to, from and through them are removed
+    - headcount summary and history ("delete" changes)
+    - the in-process indexes drop them after commit
+
+    Call inside transaction.atomic(). Returns the number deleted.
+    """
+    if not rows:
+        return 0
+    ids = list(rows)
+
+    reports = Person.objects.filter(manager_id__in=ids).exclude(id__in=ids)
+    before = rows_by_id(reports, lock=True)
+    after = {}
+    if before:
+        reports.update(manager=None, updated_at=timezone.now())
+        after = rows_by_id(Person.objects.filter(pk__in=list(before)))
+    detach_people(ids)
+    record_bulk_write({**before, **rows}, after)
+
+    # A plain DELETE - QuerySet.delete() would send the per-person signals
+    using = router.db_for_write(Person)
+    table = connections[using].ops.quote_name(Person._meta.db_table)
+    with connections[using].cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+        deleted = cursor.rowcount
+
+    transaction.on_commit(remove_from_people_indexes(ids), using=using)
+    bump_people_version()
+    return deleted
+
+
+def bulk_delete_people(people):
+    """
+    Delete all resolved people in one transaction (see delete_people()).
+    Returns the number deleted.
+    """
+    if not people:
+        return 0
+
+    with transaction.atomic():
+        return delete_people(rows_by_id(Person.objects.filter(id__in=list(people)), lock=True))
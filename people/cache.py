@@ -0,0 +1,192 @@
+"""
+Versioned Response Cache for PersonViewSet Read Actions
+
+Caches the response data of list, filter_employees and retrieve in the
+"people" cache alias (settings.CACHES). Works with any Django cache backend:
+- FileBasedCache  - shared by every worker on one host (the default)
+- Redis/Memcached - shared across hosts
+- LocMemCache     - single process only (the test suite)
+
+Cache key = people version + caller role + action + host + path + normalized query + media type
+            + source database (primary or read replica)
+
+Invalidation is O(1): every write bumps a global "people version" counter, so
+all older keys simply stop being read and expire on their own TIMEOUT.
+The counter is bumped:
+- post_save / post_delete on Person (see people/signals.py)
+- bulk_upsert / bulk_update_people / bulk_delete_people (see people/bulk.py)
+
+Each bump happens immediately AND again when the surrounding transaction
+commits, so a response computed from pre-commit data can never be cached under
+the post-commit version.
+
+Responses read from the replica (people/routers.py) may still miss a write
+that bumped the version (replication lag), so they expire after
+PEOPLE_REPLICA_STICKY_SECONDS instead of living until the next write.
+
+Settings:
+    PEOPLE_CACHE_ENABLED = True     # turn the cache off entirely
+    PEOPLE_CACHE_ALIAS = 'people'   # which CACHES entry to use
+"""
+
+import datetime
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+from .conditional import not_modified_response
+from .permissions import get_user_role
+from .routers import replica_reads, sticky_seconds
+
+VERSION_KEY = 'people:version'
+
+# Response headers stored with the cached data
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control')
+
+
+def is_enabled():
+    return getattr(settings, 'PEOPLE_CACHE_ENABLED', True)
+
+
+def get_cache():
+    return caches[getattr(settings, 'PEOPLE_CACHE_ALIAS', 'people')]
+
+
+def get_people_version():
+    """
+    Current people version.
+
+    A missing counter (first use, eviction, restart of a locmem cache) is
+    seeded from the clock in milliseconds, so it never reuses an old number.
+    """
+    cache = get_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+async def aget_people_version():
+    """get_people_version() for async views"""
+    cache = get_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    return version
+
+
+def _increment_version():
+    cache = get_cache()
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        # Counter missing - seed it (the seed is always newer than any old version)
+        cache.add(VERSION_KEY, int(time.time() * 1000), timeout=None)
+
+
+def bump_people_version(using=None):
+    """
+    Invalidate every cached people response.
+
+    Bumps now, and once more after the current transaction commits
+    (queued at most once per transaction).
+    """
+    if not is_enabled():
+        return
+
+    _increment_version()
+
+    connection = transaction.get_connection(using)
+    if connection.in_atomic_block:
+        already_queued = any(entry[1] is _increment_version for entry in connection.run_on_commit)
+        if not already_queued:
+            transaction.on_commit(_increment_version, using=using)
+
+
+def response_cache_key(request, action):
+    """Build the cache key for a read request"""
+    return build_response_cache_key(request, action, get_people_version(), get_user_role(request.user))
+
+
+def build_response_cache_key(request, action, version, role):
+    """Cache key from an already known people version and caller role (sync and async views)"""
+    params = sorted(
+        (key, sorted(values)) for key, values in request.GET.lists()
+    )
+    raw = '|'.join([
+        str(version),
+        role,
+        action,
+        request.get_host(),
+        request.path,
+        repr(params),
+        getattr(request, 'accepted_media_type', ''),
+        'replica' if replica_reads.get() else 'primary',
+    ])
+    return 'people:response:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def cached_response(view, request, build_response, use_last_modified=False):
+    """
+    Return a cached response for this request, or build, cache and return it.
+
+    build_response() is only called on a cache miss. Only 200 responses are stored.
+    A cache hit still honours If-None-Match with a 304 (and If-Modified-Since
+    when use_last_modified is True - details only, see people/conditional.py).
+    """
+    if not is_enabled():
+        return build_response()
+
+    cache = get_cache()
+    key = response_cache_key(request, view.action)
+    entry = cache.get(key)
+
+    if entry is not None:
+        return entry_response(request, entry, use_last_modified)
+
+    response = build_response()
+
+    if is_cacheable(response):
+        cache.set(key, cache_entry(response), timeout=entry_timeout())
+
+    return response
+
+
+def entry_response(request, entry, use_last_modified=False, response_class=Response):
+    """Response (or 304) for a cache entry"""
+    headers = entry['headers']
+    etag = headers.get('ETag')
+    if etag:
+        last_modified = None
+        timestamp = parse_http_date_safe(headers.get('Last-Modified', ''))
+        if use_last_modified and timestamp is not None:
+            last_modified = datetime.datetime.fromtimestamp(timestamp, tz=datetime.timezone.utc)
+        not_modified = not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+    return response_class(entry['data'], status=entry['status'], headers=headers)
+
+
+def is_cacheable(response):
+    return response.status_code == 200 and hasattr(response, 'data')
+
+
+def entry_timeout():
+    """Replica responses expire after the stickiness window (see module docstring)"""
+    return sticky_seconds() if replica_reads.get() else DEFAULT_TIMEOUT
+
+
+def cache_entry(response):
+    return {
+        'status': response.status_code,
+        'data': response.data,
+        'headers': {header: response[header] for header in CACHED_HEADERS if header in response},
+    }
@@ -0,0 +1,107 @@
+"""
+Conditional GET Support (ETag / Last-Modified) for Person Endpoints
+
+Lets polling clients skip the query and serialization when nothing changed:
+
+    GET /api/employees/                     → 200 + ETag: W/"3f1c..."
+    GET /api/employees/                     → 304 Not Modified (no body)
+        If-None-Match: W/"3f1c..."
+
+Validators are computed with one cheap query instead of a full fetch:
+- Lists:   SELECT MAX(updated_at), COUNT(id) over the filtered queryset
+           (the ETag also covers path, query string and response format, so
+           every page/filter/ordering gets its own tag; the row count catches deletions)
+- Details: SELECT updated_at for the requested id
+
+Lists only answer 304 from If-None-Match. A deletion does not move
+MAX(updated_at), so If-Modified-Since alone cannot prove a list unchanged -
+Last-Modified is still sent for information.
+"""
+
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Person
+
+
+def make_etag(*parts):
+    """Weak ETag from the given parts"""
+    digest = hashlib.sha1('|'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+    return f'W/"{digest}"'
+
+
+def list_validators(request, queryset):
+    """
+    (etag, last_modified) for a list response over queryset.
+
+    last_modified is a datetime or None for an empty result.
+    """
+    summary = queryset.order_by().aggregate(last_modified=Max('updated_at'), total=Count('pk'))
+    return list_etag(request, summary), summary['last_modified']
+
+
+async def alist_validators(request, queryset):
+    """list_validators() for async views"""
+    summary = await queryset.order_by().aaggregate(last_modified=Max('updated_at'), total=Count('pk'))
+    return list_etag(request, summary), summary['last_modified']
+
+
+def list_etag(request, summary):
+    last_modified = summary['last_modified']
+    return make_etag(
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        getattr(request, 'accepted_media_type', ''),
+        summary['total'],
+        last_modified.isoformat() if last_modified else '',
+    )
+
+
+def detail_validators(request, pk):
+    """
+    (etag, last_modified) for one person, or (None, None) if they do not exist.
+    """
+    try:
+        last_modified = Person.objects.filter(pk=pk).values_list('updated_at', flat=True).first()
+    except (TypeError, ValueError):
+        return None, None
+    return detail_etag(request, last_modified), last_modified
+
+
+def detail_etag(request, last_modified):
+    if last_modified is None:
+        return None
+    return make_etag(
+        request.path,
+        request.META.get('QUERY_STRING', ''),
+        getattr(request, 'accepted_media_type', ''),
+        last_modified.isoformat(),
+    )
+
+
+def set_validator_headers(response, etag, last_modified):
+    """Attach ETag/Last-Modified and make caches revalidate every time"""
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    # Employee data is private to the caller and must be revalidated before reuse
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+
+def not_modified_response(request, etag, last_modified=None):
+    """
+    Return a 304 response if the request's If-None-Match / If-Modified-Since
+    headers show the client already has this representation, else None.
+
+    Pass last_modified=None to decide from the ETag only.
+    """
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        return None
+    return set_validator_headers(response, etag, last_modified)
@@ -0,0 +1,297 @@
+"""
+Person Change Events (Server-Sent Events fan-out)
+
+Pushes every Person create/update/delete to dashboards subscribed to
+GET /api/employees/stream/ (people/stream.py), instead of having them poll.
+
+Events come from the change history: record_changes() (people/history.py)
+hands the PersonChange rows of each write to publish_changes(), so single
+saves, bulk writes and deletes are all covered. An event carries the diff and
+the person's full representation (the last one, for a delete):
+
+    {
+        "id": 981,                     # PersonChange id
+        "action": "update",
+        "person_id": 42,
+        "changed_at": "2025-03-01T09:30:00Z",
+        "changed_by": "hr.admin",
+        "changes": {"status": ["active", "inactive"]},
+        "person": {"id": 42, "full_name": "...", "department": "...", ...}
+    }
+
+Delivery backends (settings.PEOPLE_EVENTS_BACKEND):
+- "local"    - events go straight to this process's broker after the write
+               commits. Enough for one worker.
+- "postgres" - events are sent with pg_notify() inside the writing transaction
+               (PostgreSQL delivers them only on commit, in commit order). Every
+               worker LISTENs on one background connection and fans out to its
+               own subscribers, so writes made by any worker reach everyone.
+
+EventBroker keeps subscribers as asyncio queues on the event loop that serves
+them - an idle subscriber is one queue and one suspended coroutine, not a
+thread. Publishing from a sync thread schedules one callback per loop, which
+then filters and enqueues for each subscriber.
+
+Subscribers that fall too far behind are sent a "resync" event and dropped;
+they reconnect and catch up through GET /api/employees/changes/
+(people/sync.py).
+"""
+
+import asyncio
+import json
+import logging
+import select
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+# Events buffered per subscriber before it is considered lost
+SUBSCRIBER_QUEUE_SIZE = 1000
+
+# PostgreSQL channel and the largest payload sent in one NOTIFY (hard limit is 8000 bytes)
+NOTIFY_CHANNEL = 'people_events'
+NOTIFY_MAX_BYTES = 7500
+
+# Seconds between checks of the LISTEN connection, and before reconnecting after an error
+LISTEN_POLL_SECONDS = 5
+LISTEN_RETRY_SECONDS = 5
+
+# Queued in place of events for a subscriber that overflowed or missed events
+RESYNC = {"action": "resync"}
+
+ACTION_EVENTS = {'create': 'person.created', 'update': 'person.updated', 'delete': 'person.deleted'}
+
+
+def uses_notify():
+    """True when events travel through PostgreSQL NOTIFY (see module docstring)"""
+    return (getattr(settings, 'PEOPLE_EVENTS_BACKEND', 'local') == 'postgres'
+            and connections['default'].vendor == 'postgresql')
+
+
+def event_matches(event, filters):
+    """
+    True if the event concerns a person matching filters ({field: value}).
+    An update matches on the old or the new value, so subscribers also see
+    people leaving their department/status.
+    """
+    person = event.get('person') or {}
+    changes = event.get('changes') or {}
+    for field, value in filters.items():
+        new = person.get(field)
+        old = changes[field][0] if field in changes else new
+        if value not in (old, new):
+            return False
+    return True
+
+
+class Subscription:
+    """One SSE client: a bounded queue on the event loop serving it"""
+
+    def __init__(self, loop, filters):
+        self.loop = loop
+        self.filters = filters
+        self.queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.closed = False
+
+    def deliver(self, events):
+        """Enqueue matching events (runs on self.loop)"""
+        if self.closed:
+            return
+        for event in events:
+            if event is not RESYNC and not event_matches(event, self.filters):
+                continue
+            try:
+                self.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Too far behind - drop the backlog and tell the client to resync
+                self.closed = True
+                while not self.queue.empty():
+                    self.queue.get_nowait()
+                self.queue.put_nowait(RESYNC)
+                return
+
+    async def get(self, timeout=None):
+        """Next event, or None after timeout seconds"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class EventBroker:
+    """In-process fan-out of event batches to subscriptions, grouped by event loop"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.loops = {}                    # event loop → {Subscription, ...}
+        self.listener = None
+
+    def subscribe(self, filters=None):
+        """Register a subscription on the running event loop"""
+        loop = asyncio.get_running_loop()
+        subscription = Subscription(loop, dict(filters or {}))
+        with self.lock:
+            self.loops.setdefault(loop, set()).add(subscription)
+        if uses_notify():
+            self.start_listener()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.closed = True
+        with self.lock:
+            subscriptions = self.loops.get(subscription.loop)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self.loops[subscription.loop]
+
+    def subscriber_count(self):
+        with self.lock:
+            return sum(len(subscriptions) for subscriptions in self.loops.values())
+
+    def publish(self, events):
+        """Hand a batch of events to every subscriber (thread-safe, never blocks)"""
+        with self.lock:
+            targets = [(loop, list(subscriptions)) for loop, subscriptions in self.loops.items()]
+
+        for loop, subscriptions in targets:
+            try:
+                loop.call_soon_threadsafe(self._deliver, subscriptions, events)
+            except RuntimeError:
+                # Loop closed under us - forget its subscribers
+                with self.lock:
+                    self.loops.pop(loop, None)
+
+    @staticmethod
+    def _deliver(subscriptions, events):
+        for subscription in subscriptions:
+            subscription.deliver(events)
+
+    # ------------------------------------------------------------------
+    # PostgreSQL LISTEN
+    # ------------------------------------------------------------------
+
+    def start_listener(self):
+        with self.lock:
+            if self.listener is not None and self.listener.is_alive():
+                return
+            self.listener = threading.Thread(target=self._listen, name='people-events-listener', daemon=True)
+            self.listener.start()
+
+    def _listen(self):
+        """
+        Receive NOTIFY payloads on a dedicated connection and publish them
+        locally. Reconnects after errors; subscribers are told to resync
+        because notifications sent meanwhile are lost.
+        """
+        reconnecting = False
+        while True:
+            wrapper = listen_connection()
+            try:
+                wrapper.ensure_connection()
+                wrapper.set_autocommit(True)
+                with wrapper.cursor() as cursor:
+                    cursor.execute(f'LISTEN {NOTIFY_CHANNEL}')
+                if reconnecting:
+                    self.publish([RESYNC])
+
+                for payload in notifications(wrapper.connection):
+                    self.publish(json.loads(payload))
+            except Exception:
+                logger.exception('People event listener failed; reconnecting')
+                reconnecting = True
+                time.sleep(LISTEN_RETRY_SECONDS)
+            finally:
+                wrapper.close()
+
+
+def listen_connection():
+    """
+    A new connection to "default" for LISTEN - never borrowed from the
+    connection pool (DB_POOL), since it stays open for good.
+    """
+    wrapper = connections.create_connection('default')
+    options = {key: value for key, value in wrapper.settings_dict['OPTIONS'].items() if key != 'pool'}
+    wrapper.settings_dict = {**wrapper.settings_dict, 'OPTIONS': options}
+    return wrapper
+
+
+def notifications(raw):
+    """Endless iterator of NOTIFY payloads received on a raw psycopg 3 or psycopg2 connection"""
+    while True:
+        if callable(getattr(raw, 'notifies', None)):
+            # psycopg 3: stops after LISTEN_POLL_SECONDS without notifications
+            for notify in raw.notifies(timeout=LISTEN_POLL_SECONDS):
+                yield notify.payload
+            continue
+
+        if select.select([raw], [], [], LISTEN_POLL_SECONDS) == ([], [], []):
+            continue
+        raw.poll()
+        while raw.notifies:
+            yield raw.notifies.pop(0).payload
+
+
+broker = EventBroker()
+
+
+# ============================================================================
+# PUBLISHING
+# ============================================================================
+
+def change_event(change, changed_at):
+    """Event dict for a saved PersonChange (person comes from build_change)"""
+    return {
+        "id": change.pk,
+        "action": change.action,
+        "person_id": change.person_id,
+        "changed_at": changed_at(change.changed_at),
+        "changed_by": change.changed_by,
+        "changes": change.changes,
+        "person": getattr(change, 'person', None),
+    }
+
+
+def notify_payloads(events):
+    """JSON payloads of at most NOTIFY_MAX_BYTES, each a list of events"""
+    batch, size = [], 2
+    for event in events:
+        encoded = json.dumps(event, separators=(',', ':'))
+        if len(encoded.encode('utf-8')) + 2 > NOTIFY_MAX_BYTES:
+            # Keep only what subscribers filter on; clients fetch the rest
+            person = event.get('person') or {}
+            event = dict(event, changes={}, person={
+                field: person.get(field) for field in ('id', 'department', 'status')
+            })
+            encoded = json.dumps(event, separators=(',', ':'))
+        length = len(encoded.encode('utf-8')) + 1
+        if batch and size + length > NOTIFY_MAX_BYTES:
+            yield '[' + ','.join(batch) + ']'
+            batch, size = [], 2
+        batch.append(encoded)
+        size += length
+    if batch:
+        yield '[' + ','.join(batch) + ']'
+
+
+def publish_changes(changes, changed_at):
+    """
+    Publish saved PersonChange rows once their transaction commits.
+
+    changed_at converts a datetime to its API representation.
+    """
+    if uses_notify():
+        events = [change_event(change, changed_at) for change in changes]
+        with connection.cursor() as cursor:
+            for payload in notify_payloads(events):
+                cursor.execute('SELECT pg_notify(%s, %s)', [NOTIFY_CHANNEL, payload])
+        return
+
+    if not broker.subscriber_count():
+        return
+    events = [change_event(change, changed_at) for change in changes]
+    transaction.on_commit(lambda: broker.publish(events))
@@ -0,0 +1,79 @@
+"""
+Streaming Roster Exports
+
+Generators that turn a Person queryset into CSV or NDJSON lines one row at a
+time, for use with StreamingHttpResponse.
+
+Rows are read with values().iterator(chunk_size=...) and formatted by
+PersonFastSerializer so:
+- No Person model instances are built
+- PostgreSQL uses a server-side cursor (only one chunk is held in memory)
+- The first bytes go out as soon as the first chunk arrives
+
+Usage in views:
+    from .exports import EXPORT_FORMATS, stream_export
+
+    response = StreamingHttpResponse(
+        stream_export(queryset, 'csv'),
+        content_type=EXPORT_FORMATS['csv']
+    )
+"""
+
+import csv
+import json
+
+from .serializers import PersonFastSerializer
+
+# Rows fetched per round trip from the database cursor
+EXPORT_CHUNK_SIZE = 2000
+
+# Supported ?format= values and their content types
+EXPORT_FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+class Echo:
+    """
+    Pseudo file object for csv.writer - hands each formatted line back
+    instead of buffering it (pattern from the Django docs on streaming CSV).
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield one dict per person, formatted exactly like PersonSerializer.
+    """
+    serializer = PersonFastSerializer()
+
+    rows = queryset.values(*serializer.columns).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield serializer.to_representation(row)
+
+
+def stream_csv(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield a CSV header line followed by one line per person"""
+    writer = csv.writer(Echo())
+    yield writer.writerow(PersonFastSerializer().columns)
+
+    for person in iter_rows(queryset, chunk_size):
+        yield writer.writerow(['' if value is None else value for value in person.values()])
+
+
+def stream_ndjson(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield one JSON object per line (newline-delimited JSON)"""
+    for person in iter_rows(queryset, chunk_size):
+        yield json.dumps(person, ensure_ascii=False, separators=(',', ':')) + '\n'
+
+
+def stream_export(queryset, export_format, chunk_size=EXPORT_CHUNK_SIZE):
+    """Pick the generator for the requested format ('csv' or 'ndjson')"""
+    if export_format == 'csv':
+        return stream_csv(queryset, chunk_size)
+    if export_format == 'ndjson':
+        return stream_ndjson(queryset, chunk_size)
+    raise ValueError(f"Unsupported export format '{export_format}'")
@@ -0,0 +1,197 @@
+"""
+Headcount Summary Maintenance and Stats
+
+HeadcountSummary (people/models.py) holds one row per
+(department, subteam, status, position) with its headcount and summed
+time_commitment. Every Person write adjusts it by delta, in the same transaction:
+- save / delete          → people/signals.py (pre_save reads the old values)
+- bulk_upsert            → affected rows diffed before/after the upsert
+- bulk_update_people     → affected rows diffed before/after the update
+- bulk_delete_people     → QuerySet.delete() sends post_delete per person
+
+So /api/employees/stats/ costs one query over the groups, never the roster.
+
+rebuild_headcount_summary() recomputes the table from people and
+compare_headcount_summary() lists drift - both used by:
+    python manage.py rebuild_headcount_summary [--check]
+"""
+
+from collections import defaultdict
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from .models import HeadcountSummary, Person
+
+# Group columns, in key order
+HEADCOUNT_DIMENSIONS = ('department', 'subteam', 'status', 'position')
+
+# Person columns needed to place a person in a group and count their hours
+HEADCOUNT_FIELDS = HEADCOUNT_DIMENSIONS + ('time_commitment',)
+
+
+def group_key(values):
+    """(department, subteam, status, position) for a HEADCOUNT_FIELDS tuple - None stored as ''"""
+    department, subteam, person_status, position = values[:4]
+    return (department, subteam or '', person_status, position or '')
+
+
+class HeadcountDelta:
+    """Accumulates per-group changes before writing them in one pass"""
+
+    def __init__(self):
+        self.groups = defaultdict(lambda: [0, 0])   # group key → [headcount, hours]
+
+    def add(self, values, sign=1):
+        """Count (sign=1) or uncount (sign=-1) one person given as a HEADCOUNT_FIELDS tuple"""
+        totals = self.groups[group_key(values)]
+        totals[0] += sign
+        totals[1] += sign * (values[4] or 0)
+
+    def add_many(self, rows, sign=1):
+        for values in rows:
+            self.add(values, sign)
+
+    def apply(self):
+        """
+        Write the accumulated deltas - one UPDATE per changed group, an INSERT for
+        a group seen for the first time, and removal of groups that reach zero.
+        """
+        emptied = False
+        for key, (headcount, hours) in self.groups.items():
+            if not headcount and not hours:
+                continue
+            group = dict(zip(HEADCOUNT_DIMENSIONS, key))
+            rows = HeadcountSummary.objects.filter(**group)
+            changes = {
+                'headcount': F('headcount') + headcount,
+                'time_commitment': F('time_commitment') + hours,
+            }
+            if not rows.update(**changes):
+                try:
+                    with transaction.atomic():
+                        HeadcountSummary.objects.create(**group, headcount=headcount, time_commitment=hours)
+                except IntegrityError:
+                    # Created concurrently - fall back to the delta update
+                    rows.update(**changes)
+            emptied = emptied or headcount < 0
+
+        if emptied:
+            HeadcountSummary.objects.filter(headcount=0).delete()
+        self.groups.clear()
+
+
+def person_values(person):
+    """HEADCOUNT_FIELDS tuple of a Person instance"""
+    return tuple(getattr(person, field) for field in HEADCOUNT_FIELDS)
+
+
+def row_values(row):
+    """HEADCOUNT_FIELDS tuple of a values() row"""
+    return tuple(row[field] for field in HEADCOUNT_FIELDS)
+
+
+# ============================================================================
+# REBUILD / VERIFY
+# ============================================================================
+
+def compute_headcount_groups():
+    """{group key: (headcount, hours)} aggregated from the people table"""
+    groups = Person.objects.order_by().values(*HEADCOUNT_DIMENSIONS).annotate(
+        headcount=Count('id'), hours=Sum('time_commitment')
+    )
+    totals = {}
+    for group in groups:
+        key = group_key(tuple(group[field] for field in HEADCOUNT_DIMENSIONS))
+        headcount, hours = totals.get(key, (0, 0))
+        totals[key] = (headcount + group['headcount'], hours + (group['hours'] or 0))
+    return totals
+
+
+def stored_headcount_groups():
+    """{group key: (headcount, hours)} as currently stored in the summary table"""
+    return {
+        tuple(row[:4]): (row[4], row[5])
+        for row in HeadcountSummary.objects.values_list(*HEADCOUNT_DIMENSIONS, 'headcount', 'time_commitment')
+    }
+
+
+def compare_headcount_summary():
+    """
+    Differences between the summary table and the people table.
+
+    Returns:
+        [{"group": {...}, "expected": (headcount, hours), "stored": (headcount, hours)}, ...]
+        (empty when consistent; a missing side is (0, 0))
+    """
+    expected = compute_headcount_groups()
+    stored = stored_headcount_groups()
+    return [
+        {
+            "group": dict(zip(HEADCOUNT_DIMENSIONS, key)),
+            "expected": expected.get(key, (0, 0)),
+            "stored": stored.get(key, (0, 0)),
+        }
+        for key in sorted(set(expected) | set(stored))
+        if expected.get(key, (0, 0)) != stored.get(key, (0, 0))
+    ]
+
+
+def rebuild_headcount_summary():
+    """Replace the summary table with fresh totals. Returns the number of groups."""
+    with transaction.atomic():
+        # Lock people so no write lands between the aggregate and the insert
+        list(Person.objects.select_for_update().values_list('id', flat=True))
+        totals = compute_headcount_groups()
+        HeadcountSummary.objects.all().delete()
+        HeadcountSummary.objects.bulk_create([
+            HeadcountSummary(
+                **dict(zip(HEADCOUNT_DIMENSIONS, key)), headcount=headcount, time_commitment=hours
+            )
+            for key, (headcount, hours) in totals.items()
+        ])
+    return len(totals)
+
+
+# ============================================================================
+# STATS
+# ============================================================================
+
+def headcount_stats(filters=None):
+    """
+    Totals and per-dimension breakdowns from the summary table.
+
+    filters: optional {dimension: value} applied to the groups first.
+
+    Returns:
+        {
+            "total": {"headcount": int, "time_commitment": int},
+            "by_department": [{"department": str, "headcount": int, "time_commitment": int}, ...],
+            "by_subteam": [...], "by_status": [...], "by_position": [...]
+        }
+        Missing subteam/position are reported as null.
+    """
+    rows = HeadcountSummary.objects.filter(**(filters or {})).values_list(
+        *HEADCOUNT_DIMENSIONS, 'headcount', 'time_commitment'
+    )
+
+    total = [0, 0]
+    breakdowns = {dimension: defaultdict(lambda: [0, 0]) for dimension in HEADCOUNT_DIMENSIONS}
+    for row in rows:
+        headcount, hours = row[4], row[5]
+        total[0] += headcount
+        total[1] += hours
+        for dimension, value in zip(HEADCOUNT_DIMENSIONS, row[:4]):
+            bucket = breakdowns[dimension][value or None]
+            bucket[0] += headcount
+            bucket[1] += hours
+
+    stats = {"total": {"headcount": total[0], "time_commitment": total[1]}}
+    for dimension, buckets in breakdowns.items():
+        stats[f"by_{dimension}"] = [
+            {dimension: value, "headcount": headcount, "time_commitment": hours}
+            for value, (headcount, hours) in sorted(
+                buckets.items(), key=lambda item: (item[0] is None, item[0] or '')
+            )
+        ]
+    return stats
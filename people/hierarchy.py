@@ -0,0 +1,160 @@
+"""
+Reporting Hierarchy (closure table)
+
+Person.manager is the source of truth; PersonHierarchy (people/models.py)
+stores every (ancestor, descendant, depth) pair derived from it, so:
+
+- Everyone under X:   SELECT ... FROM people JOIN people_hierarchy
+                      WHERE ancestor_id = X              (one indexed query, any depth)
+- Management chain:   ... WHERE descendant_id = Y ORDER BY depth
+
+Maintenance (people/signals.py calls these after a Person save / before a delete):
+- move_subtree(person, manager) - re-parents the person together with their
+  whole subtree in two statements: one DELETE of the links to the old
+  managers above, one INSERT ... SELECT cross join of (new manager + their
+  managers) × (person + their reports). Never row by row.
+- detach_subtree(person) - before a delete, cuts the links between the
+  person's managers and the person's reports (they become top-level, matching
+  manager's on_delete=SET_NULL).
+- detach_people(people) - the same for many people deleted at once by the
+  bulk paths (people/bulk.py), plus their own links, in one DELETE.
+
+Bulk paths cannot set manager (see people/bulk.py), so every change to it
+goes through save().
+"""
+
+from django.db import connections, router, transaction
+from django.db.models import Count, Exists, F, OuterRef, Q
+
+from .models import Person, PersonHierarchy
+
+
+def creates_cycle(person_id, manager_id):
+    """True if person_id reporting to manager_id would make a loop"""
+    if manager_id is None or person_id is None:
+        return False
+    return manager_id == person_id or PersonHierarchy.objects.filter(
+        ancestor_id=person_id, descendant_id=manager_id
+    ).exists()
+
+
+def detach_subtree(person_id):
+    """Remove every link from person_id's managers to person_id and their reports"""
+    managers_above = PersonHierarchy.objects.filter(descendant_id=person_id).values('ancestor_id')
+    reports_below = PersonHierarchy.objects.filter(ancestor_id=person_id).values('descendant_id')
+
+    PersonHierarchy.objects.filter(
+        Q(descendant_id=person_id) | Q(descendant_id__in=reports_below),
+        ancestor_id__in=managers_above,
+    ).delete()
+
+
+def detach_people(person_ids):
+    """
+    Remove every link to, from or through person_ids in one DELETE - what
+    detach_subtree() and the CASCADE of each delete would do, for a batch.
+
+    A link a → x runs through d when a is above d and d above x.
+    """
+    through_deleted = PersonHierarchy.objects.filter(
+        descendant_id__in=person_ids,
+        ancestor_id=OuterRef('ancestor_id'),
+        descendant__hierarchy_descendants__descendant_id=OuterRef('descendant_id'),
+    )
+    PersonHierarchy.objects.filter(
+        Q(ancestor_id__in=person_ids) | Q(descendant_id__in=person_ids) | Exists(through_deleted)
+    ).delete()
+
+
+def attach_subtree(person_id, manager_id, using=None):
+    """
+    Link manager_id and everyone above them to person_id and everyone below,
+    in one INSERT ... SELECT:
+
+        depth(above → below) = depth(above → manager) + 1 + depth(person → below)
+    """
+    using = using or router.db_for_write(PersonHierarchy)
+    table = connections[using].ops.quote_name(PersonHierarchy._meta.db_table)
+    sql = f"""
+        INSERT INTO {table} (ancestor_id, descendant_id, depth)
+        SELECT above.ancestor_id, below.descendant_id, above.depth + below.depth + 1
+        FROM (
+            SELECT CAST(%s AS BIGINT) AS ancestor_id, 0 AS depth
+            UNION ALL
+            SELECT ancestor_id, depth FROM {table} WHERE descendant_id = %s
+        ) above
+        CROSS JOIN (
+            SELECT CAST(%s AS BIGINT) AS descendant_id, 0 AS depth
+            UNION ALL
+            SELECT descendant_id, depth FROM {table} WHERE ancestor_id = %s
+        ) below
+    """
+    with connections[using].cursor() as cursor:
+        cursor.execute(sql, [manager_id, manager_id, person_id, person_id])
+
+
+def move_subtree(person_id, manager_id, using=None):
+    """Re-parent person_id (with everyone below them) under manager_id (None = top level)"""
+    with transaction.atomic(using=using):
+        detach_subtree(person_id)
+        if manager_id is not None:
+            attach_subtree(person_id, manager_id, using)
+
+
+# ============================================================================
+# QUERIES
+# ============================================================================
+
+def reports_queryset(person_id, max_depth=None):
+    """Everyone below person_id (down to max_depth levels) - one join on the closure table"""
+    links = Q(hierarchy_ancestors__ancestor_id=person_id)
+    if max_depth is not None:
+        links &= Q(hierarchy_ancestors__depth__lte=max_depth)
+    return Person.objects.filter(links)
+
+
+def management_chain_queryset(person_id):
+    """Everyone above person_id, nearest first, annotated with level (1 = direct manager)"""
+    return Person.objects.filter(hierarchy_descendants__descendant_id=person_id).annotate(
+        level=F('hierarchy_descendants__depth')
+    ).order_by('level')
+
+
+def build_org_chart(nodes, depth, columns, to_representation):
+    """
+    Nest reports (down to depth - 1 more levels) under a page of top-level
+    org chart nodes and add each node's total report count.
+
+    nodes             - serialized people (dicts with "id" and "manager")
+    columns           - values() columns for the people below
+    to_representation - turns one values() row into a serialized person
+
+    Two queries regardless of depth: one for the people below, one for the counts.
+    """
+    by_id = {node['id']: node for node in nodes}
+    top_ids = set(by_id)
+
+    if depth > 1 and top_ids:
+        below = Person.objects.filter(
+            hierarchy_ancestors__ancestor_id__in=list(top_ids),
+            hierarchy_ancestors__depth__lte=depth - 1,
+        ).annotate(level=F('hierarchy_ancestors__depth')).order_by('level', 'full_name', 'id').values(*columns)
+        for row in below:
+            by_id[row['id']] = to_representation(row)
+
+    counts = dict(
+        PersonHierarchy.objects.filter(ancestor_id__in=list(by_id)).order_by().values('ancestor_id').annotate(
+            total=Count('id')
+        ).values_list('ancestor_id', 'total')
+    )
+
+    for node in by_id.values():
+        node['total_reports'] = counts.get(node['id'], 0)
+        node['reports'] = []
+
+    # Managers come before their reports (ordered by level), so appending keeps name order
+    for person_id, node in by_id.items():
+        if person_id not in top_ids and node['manager'] in by_id:
+            by_id[node['manager']]['reports'].append(node)
+
+    return nodes
@@ -0,0 +1,240 @@
+"""
+Person Change History and As-Of Reads
+
+Every Person write appends PersonChange rows (people/models.py) in the same
+transaction as the write:
+- save / delete          → people/signals.py (Person.save is atomic)
+- bulk_upsert            → before/after rows diffed in people/bulk.py
+- bulk_update_people     → before/after rows diffed in people/bulk.py
+- bulk_delete_people     → QuerySet.delete() sends post_delete per person
+
+Values are stored in API representation (PersonFastSerializer output), so a
+reconstructed person looks exactly like a live one.
+
+As-of reads (?as_of= on list/retrieve) never replay the whole history:
+1. Find the latest HistorySnapshot at or before the requested time
+2. Load its people (one query on the snapshot index)
+3. Replay only the changes between the snapshot and the requested time
+   (one range query on the changed_at / (person_id, changed_at) indexes)
+
+Recorded changes are also pushed to SSE subscribers (see people/events.py).
+
+Snapshots are taken periodically with:
+    python manage.py snapshot_people_history
+
+changed_by is the API caller (set by PersonViewSet around each request).
+"""
+
+import contextvars
+import datetime
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .events import publish_changes
+from .models import HistorySnapshot, Person, PersonChange, PersonSnapshot
+from .serializers import PersonFastSerializer
+
+# Fields never diffed - id is the key, updated_at is the change time itself
+UNTRACKED_FIELDS = ('id', 'updated_at')
+
+# Rows written per INSERT when taking a snapshot
+SNAPSHOT_BATCH_SIZE = 2000
+
+# Username recorded as changed_by for writes made during the current request
+history_actor = contextvars.ContextVar('people_history_actor', default=None)
+
+
+def history_columns():
+    """values() columns of a Person in API representation order"""
+    return PersonFastSerializer().columns
+
+
+def instance_row(person):
+    """values()-style dict from a Person instance (foreign keys as ids)"""
+    return {field.name: getattr(person, field.attname) for field in Person._meta.concrete_fields}
+
+
+def build_change(person_id, action, before, after, changed_at=None, serializer=None):
+    """
+    PersonChange (unsaved) for one write, or None when nothing tracked changed.
+
+    before/after are values() rows (None for create/delete). changed_at
+    defaults to the written row's updated_at, so replayed state carries the
+    same updated_at the live record had.
+    """
+    serializer = serializer or PersonFastSerializer()
+    old = serializer.to_representation(before) if before is not None else {}
+    new = serializer.to_representation(after) if after is not None else {}
+
+    changes = {
+        field: [old.get(field), new.get(field)]
+        for field in (new or old)
+        if field not in UNTRACKED_FIELDS and (action != 'update' or old.get(field) != new.get(field))
+    }
+    if action == 'update' and not changes:
+        return None
+
+    change = PersonChange(
+        person_id=person_id,
+        action=action,
+        changes=changes,
+        changed_at=changed_at or (after or {}).get('updated_at') or timezone.now(),
+        changed_by=history_actor.get(),
+    )
+    # Full representation for change events (people/events.py) - not stored
+    change.person = new or old
+    return change
+
+
+def record_changes(changes):
+    """
+    Append the given PersonChange objects (Nones skipped) in one INSERT and
+    publish them as change events
+    """
+    changes = [change for change in changes if change is not None]
+    if changes:
+        PersonChange.objects.bulk_create(changes, batch_size=SNAPSHOT_BATCH_SIZE)
+        publish_changes(changes, representation_of_updated_at())
+    return len(changes)
+
+
+def diff_rows(before_rows, after_rows):
+    """
+    PersonChanges for a bulk write given {id: row} before and after it.
+    Ids only in after_rows are creates, ids only in before_rows deletes.
+    """
+    serializer = PersonFastSerializer()
+    return [
+        build_change(
+            person_id, 'update' if person_id in before_rows else 'create',
+            before_rows.get(person_id), after, serializer=serializer
+        )
+        for person_id, after in after_rows.items()
+    ] + [
+        build_change(person_id, 'delete', before, None, serializer=serializer)
+        for person_id, before in before_rows.items()
+        if person_id not in after_rows
+    ]
+
+
+# ============================================================================
+# SNAPSHOTS
+# ============================================================================
+
+def take_snapshot():
+    """
+    Copy the whole roster into a new HistorySnapshot. Returns the snapshot.
+
+    People rows are locked for the duration so no update lands between the
+    snapshot time and the copy.
+    """
+    serializer = PersonFastSerializer()
+    with transaction.atomic():
+        list(Person.objects.select_for_update().values_list('id', flat=True))
+        snapshot = HistorySnapshot.objects.create(taken_at=timezone.now())
+
+        batch = []
+        count = 0
+        for row in Person.objects.order_by('id').values(*serializer.columns).iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+            batch.append(PersonSnapshot(
+                snapshot=snapshot, person_id=row['id'], data=serializer.to_representation(row)
+            ))
+            if len(batch) >= SNAPSHOT_BATCH_SIZE:
+                PersonSnapshot.objects.bulk_create(batch)
+                count += len(batch)
+                batch = []
+        PersonSnapshot.objects.bulk_create(batch)
+        count += len(batch)
+
+        snapshot.people_count = count
+        snapshot.save(update_fields=['people_count'])
+    return snapshot
+
+
+# ============================================================================
+# AS-OF RECONSTRUCTION
+# ============================================================================
+
+def parse_as_of(value):
+    """
+    Parse ?as_of= (ISO 8601 datetime, or a date meaning the end of that day, UTC).
+    Returns an aware datetime, or None if the value is not a valid date/time.
+    """
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            if day is None:
+                return None
+            moment = datetime.datetime.combine(day, datetime.time.max)
+    except ValueError:
+        return None
+
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, datetime.timezone.utc)
+    return moment
+
+
+def apply_change(state, change, updated_at):
+    """Apply one PersonChange to state (a representation dict, or None). Returns the new state."""
+    if change.action == 'delete':
+        return None
+    if change.action == 'create' or state is None:
+        state = {'id': change.person_id}
+    else:
+        state = dict(state)
+    for field, (_, new) in change.changes.items():
+        state[field] = new
+    state['updated_at'] = updated_at(change.changed_at)
+    return state
+
+
+def representation_of_updated_at():
+    """Converter used for updated_at in the API (same as PersonFastSerializer)"""
+    return dict(PersonFastSerializer().converters)['updated_at']
+
+
+def latest_snapshot(as_of):
+    return HistorySnapshot.objects.filter(taken_at__lte=as_of).order_by('-taken_at').first()
+
+
+def people_as_of(as_of):
+    """
+    Everyone who existed at as_of, as {person_id: representation dict}.
+
+    Three queries: the snapshot, its people, and the changes after it.
+    """
+    snapshot = latest_snapshot(as_of)
+    state = {}
+    changes = PersonChange.objects.filter(changed_at__lte=as_of)
+
+    if snapshot is not None:
+        state = dict(snapshot.people.values_list('person_id', 'data'))
+        changes = changes.filter(changed_at__gt=snapshot.taken_at)
+
+    updated_at = representation_of_updated_at()
+    for change in changes.order_by('changed_at', 'id').iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+        result = apply_change(state.get(change.person_id), change, updated_at)
+        if result is None:
+            state.pop(change.person_id, None)
+        else:
+            state[change.person_id] = result
+    return state
+
+
+def person_as_of(person_id, as_of):
+    """One person's representation at as_of, or None if they did not exist then"""
+    snapshot = latest_snapshot(as_of)
+    state = None
+    changes = PersonChange.objects.filter(person_id=person_id, changed_at__lte=as_of)
+
+    if snapshot is not None:
+        state = snapshot.people.filter(person_id=person_id).values_list('data', flat=True).first()
+        changes = changes.filter(changed_at__gt=snapshot.taken_at)
+
+    updated_at = representation_of_updated_at()
+    for change in changes.order_by('changed_at', 'id'):
+        state = apply_change(state, change, updated_at)
+    return state
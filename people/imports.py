@@ -0,0 +1,175 @@
+"""
+Roster Import (CSV / XLSX)
+
+Loads a spreadsheet of people in constant memory:
+
+1. Rows are read one at a time (csv module, openpyxl in read-only mode).
+   Header names are normalised ("Full Name" → full_name), blank cells are
+   dropped, spreadsheet dates and whole numbers are converted. Columns that
+   are not writable Person fields (id, created_at, manager, ...) are ignored,
+   so a CSV export can be imported again. Columns the sheet leaves out keep
+   their values on existing people; a blank cell resets its field.
+2. Every IMPORT_CHUNK_SIZE rows go through bulk_upsert() (people/bulk.py):
+   PersonBulkSerializer + Person.clean, duplicate checks, bulk
+   INSERT ... ON CONFLICT on acdc_email, headcount and history - in one
+   transaction per chunk.
+3. Rejected rows are written to the error report as each chunk finishes:
+   spreadsheet line, reasons, then the original cells, so HR can fix the
+   report itself and import it again (the extra columns are ignored).
+
+Chunks commit independently: an error in chunk 7 leaves chunks 1-6 saved,
+and since rows upsert on acdc_email, importing the whole file again is safe.
+
+Used by `python manage.py import_people` and POST /api/employees/import/.
+XLSX needs openpyxl.
+"""
+
+import csv
+import datetime
+import io
+import os
+from itertools import islice
+
+from .bulk import bulk_upsert
+from .serializers import PersonBulkSerializer
+
+IMPORT_FORMATS = ('csv', 'xlsx')
+
+# Rows validated and written per transaction
+IMPORT_CHUNK_SIZE = 5000
+
+# Rejected rows listed in the returned summary (the report file has all of them)
+IMPORT_SUMMARY_MAX_ERRORS = 100
+
+# Columns of the error report before the original cells
+REPORT_COLUMNS = ['line', 'errors']
+
+
+def detect_format(filename):
+    """'csv' or 'xlsx' from a file name, None when unknown"""
+    extension = os.path.splitext(filename or '')[1].lower().lstrip('.')
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def writable_columns():
+    """Person fields an import row may set"""
+    return {name for name, field in PersonBulkSerializer().fields.items() if not field.read_only}
+
+
+def normalize_header(name):
+    return str(name or '').strip().lower().replace(' ', '_').replace('-', '_')
+
+
+def clean_cell(value):
+    """Serializer input for one cell; None for blank cells"""
+    if value is None:
+        return None
+    if isinstance(value, datetime.datetime):
+        return value.date().isoformat()
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def read_csv(file):
+    """Cell lists of a binary CSV file (UTF-8, optional BOM), header first"""
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        yield from csv.reader(text)
+    finally:
+        text.detach()       # leave the caller's file open
+
+
+def read_xlsx(file):
+    """Cell lists of the first sheet of a binary XLSX file, header first"""
+    try:
+        import openpyxl
+    except ImportError:
+        raise ValueError('XLSX import needs openpyxl (pip install openpyxl) - or save the sheet as CSV')
+
+    workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        workbook.close()
+
+
+def import_people(file, file_format, report=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import a binary CSV/XLSX file. Rejected rows are written to report (a
+    text file) when given.
+
+    Returns a summary dict:
+        {"rows": int, "created": int, "updated": int, "rejected": int,
+         "ignored_columns": [...], "errors": [{"line": 7, "errors": {...}}, ...]}
+    ("errors" holds the first IMPORT_SUMMARY_MAX_ERRORS rejected rows)
+
+    Raises ValueError for an unknown format, an empty file or a header
+    without any Person column.
+    """
+    readers = {'csv': read_csv, 'xlsx': read_xlsx}
+    if file_format not in readers:
+        raise ValueError(f'Unsupported format "{file_format}". Use one of: {", ".join(IMPORT_FORMATS)}')
+
+    rows = readers[file_format](file)
+    header = next(rows, None)
+    if not header:
+        raise ValueError('The file is empty')
+    columns = [normalize_header(name) for name in header]
+    writable = writable_columns()
+    if not writable.intersection(columns):
+        raise ValueError(f'No Person columns in the header. Expected some of: {", ".join(sorted(writable))}')
+    known = [(position, column) for position, column in enumerate(columns) if column in writable]
+
+    writer = csv.writer(report) if report is not None else None
+    if writer:
+        writer.writerow(REPORT_COLUMNS + [str(name or '') for name in header])
+
+    summary = {
+        "rows": 0, "created": 0, "updated": 0, "rejected": 0,
+        "ignored_columns": [name for name in columns if name and name not in writable and name not in REPORT_COLUMNS],
+        "errors": [],
+    }
+
+    def rows_with_lines():
+        for line, cells in enumerate(rows, start=2):
+            if any(cell not in (None, '') for cell in cells):
+                yield line, cells
+
+    numbered = rows_with_lines()
+    while chunk := list(islice(numbered, chunk_size)):
+        data = []
+        for _, cells in chunk:
+            row = {}
+            for position, column in known:
+                value = clean_cell(cells[position]) if position < len(cells) else None
+                if value is not None:
+                    row[column] = value
+            data.append(row)
+
+        result = bulk_upsert(data, fields=[column for _, column in known])
+        summary["rows"] += len(chunk)
+        summary["created"] += result["created"]
+        summary["updated"] += result["updated"]
+        summary["rejected"] += len(result["errors"])
+        for error in result["errors"]:
+            line, cells = chunk[error["index"]]
+            if len(summary["errors"]) < IMPORT_SUMMARY_MAX_ERRORS:
+                summary["errors"].append({"line": line, "errors": error["errors"]})
+            if writer:
+                writer.writerow([line, format_errors(error["errors"])] + ['' if cell is None else cell for cell in cells])
+
+    return summary
+
+
+def format_errors(errors):
+    """{"field": ["message", ...]} as "field: message; ..." for the report"""
+    return '; '.join(
+        f'{field}: {" ".join(str(message) for message in messages)}' for field, messages in errors.items()
+    )
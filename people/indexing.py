@@ -0,0 +1,164 @@
+"""
+In-Process People Indexes
+
+Base class for read structures kept in worker memory next to the database
+(TrigramIndex in people/search.py, PrefixIndex in people/autocomplete.py).
+
+How an index stays current:
+- Built lazily on first use with one streamed query
+- Person post_save / post_delete (people/signals.py) apply the saved or
+  deleted person after commit - no query
+- Before each lookup the people version (people/cache.py) is compared with the
+  one seen last. It moves on every write, including bulk paths without signals
+  and writes made by other workers. On a change, rows updated since the last
+  refresh are re-read; a row count mismatch (deletions) triggers a rebuild
+
+Indexes always read the primary database, even when the request that
+triggered the load reads the replica (people/routers.py): the index outlives
+the request and is compared with a people version bumped on the primary, so
+rows from a lagging replica would stay in it until the next write.
+
+Subclasses define FIELDS (columns read per person) and implement reset() and
+apply({person_id: values or None}).
+"""
+
+import threading
+from datetime import timedelta
+
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, Max
+
+from .cache import get_people_version, is_enabled as cache_enabled
+from .models import Person
+
+# Rows updated this long before the last refresh are re-read on the next one,
+# covering transactions that committed late
+REFRESH_OVERLAP = timedelta(minutes=1)
+
+# Every index instance, so signal receivers can update them all
+PEOPLE_INDEXES = []
+
+
+def primary_people():
+    """Person queryset on the primary, whatever the current request reads from"""
+    return Person.objects.using(DEFAULT_DB_ALIAS)
+
+
+class PeopleIndex:
+    """Version-checked, incrementally refreshed in-memory index over Person rows"""
+
+    FIELDS = ()
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = None
+        self.watermark = None                # MAX(updated_at) at the last refresh
+        self.built = False
+        self.reset()
+        PEOPLE_INDEXES.append(self)
+
+    def reset(self):
+        """Drop everything indexed"""
+        raise NotImplementedError
+
+    def apply(self, people):
+        """Index {person_id: values} in one batch (values=None removes the person)"""
+        raise NotImplementedError
+
+    def prepare(self, summary):
+        """Hook called before a rebuild with {'last': MAX(updated_at), 'last_id': MAX(id)}"""
+
+    def __len__(self):
+        raise NotImplementedError
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load(self, queryset):
+        rows = queryset.values_list('id', *self.FIELDS).iterator(chunk_size=5000)
+        self.apply({row[0]: row[1:] for row in rows})
+
+    def rebuild(self):
+        """Re-read every person (one streamed query)"""
+        self.reset()
+        summary = primary_people().aggregate(last=Max('updated_at'), last_id=Max('pk'))
+        self.watermark = summary['last']
+        self.prepare(summary)
+        self._load(primary_people())
+        self.built = True
+
+    def refresh(self):
+        """
+        Bring the index up to date if people changed since the last refresh.
+
+        - People version unchanged → nothing to do (no query)
+        - Otherwise re-read rows updated since the watermark, then compare the
+          row count; a mismatch (deletions) triggers a full rebuild
+        """
+        version = get_people_version() if cache_enabled() else None
+
+        with self.lock:
+            if not self.built:
+                self.version = version
+                self.rebuild()
+                return
+
+            if version is not None and version == self.version:
+                return
+            self.version = version
+
+            summary = primary_people().aggregate(last=Max('updated_at'), total=Count('pk'))
+            if summary['last'] is not None and (self.watermark is None or summary['last'] > self.watermark):
+                since = (self.watermark or summary['last']) - REFRESH_OVERLAP
+                self._load(primary_people().filter(updated_at__gte=since))
+                self.watermark = summary['last']
+
+            if summary['total'] != len(self):
+                self.rebuild()
+
+    # ------------------------------------------------------------------
+    # Signal updates
+    # ------------------------------------------------------------------
+
+    def apply_signal(self, person_id, values):
+        """Apply one saved (values) or deleted (None) person if the index is built"""
+        self.apply_signals({person_id: values})
+
+    def apply_signals(self, people):
+        """apply_signal() for {person_id: values or None} in one batch"""
+        with self.lock:
+            if self.built:
+                self.apply(people)
+
+
+def person_index_values(instance, fields):
+    return tuple(getattr(instance, field) for field in fields)
+
+
+def update_people_indexes(person_id, instance=None):
+    """
+    Push one person into every built index - instance=None means deleted.
+    Values are captured now, so later changes to instance do not leak in.
+    """
+    changes = [
+        (index, None if instance is None else person_index_values(instance, index.FIELDS))
+        for index in PEOPLE_INDEXES
+    ]
+
+    def apply():
+        for index, values in changes:
+            index.apply_signal(person_id, values)
+
+    return apply
+
+
+def remove_from_people_indexes(person_ids):
+    """update_people_indexes() for many deleted people - one batch per index"""
+    removed = dict.fromkeys(person_ids)
+
+    def apply():
+        for index in PEOPLE_INDEXES:
+            index.apply_signals(removed)
+
+    return apply
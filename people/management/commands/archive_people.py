@@ -0,0 +1,68 @@
+"""
+Django Management Command: Archive Departed People
+
+Moves departed people past the retention period out of the people table into
+people_archive (see people/archive.py):
+    python manage.py archive_people                  # PEOPLE_ARCHIVE_AFTER_DAYS
+    python manage.py archive_people --days 730 --dry-run
+
+Run it periodically (e.g. nightly from cron). Every batch is its own short
+transaction, so the API keeps writing while a pass runs; --pause sleeps
+between batches to leave the database more room, and --max-batches bounds
+the work of one run (the next run continues where people remain).
+
+Archived people are listed with ?include_archived=1 and moved back with
+POST /api/employees/{id}/restore/.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from people.archive import ARCHIVE_BATCH_SIZE, archivable, archive_cutoff, archive_people, retention_days
+from people.history import history_actor
+
+
+class Command(BaseCommand):
+    help = 'Moves departed people past the retention period to people_archive, in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int,
+                            help=f'Retention in days (default PEOPLE_ARCHIVE_AFTER_DAYS = {retention_days()})')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE,
+                            help=f'People moved per transaction (default {ARCHIVE_BATCH_SIZE})')
+        parser.add_argument('--max-batches', type=int, help='Stop after this many batches')
+        parser.add_argument('--pause', type=float, default=0.0, help='Seconds to sleep between batches')
+        parser.add_argument('--dry-run', action='store_true', help='Only count the people a pass would archive')
+        parser.add_argument('--actor', default='archive_people', help='Name recorded in the change history')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] <= 0:
+            raise CommandError('--batch-size must be positive')
+        if options['days'] is not None and options['days'] < 0:
+            raise CommandError('--days cannot be negative')
+        days = retention_days() if options['days'] is None else options['days']
+        cutoff = archive_cutoff(days)
+
+        if options['dry_run']:
+            count = archivable(cutoff).count()
+            self.stdout.write(self.style.SUCCESS(f'{count} people departed more than {days} days ago would be archived'))
+            return
+
+        def progress(archived):
+            self.stdout.write(f'  {archived} archived...')
+            if options['pause']:
+                time.sleep(options['pause'])
+
+        self.stdout.write(self.style.NOTICE(f'Archiving people departed more than {days} days ago...'))
+        started = time.perf_counter()
+        token = history_actor.set(options['actor'])
+        try:
+            archived = archive_people(cutoff, batch_size=options['batch_size'],
+                                      max_batches=options['max_batches'], progress=progress,
+                                      actor=options['actor'])
+        finally:
+            history_actor.reset(token)
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Archived {archived} people in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,311 @@
+"""
+Django Management Command: API Load Test and Benchmark Suite
+
+Seeds rosters of increasing size in a throwaway test database and drives the
+main API endpoints concurrently through Django's WSGI handler (in-process, on
+worker threads like gunicorn --threads). For every roster size and scenario
+it records latency percentiles, throughput and SQL queries per request, and
+writes them as JSON - a baseline to compare later runs against.
+
+    python manage.py bench_api
+    python manage.py bench_api --sizes 1000 10000 100000 --requests 1000 --clients 16
+    python manage.py bench_api --scenarios list filter_employees --output before.json
+
+Scenarios (role of the caller):
+    list                    GET    /api/employees/?page_size=50                   HR_ReadOnly
+    filter_employees        GET    /api/employees/filter_employees/?department=   HR_ReadOnly
+    update_by_identifier    PATCH  /api/employees/update_by_identifier/?email=    HR_ReadWrite
+    delete_by_identifier    DELETE /api/employees/delete_by_identifier/?email=    HR_FullAccess
+    token_obtain            POST   /api/token/                                    (username + password)
+    token_refresh           POST   /api/token/refresh/                            (one refresh token each)
+    user_list               GET    /api/users/?page_size=50                       Superuser
+
+Runs fully offline: the database is the test database of the configured
+"default" (a temporary SQLite file, or test_<NAME> on PostgreSQL - the role
+needs CREATEDB), created with migrations and destroyed at the end. Nothing is
+read from or written to the real database.
+
+Sizes are seeded cumulatively (people/seeding.py, deterministic by --seed).
+delete_by_identifier removes extra people seeded for it, so every scenario of
+a size sees the same roster. The response cache is off unless --cache.
+token_obtain is dominated by password hashing (PBKDF2, by design), so it is
+much slower than the rest - give it fewer requests with --scenarios if needed.
+
+JSON output:
+    {
+        "meta": {"started_at": "...", "database": "sqlite", "clients": 8, ...},
+        "results": [
+            {
+                "size": 10000, "scenario": "list", "requests": 500, "errors": {},
+                "throughput_rps": 231.4,
+                "latency_ms": {"mean": 34.1, "p50": 31.9, "p95": 58.2, "p99": 71.0, "max": 90.3},
+                "queries": {"mean": 2.0, "max": 2}
+            },
+            ...
+        ]
+    }
+"""
+
+import datetime
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from people.authentication import add_role_claims
+from people.models import DEPARTMENT_CHOICES
+from people.permissions import get_user_role
+from people.seeding import ROLE_USERNAMES, seed_email, seed_people, seed_role_users
+
+HOST = 'localhost'
+
+PASSWORD = 'BenchPass123!'
+
+DEFAULT_SIZES = (1000, 10000)
+
+SCENARIOS = (
+    'list', 'filter_employees', 'update_by_identifier', 'delete_by_identifier',
+    'token_obtain', 'token_refresh', 'user_list',
+)
+
+# Person numbers of the people deleted by delete_by_identifier start here
+# (far above any roster size, so the two ranges never meet)
+VICTIM_FIRST_INDEX = 100_000_000
+
+
+class Command(BaseCommand):
+    help = 'Seeds rosters in a test database and load-tests the main API endpoints, writing results as JSON'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=list(DEFAULT_SIZES),
+                            help='Roster sizes to test, seeded cumulatively (default 1000 10000)')
+        parser.add_argument('--scenarios', nargs='+', choices=SCENARIOS, default=list(SCENARIOS),
+                            help='Scenarios to run (default all)')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per scenario and size (default 500)')
+        parser.add_argument('--clients', type=int, default=8, help='Concurrent clients / worker threads (default 8)')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated roster (default 0)')
+        parser.add_argument('--cache', action='store_true', help='Keep the people response cache on')
+        parser.add_argument('--output', default='bench_api.json', help='JSON results file (default bench_api.json)')
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options['sizes']))
+        total, clients = options['requests'], options['clients']
+        if min(sizes) <= 0 or min(total, clients) <= 0:
+            raise CommandError('--sizes, --requests and --clients must be positive')
+
+        meta = {
+            'started_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'sizes': sizes,
+            'requests': total,
+            'clients': clients,
+            'seed': options['seed'],
+            'cache': options['cache'],
+        }
+
+        old_name, temp_dir = self.create_database()
+        try:
+            with override_settings(ALLOWED_HOSTS=[HOST], PEOPLE_CACHE_ENABLED=options['cache'],
+                                   PEOPLE_REPLICA_READS=False):
+                results = self.run_suite(sizes, options['scenarios'], total, clients, options['seed'])
+        finally:
+            connections.close_all()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            if temp_dir is not None:
+                temp_dir.cleanup()
+
+        with open(options['output'], 'w') as output:
+            json.dump({'meta': meta, 'results': results}, output, indent=2)
+        self.stdout.write(self.style.SUCCESS(f'✓ Results written to {options["output"]}'))
+
+        failed = [result for result in results if result['errors']]
+        if failed:
+            raise CommandError('; '.join(
+                f'{result["scenario"]} @ {result["size"]}: {result["errors"]}' for result in failed
+            ))
+
+    def create_database(self):
+        """Create and migrate the test database; returns (old NAME, temporary directory or None)"""
+        temp_dir = None
+        if connection.vendor == 'sqlite':
+            # A file rather than the in-memory default, like a deployed database
+            temp_dir = tempfile.TemporaryDirectory(prefix='bench_api_')
+            connection.settings_dict['TEST']['NAME'] = os.path.join(temp_dir.name, 'bench.sqlite3')
+            # Concurrent writers: take the write lock when the transaction
+            # starts and wait for it, instead of failing with "database is locked"
+            connection.settings_dict['OPTIONS'] = {
+                **connection.settings_dict['OPTIONS'], 'transaction_mode': 'IMMEDIATE', 'timeout': 30,
+            }
+        self.stdout.write(self.style.NOTICE('Creating the benchmark database...'))
+        old_name = connection.settings_dict['NAME']
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        return old_name, temp_dir
+
+    # ------------------------------------------------------------------
+    # Suite
+    # ------------------------------------------------------------------
+
+    def run_suite(self, sizes, scenarios, total, clients, seed):
+        users = seed_role_users(PASSWORD)
+        self.tokens = {
+            username: str(add_role_claims(RefreshToken.for_user(user), user, get_user_role(user)).access_token)
+            for username, user in users.items()
+        }
+        self.users = users
+
+        results = []
+        seeded = 0
+        victims = VICTIM_FIRST_INDEX
+        for size in sizes:
+            self.stdout.write(self.style.NOTICE(f'Seeding {size - seeded} people (roster of {size})...'))
+            started = time.perf_counter()
+            seed_people(size - seeded, seed=seed, first_index=seeded)
+            self.stdout.write(f'  seeded in {time.perf_counter() - started:.1f}s')
+            seeded = size
+
+            for scenario in scenarios:
+                if scenario == 'delete_by_identifier':
+                    seed_people(total, seed=seed, first_index=victims)
+                requests = getattr(self, f'requests_{scenario}')(total, size, seed, victims)
+                if scenario == 'delete_by_identifier':
+                    victims += total
+
+                result = self.run_scenario(requests, clients)
+                result = {'size': size, 'scenario': scenario, **result}
+                results.append(result)
+                self.report(result)
+        return results
+
+    # ------------------------------------------------------------------
+    # Requests: (method, path, query, body or None, username or None)
+    # ------------------------------------------------------------------
+
+    def requests_list(self, total, size, seed, victims):
+        return [('GET', '/api/employees/', 'page_size=50', None, 'bench_readonly')] * total
+
+    def requests_filter_employees(self, total, size, seed, victims):
+        randomizer = random.Random(seed)
+        return [
+            ('GET', '/api/employees/filter_employees/',
+             f'department={randomizer.choice(DEPARTMENT_CHOICES)[0]}&page_size=50', None, 'bench_readonly')
+            for _ in range(total)
+        ]
+
+    def requests_update_by_identifier(self, total, size, seed, victims):
+        randomizer = random.Random(seed)
+        return [
+            ('PATCH', '/api/employees/update_by_identifier/',
+             f'email={seed_email(randomizer.randrange(size))}',
+             {'time_commitment': randomizer.randrange(0, 81)}, 'bench_readwrite')
+            for _ in range(total)
+        ]
+
+    def requests_delete_by_identifier(self, total, size, seed, victims):
+        return [
+            ('DELETE', '/api/employees/delete_by_identifier/',
+             f'email={seed_email(index)}', None, 'bench_fullaccess')
+            for index in range(victims, victims + total)
+        ]
+
+    def requests_token_obtain(self, total, size, seed, victims):
+        usernames = list(ROLE_USERNAMES)
+        return [
+            ('POST', '/api/token/', '', {'username': usernames[i % len(usernames)], 'password': PASSWORD}, None)
+            for i in range(total)
+        ]
+
+    def requests_token_refresh(self, total, size, seed, victims):
+        # Refresh tokens rotate and are blacklisted after use - one per request
+        usernames = list(ROLE_USERNAMES)
+        return [
+            ('POST', '/api/token/refresh/', '',
+             {'refresh': str(RefreshToken.for_user(self.users[usernames[i % len(usernames)]]))}, None)
+            for i in range(total)
+        ]
+
+    def requests_user_list(self, total, size, seed, victims):
+        return [('GET', '/api/users/', 'page_size=50', None, 'bench_admin')] * total
+
+    # ------------------------------------------------------------------
+    # Driver
+    # ------------------------------------------------------------------
+
+    def run_scenario(self, requests, clients):
+        application = get_wsgi_application()
+
+        def call(request):
+            method, path_info, query, body, username = request
+            payload = json.dumps(body).encode() if body is not None else b''
+            environ = {
+                'REQUEST_METHOD': method, 'PATH_INFO': path_info, 'QUERY_STRING': query,
+                'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(payload), 'wsgi.errors': sys.stderr,
+                'CONTENT_TYPE': 'application/json', 'CONTENT_LENGTH': str(len(payload)),
+                'HTTP_ACCEPT': 'application/json',
+            }
+            if username is not None:
+                environ['HTTP_AUTHORIZATION'] = f'Bearer {self.tokens[username]}'
+
+            queries = []
+            status = []
+            with connections['default'].execute_wrapper(
+                lambda execute, sql, params, many, context: queries.append(1) or execute(sql, params, many, context)
+            ):
+                started = time.perf_counter()
+                response = application(environ, lambda code, response_headers: status.append(int(code[:3])))
+                b''.join(response)
+                response.close()
+                latency = time.perf_counter() - started
+            return status[0], latency, len(queries)
+
+        with ThreadPoolExecutor(max_workers=clients) as workers:
+            started = time.perf_counter()
+            outcomes = list(workers.map(call, requests))
+            elapsed = time.perf_counter() - started
+            # Worker threads have their own connections
+            list(workers.map(lambda _: connections.close_all(), range(clients)))
+
+        latencies = sorted(latency for _, latency, _ in outcomes)
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+        queries = [count for _, _, count in outcomes]
+        errors = {}
+        for code, _, _ in outcomes:
+            if code >= 400:
+                errors[str(code)] = errors.get(str(code), 0) + 1
+        return {
+            'requests': len(outcomes),
+            'errors': errors,
+            'throughput_rps': round(len(outcomes) / elapsed, 1),
+            'latency_ms': {
+                'mean': round(statistics.fmean(latencies) * 1000, 2),
+                'p50': round(quantiles[49] * 1000, 2),
+                'p95': round(quantiles[94] * 1000, 2),
+                'p99': round(quantiles[98] * 1000, 2),
+                'max': round(latencies[-1] * 1000, 2),
+            },
+            'queries': {'mean': round(statistics.fmean(queries), 2), 'max': max(queries)},
+        }
+
+    def report(self, result):
+        latency = result['latency_ms']
+        errors = f'  errors {result["errors"]}' if result['errors'] else ''
+        self.stdout.write(
+            f'  {result["scenario"]:<22}{result["throughput_rps"]:>8.0f} req/s'
+            f'  p50 {latency["p50"]:>7.1f}ms  p95 {latency["p95"]:>7.1f}ms  p99 {latency["p99"]:>7.1f}ms'
+            f'  {result["queries"]["mean"]:>5.1f} queries{errors}'
+        )
@@ -0,0 +1,220 @@
+"""
+Django Management Command: Benchmark Database Connection Modes
+
+Sends the same employee read requests through Django's WSGI handler
+(in-process, on a pool of worker threads like gunicorn --threads) once per
+connection mode and reports per-request latency:
+
+1. per request  - CONN_MAX_AGE=0: connect (TCP + TLS + auth) on every request (the old default)
+2. persistent   - CONN_MAX_AGE: each worker thread keeps its own connection
+3. pooled       - DB_POOL: psycopg 3 pool shared by the threads of the process
+
+    python manage.py bench_db_pool
+    python manage.py bench_db_pool --requests 4000 --threads 16 --endpoint list
+
+Needs PostgreSQL (the connection is what is being measured), and psycopg 3
+with psycopg-pool for the pooled mode. Uses the DB_* settings, e.g. against a
+local server:
+
+    DB_HOST=127.0.0.1 DB_NAME=hrapp DB_SSLMODE=disable python manage.py bench_db_pool
+
+Against Supabase the per-request mode also pays the TLS handshake, so the
+difference is larger than on a local server.
+
+Reads whatever people are in the database; requests are authenticated with a
+JWT for the first active superuser and the response cache is off.
+"""
+
+import io
+import random
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.db import connection, connections
+from django.db.backends.signals import connection_created
+from django.test.utils import override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from people.authentication import add_role_claims
+from people.models import Person
+from people.permissions import get_user_role
+from people.pooling import pool_stats
+
+HOST = 'localhost'
+
+ENDPOINTS = ('list', 'retrieve', 'filter')
+
+MODES = ('per-request', 'persistent', 'pooled')
+
+
+class Command(BaseCommand):
+    help = 'Compares per-request latency with a new connection per request, persistent connections and a pool'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per mode (default 2000)')
+        parser.add_argument('--threads', type=int, default=8, help='WSGI worker threads (default 8)')
+        parser.add_argument('--endpoint', choices=ENDPOINTS, default='retrieve',
+                            help='Endpoint to call (default retrieve - the cheapest query, so '
+                                 'connection setup weighs the most)')
+        parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES),
+                            help='Connection modes to run (default all)')
+
+    def handle(self, *args, **options):
+        total, threads = options['requests'], options['threads']
+        if min(total, threads) <= 0:
+            raise CommandError('--requests and --threads must be positive')
+        if connection.vendor != 'postgresql':
+            raise CommandError('Connection modes are PostgreSQL-specific - point the DB_* settings at PostgreSQL')
+
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('id').first()
+        if user is None:
+            raise CommandError('Create a superuser first (python manage.py createsuperuser)')
+        token = str(add_role_claims(RefreshToken.for_user(user), user, get_user_role(user)).access_token)
+
+        ids = list(Person.objects.values_list('id', flat=True)[:1000])
+        if not ids:
+            raise CommandError('No people in the database - load some first')
+        departments = list(Person.objects.order_by().values_list('department', flat=True).distinct())
+        requests = self.build_requests(options['endpoint'], total, ids, departments)
+        self.headers = {'HTTP_ACCEPT': 'application/json', 'HTTP_AUTHORIZATION': f'Bearer {token}'}
+
+        self.stdout.write(self.style.NOTICE(
+            f'{total} requests ({options["endpoint"]}) per mode on {threads} threads, '
+            f'{len(ids)} people, {connection.settings_dict["HOST"]}'
+        ))
+
+        # Worker threads open their own connections; start from a clean slate
+        connections.close_all()
+        settings_dict = connections.settings['default']
+        original = {
+            'CONN_MAX_AGE': settings_dict.get('CONN_MAX_AGE', 0),
+            'OPTIONS': dict(settings_dict['OPTIONS']),
+        }
+
+        results = []
+        try:
+            with override_settings(ALLOWED_HOSTS=[HOST], PEOPLE_CACHE_ENABLED=False):
+                for mode in options['modes']:
+                    self.configure(settings_dict, mode, threads)
+                    results.append((mode, *self.run(requests, threads, pooled=mode == 'pooled')))
+                    if mode == 'pooled':
+                        self.stdout.write(f'  pool after run: {pool_stats()[0]}')
+                    connections['default'].close_pool()
+        finally:
+            settings_dict['CONN_MAX_AGE'] = original['CONN_MAX_AGE']
+            settings_dict['OPTIONS'] = original['OPTIONS']
+
+        self.report(results)
+
+    def build_requests(self, endpoint, total, ids, departments):
+        randomizer = random.Random(42)
+        makers = {
+            'list': lambda: ('/api/employees/', 'page_size=50'),
+            'retrieve': lambda: (f'/api/employees/{randomizer.choice(ids)}/', ''),
+            'filter': lambda: ('/api/employees/filter_employees/', f'department={randomizer.choice(departments)}'),
+        }
+        return [makers[endpoint]() for _ in range(total)]
+
+    # ------------------------------------------------------------------
+    # Connection modes
+    # ------------------------------------------------------------------
+
+    def configure(self, settings_dict, mode, threads):
+        """
+        Switch the "default" settings in place: every thread's DatabaseWrapper
+        shares this dict, and worker threads connect lazily.
+        """
+        options = {key: value for key, value in settings_dict['OPTIONS'].items() if key != 'pool'}
+        settings_dict['CONN_MAX_AGE'] = 600 if mode == 'persistent' else 0
+        if mode == 'pooled':
+            options['pool'] = {'min_size': threads, 'max_size': threads, 'timeout': 30}
+        settings_dict['OPTIONS'] = options
+        if mode == 'pooled':
+            try:
+                connections['default'].pool.open(wait=True)
+            except ImproperlyConfigured as e:
+                raise CommandError(f'Pooled mode needs psycopg 3 and psycopg-pool: {e}')
+
+    # ------------------------------------------------------------------
+    # Requests
+    # ------------------------------------------------------------------
+
+    def run(self, requests, threads, pooled):
+        """(latencies, elapsed seconds, connections opened, status codes) for one mode"""
+        application = get_wsgi_application()
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            opened.append(1)
+
+        def call(request):
+            path_info, query = request
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path_info, 'QUERY_STRING': query,
+                'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(b''), 'wsgi.errors': sys.stderr,
+                **self.headers,
+            }
+            status = []
+            started = time.perf_counter()
+            response = application(environ, lambda code, response_headers: status.append(int(code[:3])))
+            b''.join(response)
+            response.close()                 # request_finished: Django closes/returns the connection
+            return status[0], time.perf_counter() - started
+
+        barrier = threading.Barrier(threads)
+
+        def close_thread_connections():
+            barrier.wait()                   # one call per worker thread
+            connections.close_all()
+
+        with ThreadPoolExecutor(max_workers=threads) as workers:
+            list(workers.map(call, requests[:threads * 2]))          # warm-up, not measured
+            if pooled:
+                connections['default'].pool.pop_stats()
+            connection_created.connect(count_connection, dispatch_uid='bench_db_pool')
+            try:
+                started = time.perf_counter()
+                outcomes = list(workers.map(call, requests))
+                elapsed = time.perf_counter() - started
+            finally:
+                connection_created.disconnect(dispatch_uid='bench_db_pool')
+            list(workers.map(lambda _: close_thread_connections(), range(threads)))
+
+        if pooled:
+            # connection_created fires on every borrow; count real connections instead
+            opened = [1] * pool_stats()[0]['connections_opened']
+        return [latency for _, latency in outcomes], elapsed, len(opened), [code for code, _ in outcomes]
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def report(self, results):
+        self.stdout.write('\n' + '=' * 78)
+        self.stdout.write(f'  {"Mode":<14}{"req/s":>9}{"mean":>10}{"p50":>10}{"p95":>10}{"p99":>10}{"connects":>11}')
+        failures = []
+        for mode, latencies, elapsed, opened, codes in results:
+            latencies = sorted(latencies)
+            quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(
+                f'  {mode:<14}{len(latencies) / elapsed:>9.0f}{statistics.fmean(latencies) * 1000:>8.2f}ms'
+                f'{quantiles[49] * 1000:>8.2f}ms{quantiles[94] * 1000:>8.2f}ms{quantiles[98] * 1000:>8.2f}ms'
+                f'{opened:>11}'
+            )
+            bad = [code for code in codes if code != 200]
+            if bad:
+                failures.append(f'{mode}: {len(bad)} responses were not 200 (e.g. {bad[0]})')
+        self.stdout.write('=' * 78)
+        self.stdout.write('  connects = new database connections opened while measuring')
+
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('✓ All responses were 200'))
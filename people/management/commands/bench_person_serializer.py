@@ -0,0 +1,117 @@
+"""
+Django Management Command: Benchmark Person Serializers
+
+Compares the two read paths used for employee lists:
+1. PersonSerializer (DRF ModelSerializer over model instances)
+2. PersonFastSerializer (values() rows + precompiled converters)
+
+The command inserts synthetic people inside a transaction that is rolled back
+at the end, so it is safe to run against a development database:
+    python manage.py bench_person_serializer
+    python manage.py bench_person_serializer --rows 10000 --repeat 5
+
+It also renders both outputs with DRF's JSONRenderer and fails if the bytes differ.
+"""
+
+import datetime
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from people.models import Person, DEPARTMENT_CHOICES, POSITION_CHOICES, STATUS_CHOICES
+from people.serializers import PersonSerializer, PersonFastSerializer
+
+
+class Rollback(Exception):
+    """Raised to undo the synthetic rows once timing is done"""
+
+
+class Command(BaseCommand):
+    help = 'Benchmarks PersonSerializer against PersonFastSerializer on synthetic rows (rolled back afterwards)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=10000, help='Number of synthetic people (default 10000)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per serializer (default 5)')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        repeat = options['repeat']
+
+        if rows <= 0 or repeat <= 0:
+            raise CommandError('--rows and --repeat must be positive')
+
+        try:
+            with transaction.atomic():
+                self.seed(rows)
+                self.run(repeat)
+                raise Rollback()
+        except Rollback:
+            self.stdout.write(self.style.NOTICE('\nSynthetic rows rolled back.'))
+
+    def seed(self, rows):
+        self.stdout.write(self.style.NOTICE(f'Inserting {rows} synthetic people...'))
+        start = datetime.date(2020, 1, 1)
+        people = [
+            Person(
+                full_name=f'Bench Person {i:06d}',
+                acdc_email=f'bench.{i}@acdc.com',
+                personal_email=f'bench.{i}@example.com' if i % 3 else None,
+                phone=f'+1-555-{i % 10000:04d}',
+                department=DEPARTMENT_CHOICES[i % len(DEPARTMENT_CHOICES)][0],
+                subteam=f'Team {i % 12}' if i % 4 else None,
+                position=POSITION_CHOICES[i % len(POSITION_CHOICES)][0] if i % 5 else None,
+                status=STATUS_CHOICES[i % len(STATUS_CHOICES)][0],
+                timezone='UTC',
+                time_commitment=i % 81 if i % 7 else None,
+                start_date=start + datetime.timedelta(days=i % 1500),
+                end_date=start + datetime.timedelta(days=1500 + i % 300) if i % 9 == 0 else None,
+            )
+            for i in range(rows)
+        ]
+        Person.objects.bulk_create(people, batch_size=1000)
+
+    def time_runs(self, func, repeat):
+        timings = []
+        result = None
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = func()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings), result
+
+    def run(self, repeat):
+        queryset = Person.objects.order_by('full_name', 'pk')
+        columns = PersonFastSerializer().columns
+        renderer = JSONRenderer()
+
+        # Full path: query + serialize
+        drf_total, drf_data = self.time_runs(
+            lambda: PersonSerializer(list(queryset), many=True).data, repeat)
+        fast_total, fast_data = self.time_runs(
+            lambda: PersonFastSerializer(list(queryset.values(*columns)), many=True).data, repeat)
+
+        # Serialize only (rows already fetched)
+        instances = list(queryset)
+        values_rows = list(queryset.values(*columns))
+        drf_only, _ = self.time_runs(lambda: PersonSerializer(instances, many=True).data, repeat)
+        fast_only, _ = self.time_runs(lambda: PersonFastSerializer(values_rows, many=True).data, repeat)
+
+        drf_bytes = renderer.render(drf_data)
+        fast_bytes = renderer.render(fast_data)
+
+        self.stdout.write('\n' + '=' * 60)
+        self.stdout.write(self.style.NOTICE(f'Rows: {len(instances)}   Runs: {repeat} (median shown)'))
+        self.stdout.write(f'  {"":<24}{"PersonSerializer":>18}{"Fast":>10}{"Speedup":>10}')
+        self.stdout.write(f'  {"Query + serialize":<24}{drf_total * 1000:>16.1f}ms{fast_total * 1000:>8.1f}ms'
+                          f'{drf_total / fast_total:>9.1f}x')
+        self.stdout.write(f'  {"Serialize only":<24}{drf_only * 1000:>16.1f}ms{fast_only * 1000:>8.1f}ms'
+                          f'{drf_only / fast_only:>9.1f}x')
+        self.stdout.write('=' * 60)
+
+        if drf_bytes != fast_bytes:
+            raise CommandError('Output mismatch: PersonFastSerializer JSON differs from PersonSerializer')
+
+        self.stdout.write(self.style.SUCCESS(f'✓ Outputs are byte-identical ({len(fast_bytes)} bytes)'))
@@ -0,0 +1,228 @@
+"""
+Django Management Command: Benchmark the Employee Read Path (WSGI vs ASGI)
+
+Drives the employee read endpoints with many concurrent clients through
+Django's own WSGI and ASGI handlers, in-process (no HTTP server or network,
+so the numbers compare the request stacks and the database work):
+
+1. WSGI                - PersonViewSet on a pool of worker threads (like gunicorn --threads)
+2. ASGI, sync views    - PersonViewSet run through sync_to_async
+3. ASGI, async views   - people/async_views.py (PEOPLE_ASYNC_READS)
+
+    python manage.py bench_read_path
+    python manage.py bench_read_path --clients 200 --requests 5000 --threads 8
+    python manage.py bench_read_path --endpoint retrieve --cache
+
+Reads whatever people are in the database (load some first, e.g. through
+POST /api/employees/bulk/). Requests are authenticated with a JWT for the
+first active superuser. The response cache is off unless --cache is given,
+so every request reaches the database.
+
+Every response must be 200; the command fails otherwise.
+"""
+
+import asyncio
+import io
+import random
+import statistics
+import sys
+import threading
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.wsgi import get_wsgi_application
+from django.test.utils import override_settings
+from django.urls import include, path
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from people.async_views import async_read_urlpatterns
+from people.authentication import add_role_claims
+from people.models import Person
+from people.permissions import get_user_role
+from people.urls import router
+
+HOST = 'localhost'
+
+ENDPOINTS = ('list', 'retrieve', 'filter', 'mix')
+
+
+def url_module(name, patterns):
+    """A URLconf module object (usable as ROOT_URLCONF)"""
+    module = types.ModuleType(name)
+    module.urlpatterns = patterns + [path('api/', include(router.urls))]
+    return module
+
+
+class Command(BaseCommand):
+    help = 'Compares requests/sec of the employee read endpoints under WSGI and ASGI with concurrent clients'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--clients', type=int, default=200, help='Concurrent clients (default 200)')
+        parser.add_argument('--requests', type=int, default=4000, help='Requests per mode (default 4000)')
+        parser.add_argument('--threads', type=int, default=8,
+                            help='WSGI worker threads, like gunicorn --threads (default 8)')
+        parser.add_argument('--endpoint', choices=ENDPOINTS, default='mix',
+                            help='list, retrieve, filter or a mix of all three (default)')
+        parser.add_argument('--cache', action='store_true', help='Keep the people response cache on')
+
+    def handle(self, *args, **options):
+        clients, total, threads = options['clients'], options['requests'], options['threads']
+        if min(clients, total, threads) <= 0:
+            raise CommandError('--clients, --requests and --threads must be positive')
+
+        user = User.objects.filter(is_superuser=True, is_active=True).order_by('id').first()
+        if user is None:
+            raise CommandError('Create a superuser first (python manage.py createsuperuser)')
+        token = str(add_role_claims(RefreshToken.for_user(user), user, get_user_role(user)).access_token)
+
+        ids = list(Person.objects.values_list('id', flat=True)[:1000])
+        if not ids:
+            raise CommandError('No people in the database - load some first')
+        departments = list(Person.objects.order_by().values_list('department', flat=True).distinct())
+
+        requests = self.build_requests(options['endpoint'], total, ids, departments)
+        self.headers = [(b'host', HOST.encode()), (b'accept', b'application/json'),
+                        (b'authorization', f'Bearer {token}'.encode())]
+
+        sync_urls = url_module('bench_sync_urls', [])
+        async_urls = url_module('bench_async_urls', async_read_urlpatterns(router))
+
+        self.stdout.write(self.style.NOTICE(
+            f'{total} requests ({options["endpoint"]}), {clients} concurrent clients, '
+            f'{Person.objects.count()} people, cache {"on" if options["cache"] else "off"}'
+        ))
+
+        results = []
+        with override_settings(ALLOWED_HOSTS=[HOST], PEOPLE_CACHE_ENABLED=options['cache']):
+            with override_settings(ROOT_URLCONF=sync_urls):
+                results.append((f'WSGI ({threads} threads)', self.run_wsgi(requests, clients, threads)))
+                results.append(('ASGI, sync views', self.run_asgi(requests, clients)))
+            with override_settings(ROOT_URLCONF=async_urls):
+                results.append(('ASGI, async views', self.run_asgi(requests, clients)))
+
+        self.report(results)
+
+    def build_requests(self, endpoint, total, ids, departments):
+        randomizer = random.Random(42)
+        makers = {
+            'list': lambda: ('/api/employees/', 'page_size=50'),
+            'retrieve': lambda: (f'/api/employees/{randomizer.choice(ids)}/', ''),
+            'filter': lambda: ('/api/employees/filter_employees/', f'department={randomizer.choice(departments)}'),
+        }
+        kinds = list(makers) if endpoint == 'mix' else [endpoint]
+        return [makers[kinds[i % len(kinds)]]() for i in range(total)]
+
+    # ------------------------------------------------------------------
+    # WSGI
+    # ------------------------------------------------------------------
+
+    def run_wsgi(self, requests, clients, threads):
+        application = get_wsgi_application()
+        headers = {f'HTTP_{name.decode().upper()}': value.decode() for name, value in self.headers}
+
+        def call(request):
+            path_info, query = request
+            environ = {
+                'REQUEST_METHOD': 'GET', 'PATH_INFO': path_info, 'QUERY_STRING': query,
+                'SERVER_NAME': HOST, 'SERVER_PORT': '80', 'SERVER_PROTOCOL': 'HTTP/1.1',
+                'wsgi.url_scheme': 'http', 'wsgi.input': io.BytesIO(b''), 'wsgi.errors': sys.stderr,
+                **headers,
+            }
+            status = []
+            response = application(environ, lambda code, response_headers: status.append(int(code[:3])))
+            b''.join(response)
+            response.close()
+            return status[0]
+
+        def client():
+            while True:
+                try:
+                    request = queue.pop()
+                except IndexError:
+                    return
+                # Latency includes the wait for a free worker, as behind gunicorn
+                started = time.perf_counter()
+                code = workers.submit(call, request).result()
+                outcomes.append((code, time.perf_counter() - started))
+
+        queue, outcomes = list(reversed(requests)), []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as workers:
+            client_threads = [threading.Thread(target=client) for _ in range(clients)]
+            for thread in client_threads:
+                thread.start()
+            for thread in client_threads:
+                thread.join()
+        return outcomes, time.perf_counter() - started
+
+    # ------------------------------------------------------------------
+    # ASGI
+    # ------------------------------------------------------------------
+
+    def run_asgi(self, requests, clients):
+        application = get_asgi_application()
+
+        async def call(request):
+            path_info, query = request
+            scope = {
+                'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                'scheme': 'http', 'path': path_info, 'raw_path': path_info.encode(),
+                'query_string': query.encode(), 'root_path': '', 'headers': self.headers,
+                'server': (HOST, 80), 'client': ('127.0.0.1', 50000),
+            }
+            received = asyncio.Event()
+            status = []
+
+            async def receive():
+                if not received.is_set():
+                    received.set()
+                    return {'type': 'http.request', 'body': b'', 'more_body': False}
+                await asyncio.Event().wait()         # never disconnects
+
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    status.append(message['status'])
+
+            started = time.perf_counter()
+            await application(scope, receive, send)
+            return status[0], time.perf_counter() - started
+
+        async def client(queue, outcomes):
+            while queue:
+                outcomes.append(await call(queue.pop()))
+
+        async def main():
+            queue, outcomes = list(reversed(requests)), []
+            started = time.perf_counter()
+            await asyncio.gather(*(client(queue, outcomes) for _ in range(clients)))
+            return outcomes, time.perf_counter() - started
+
+        return asyncio.run(main())
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+
+    def report(self, results):
+        self.stdout.write('\n' + '=' * 66)
+        self.stdout.write(f'  {"Mode":<24}{"req/s":>10}{"p50":>10}{"p95":>10}{"p99":>10}')
+        failures = []
+        for label, (outcomes, elapsed) in results:
+            latencies = sorted(latency for _, latency in outcomes)
+            quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(
+                f'  {label:<24}{len(outcomes) / elapsed:>10.0f}'
+                f'{quantiles[49] * 1000:>8.1f}ms{quantiles[94] * 1000:>8.1f}ms{quantiles[98] * 1000:>8.1f}ms'
+            )
+            bad = [code for code, _ in outcomes if code != 200]
+            if bad:
+                failures.append(f'{label}: {len(bad)} responses were not 200 (e.g. {bad[0]})')
+        self.stdout.write('=' * 66)
+
+        if failures:
+            raise CommandError('; '.join(failures))
+        self.stdout.write(self.style.SUCCESS('✓ All responses were 200'))
@@ -0,0 +1,49 @@
+"""
+Django Management Command: Rebuild Headcount Summary
+
+Recomputes the people_headcount_summary table (served by
+GET /api/employees/stats/) from the people table, then verifies that the
+stored groups match a fresh aggregate:
+    python manage.py rebuild_headcount_summary
+
+Verify only, without rewriting anything (exits with an error on drift):
+    python manage.py rebuild_headcount_summary --check
+
+The summary is normally kept current by delta on every write
+(see people/headcount.py); run this after loading data with raw SQL or if
+--check reports drift.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+
+from people.headcount import compare_headcount_summary, rebuild_headcount_summary
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the headcount summary table from people and verifies it (use --check to only verify)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Only compare the summary with the people table; do not rebuild')
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            self.stdout.write(self.style.NOTICE('Rebuilding headcount summary...'))
+            groups = rebuild_headcount_summary()
+            self.stdout.write(self.style.SUCCESS(f'✓ Rebuilt {groups} groups'))
+
+        self.stdout.write(self.style.NOTICE('Verifying headcount summary...'))
+        differences = compare_headcount_summary()
+
+        if differences:
+            for difference in differences:
+                group = ' / '.join(value or '-' for value in difference['group'].values())
+                expected_count, expected_hours = difference['expected']
+                stored_count, stored_hours = difference['stored']
+                self.stdout.write(self.style.ERROR(
+                    f'✗ {group}: expected {expected_count} people / {expected_hours}h, '
+                    f'stored {stored_count} people / {stored_hours}h'
+                ))
+            raise CommandError(f'Headcount summary is inconsistent ({len(differences)} groups differ)')
+
+        self.stdout.write(self.style.SUCCESS('✓ Headcount summary matches the people table'))
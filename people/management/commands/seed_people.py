@@ -0,0 +1,84 @@
+"""
+Django Management Command: Seed Synthetic People
+
+Inserts N generated people (people/seeding.py) for benchmarks and staging:
+    python manage.py seed_people 100000
+    python manage.py seed_people 1000000 --seed 7
+
+The data passes Person.clean() (distinct emails, start_date <= end_date,
+time_commitment 0-80) with realistic department/subteam/status/position
+distributions, and is deterministic: the same --seed and person numbers
+always produce the same people.
+
+People are numbered; emails are derived from the number, so a second load
+into the same table needs a range that does not overlap the first:
+    python manage.py seed_people 1000000 --first-index 1000000
+
+Rows are streamed with COPY on PostgreSQL and inserted with executemany()
+batches of one INSERT on other databases, in one transaction
+(--method bulk_create goes through the ORM instead - portable but several
+times slower). Loads of 100k+ people that at least double the table drop the
+secondary indexes (trigram GIN indexes included) and build them once at the
+end; --indexes defer/keep forces either way. The people table is locked
+while that happens, so seed a live staging database with --indexes keep.
+
+The headcount summary and caches are updated once at the end; no change
+history is written (run snapshot_people_history afterwards to baseline
+as-of reads).
+
+1M people on a single core shared with a local PostgreSQL 18: ~55-60s (COPY
+~26s, index builds ~27s - they run in parallel workers on more cores);
+SQLite ~25s.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connection
+
+from people.seeding import SEED_BATCH_SIZE, seed_email, seed_people
+
+
+class Command(BaseCommand):
+    help = 'Generates N valid, realistic people deterministically by seed (COPY on PostgreSQL, batched INSERTs elsewhere)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', type=int, help='Number of people to insert')
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the generated data (default 0)')
+        parser.add_argument('--first-index', type=int, default=0,
+                            help='Number of the first person (default 0); ranges of separate loads must not overlap')
+        parser.add_argument('--method', choices=('copy', 'insert', 'bulk_create'),
+                            help='Insert method (default copy on PostgreSQL, insert elsewhere)')
+        parser.add_argument('--indexes', choices=('auto', 'defer', 'keep'), default='auto',
+                            help='Rebuild secondary indexes after the load (defer) or update them per row '
+                                 '(keep); default defer for large loads')
+        parser.add_argument('--batch-size', type=int, default=SEED_BATCH_SIZE,
+                            help=f'People per INSERT batch (default {SEED_BATCH_SIZE})')
+
+    def handle(self, *args, **options):
+        count, first_index = options['count'], options['first_index']
+        if count <= 0 or options['batch_size'] <= 0:
+            raise CommandError('count and --batch-size must be positive')
+        if first_index < 0:
+            raise CommandError('--first-index cannot be negative')
+        if options['method'] == 'copy' and connection.vendor != 'postgresql':
+            raise CommandError('COPY is PostgreSQL-specific - use --method insert')
+
+        self.stdout.write(self.style.NOTICE(
+            f'Seeding {count} people (#{first_index}..#{first_index + count - 1}, seed {options["seed"]})...'
+        ))
+        started = time.perf_counter()
+        try:
+            seed_people(count, seed=options['seed'], first_index=first_index,
+                        batch_size=options['batch_size'], method=options['method'],
+                        defer_indexes={'auto': None, 'defer': True, 'keep': False}[options['indexes']])
+        except IntegrityError as e:
+            raise CommandError(
+                f'Could not insert - people of this range already exist (e.g. {seed_email(first_index)})? '
+                f'Choose another --first-index. ({e})'
+            )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Seeded {count} people in {elapsed:.1f}s ({count / elapsed:,.0f} rows/s)'
+        ))
@@ -0,0 +1,26 @@
+"""
+Django Management Command: Snapshot People History
+
+Copies the current roster into a new history snapshot, so as-of reads
+(?as_of= on GET /api/employees/) only replay the changes made after it:
+    python manage.py snapshot_people_history
+
+Run it periodically (e.g. nightly from cron). Snapshots older than the
+newest one before any as-of time you still query can be deleted from the
+admin or the database; the change log itself is append-only.
+"""
+
+from django.core.management.base import BaseCommand
+
+from people.history import take_snapshot
+
+
+class Command(BaseCommand):
+    help = 'Snapshots every person into the history tables so as-of reads replay fewer changes'
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.NOTICE('Taking people history snapshot...'))
+        snapshot = take_snapshot()
+        self.stdout.write(self.style.SUCCESS(
+            f'✓ Snapshot {snapshot.pk} at {snapshot.taken_at.isoformat()} ({snapshot.people_count} people)'
+        ))
@@ -0,0 +1,277 @@
+"""
+Request Metrics (Prometheus)
+
+MetricsMiddleware times every request and records four histograms per
+(route, method, action, status):
+
+    acdc_http_request_duration_seconds        latency, first middleware to response
+    acdc_http_request_queries                 SQL queries run for the request
+    acdc_http_request_query_duration_seconds  time spent executing them
+    acdc_http_response_size_bytes             response body (not for streaming responses)
+
+route is the URL name (e.g. "person-list", "person-update-by-identifier"),
+or "unmatched" for paths that resolve to no view, so scanners cannot blow up
+the number of series. action is the PersonViewSet action that served the
+request ("list", "by_department", "update_by_identifier", ...) or "" for
+other views.
+
+Queries are counted by an execute wrapper installed once on every database
+connection when it is created (any alias - the replica too). It adds to the
+current request's counters through a context variable, so it follows the
+request into sync_to_async threads and async views. Queries outside a
+request (management commands, the SSE listener) are not counted.
+
+Recording is a context variable, a dict lookup and four bisects under a
+lock: ~5µs per request and ~0.5µs per query measured on one slow shared core
+(the request itself takes milliseconds). The numbers live in the memory of each
+worker process: Prometheus sees the process that answers the scrape, so run
+one scrape target per worker (or one worker per container).
+
+Served in the Prometheus text format by GET /api/metrics/ to superusers and
+to scrapers presenting PEOPLE_METRICS_TOKEN - a static secret, since access
+tokens expire within the hour:
+
+    Authorization: Metrics <PEOPLE_METRICS_TOKEN>
+
+Switched off with PEOPLE_METRICS_ENABLED=False.
+"""
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import BasePermission, IsAuthenticated, IsAdminUser
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# Authorization scheme of the scrape token - not "Bearer", so the JWT
+# authentication leaves the header alone
+METRICS_TOKEN_SCHEME = 'Metrics'
+
+# Histogram upper bounds (+Inf is implicit)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+QUERY_TIME_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+RESPONSE_SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+# (name, help, buckets) in the order of MetricsRegistry.record()'s values
+HISTOGRAMS = (
+    ('acdc_http_request_duration_seconds', 'Request latency in seconds', LATENCY_BUCKETS),
+    ('acdc_http_request_queries', 'SQL queries executed per request', QUERY_COUNT_BUCKETS),
+    ('acdc_http_request_query_duration_seconds', 'Time spent executing SQL per request, in seconds',
+     QUERY_TIME_BUCKETS),
+    ('acdc_http_response_size_bytes', 'Response body size in bytes (non-streaming responses)',
+     RESPONSE_SIZE_BUCKETS),
+)
+
+LABELS = ('route', 'method', 'action', 'status')
+
+UNMATCHED_ROUTE = 'unmatched'
+
+# [query count, seconds in SQL] of the request being handled, None outside requests
+request_queries = ContextVar('request_queries', default=None)
+
+
+class MetricsRegistry:
+    """Histograms per label tuple, in the memory of this process"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # label tuple → one list per histogram: bucket counts (the last one
+        # is +Inf), then the sum of the observed values
+        self.series = {}
+
+    def record(self, labels, elapsed, queries, query_seconds, size):
+        """One observation per histogram (size None = not observed) - unrolled, it runs on every request"""
+        with self.lock:
+            series = self.series.get(labels)
+            if series is None:
+                series = self.series[labels] = [[0] * (len(buckets) + 2) for _, _, buckets in HISTOGRAMS]
+            latency, query_count, query_time, response_size = series
+            latency[bisect_left(LATENCY_BUCKETS, elapsed)] += 1
+            latency[-1] += elapsed
+            query_count[bisect_left(QUERY_COUNT_BUCKETS, queries)] += 1
+            query_count[-1] += queries
+            query_time[bisect_left(QUERY_TIME_BUCKETS, query_seconds)] += 1
+            query_time[-1] += query_seconds
+            if size is not None:
+                response_size[bisect_left(RESPONSE_SIZE_BUCKETS, size)] += 1
+                response_size[-1] += size
+
+    def reset(self):
+        with self.lock:
+            self.series = {}
+
+    def snapshot(self):
+        """{label tuple: [(bucket counts, sum), ...]} copied under the lock"""
+        with self.lock:
+            return {
+                labels: [(histogram[:-1], histogram[-1]) for histogram in series]
+                for labels, series in self.series.items()
+            }
+
+    def render(self):
+        """All histograms in the Prometheus text exposition format"""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+        for position, (name, help_text, buckets) in enumerate(HISTOGRAMS):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, series in snapshot:
+                counts, total = series[position]
+                count = sum(counts)
+                if not count:
+                    continue
+                label_text = ','.join(f'{key}="{escape(value)}"' for key, value in zip(LABELS, labels))
+                cumulative = 0
+                for bound, bucket_count in zip(buckets + ('+Inf',), counts):
+                    cumulative += bucket_count
+                    lines.append(f'{name}_bucket{{{label_text},le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_sum{{{label_text}}} {total:g}')
+                lines.append(f'{name}_count{{{label_text}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def escape(value):
+    """Prometheus label value escaping"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
+
+
+# ============================================================================
+# QUERY COUNTING
+# ============================================================================
+
+def count_queries(execute, sql, params, many, context):
+    """Execute wrapper adding to the current request's [count, seconds]"""
+    counters = request_queries.get()
+    if counters is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        counters[0] += 1
+        counters[1] += time.perf_counter() - started
+
+
+def install_query_counter(sender, connection, **kwargs):
+    """connection_created receiver: wrap every query of the connection (once per connection object)"""
+    if count_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(count_queries)
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+def route_labels(request, response):
+    """(route, method, action, status) of a handled request"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return UNMATCHED_ROUTE, request.method, '', response.status_code
+    # ViewSet views carry their method → action mapping
+    action = getattr(match.func, 'actions', {}).get(request.method.lower(), '')
+    return match.view_name or match.route, request.method, action, response.status_code
+
+
+def response_size(response):
+    """Body size, None for streaming responses (their body is produced after the middleware)"""
+    if response.streaming:
+        return None
+    return len(response.content)
+
+
+class MetricsMiddleware:
+    """Records the HISTOGRAMS of every request - keep it first in MIDDLEWARE"""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PEOPLE_METRICS_ENABLED', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        counters = [0, 0.0]
+        token = request_queries.set(counters)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        self.record(request, response, time.perf_counter() - started, counters)
+        return response
+
+    async def __acall__(self, request):
+        counters = [0, 0.0]
+        token = request_queries.set(counters)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            request_queries.reset(token)
+        self.record(request, response, time.perf_counter() - started, counters)
+        return response
+
+    def record(self, request, response, elapsed, counters):
+        registry.record(route_labels(request, response), elapsed, counters[0], counters[1],
+                        response_size(response))
+
+
+class HasMetricsToken(BasePermission):
+    """Authorization: Metrics <PEOPLE_METRICS_TOKEN> - never matches while the setting is empty"""
+
+    def has_permission(self, request, view):
+        token = getattr(settings, 'PEOPLE_METRICS_TOKEN', '')
+        if not token:
+            return False
+        scheme, _, credentials = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        return scheme == METRICS_TOKEN_SCHEME and hmac.compare_digest(credentials.encode(), token.encode())
+
+
+@api_view(['GET'])
+@permission_classes([HasMetricsToken | (IsAuthenticated & IsAdminUser)])  # SECURED: scrape token or superusers
+def metrics_view(request):
+    """
+    GET /api/metrics/
+
+    Request metrics of the worker process that answers, in the Prometheus
+    text format (see module docstring)
+    SECURITY: Requires the scrape token, or authentication + superuser privileges
+
+    Headers:
+        Authorization: Metrics <PEOPLE_METRICS_TOKEN>   (scrapers - does not expire)
+        Authorization: Bearer <access_token>            (superusers)
+
+    Response (text/plain; version=0.0.4):
+        # HELP acdc_http_request_duration_seconds Request latency in seconds
+        # TYPE acdc_http_request_duration_seconds histogram
+        acdc_http_request_duration_seconds_bucket{route="person-list",method="GET",action="list",status="200",le="0.005"} 12
+        ...
+        acdc_http_request_duration_seconds_sum{route="person-list",method="GET",action="list",status="200"} 1.84
+        acdc_http_request_duration_seconds_count{route="person-list",method="GET",action="list",status="200"} 97
+
+    Prometheus scrape config:
+        authorization: {type: Metrics, credentials_file: /etc/prometheus/acdc_metrics_token}
+
+    Error Responses:
+    - 401: Not authenticated (and no valid scrape token)
+    - 403: Not a superuser
+    """
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
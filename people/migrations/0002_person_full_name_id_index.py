@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['full_name', 'id'], name='people_full_na_3c0640_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0002_person_full_name_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['updated_at'], name='people_updated_32d693_idx'),
+        ),
+    ]
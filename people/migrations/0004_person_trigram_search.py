@@ -0,0 +1,40 @@
+"""
+Trigram search support (PostgreSQL only).
+
+Enables pg_trgm and adds GIN trigram indexes on the fields used by
+GET /api/employees/search/. Other databases use the in-process index in
+people/search.py, so these steps are skipped there.
+"""
+
+from django.db import migrations
+
+TRIGRAM_FIELDS = ('full_name', 'acdc_email', 'personal_email')
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS people_{field}_trgm_idx '
+            f'ON people USING gin ({field} gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for field in TRIGRAM_FIELDS:
+        schema_editor.execute(f'DROP INDEX IF EXISTS people_{field}_trgm_idx')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0003_person_updated_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
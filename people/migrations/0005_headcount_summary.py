@@ -0,0 +1,54 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:26
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_summary(apps, schema_editor):
+    """Fill the summary from the existing roster (same as rebuild_headcount_summary)"""
+    Person = apps.get_model('people', 'Person')
+    HeadcountSummary = apps.get_model('people', 'HeadcountSummary')
+    groups = Person.objects.order_by().values('department', 'subteam', 'status', 'position').annotate(
+        headcount=Count('id'), hours=Sum('time_commitment')
+    )
+    # NULL and '' subteam/position land in the same group
+    totals = {}
+    for group in groups:
+        key = (group['department'], group['subteam'] or '', group['status'], group['position'] or '')
+        headcount, hours = totals.get(key, (0, 0))
+        totals[key] = (headcount + group['headcount'], hours + (group['hours'] or 0))
+
+    HeadcountSummary.objects.bulk_create([
+        HeadcountSummary(
+            department=department, subteam=subteam, status=status, position=position,
+            headcount=headcount, time_commitment=hours,
+        )
+        for (department, subteam, status, position), (headcount, hours) in totals.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0004_person_trigram_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HeadcountSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('department', models.TextField()),
+                ('subteam', models.TextField(blank=True, default='')),
+                ('status', models.CharField(max_length=20)),
+                ('position', models.TextField(blank=True, default='')),
+                ('headcount', models.IntegerField(default=0)),
+                ('time_commitment', models.BigIntegerField(default=0, help_text='Sum of time_commitment (hours)')),
+            ],
+            options={
+                'db_table': 'people_headcount_summary',
+                'constraints': [models.UniqueConstraint(fields=('department', 'subteam', 'status', 'position'), name='headcount_summary_group_unique')],
+            },
+        ),
+        migrations.RunPython(populate_summary, migrations.RunPython.noop),
+    ]
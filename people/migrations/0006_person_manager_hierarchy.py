@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0005_headcount_summary'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='person',
+            name='manager',
+            field=models.ForeignKey(blank=True, help_text='Person this person reports to', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='direct_reports', to='people.person'),
+        ),
+        migrations.CreateModel(
+            name='PersonHierarchy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveIntegerField()),
+                ('ancestor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='hierarchy_descendants', to='people.person')),
+                ('descendant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='hierarchy_ancestors', to='people.person')),
+            ],
+            options={
+                'db_table': 'people_hierarchy',
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='people_hier_ancesto_40b3d3_idx'), models.Index(fields=['descendant', 'depth'], name='people_hier_descend_62874a_idx')],
+                'constraints': [models.UniqueConstraint(fields=('ancestor', 'descendant'), name='hierarchy_pair_unique')],
+            },
+        ),
+    ]
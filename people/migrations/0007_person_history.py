@@ -0,0 +1,90 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:33
+
+import django.db.models.deletion
+import datetime
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def representation(value):
+    """Same JSON form as the API (UTC datetimes with Z, ISO dates)"""
+    if isinstance(value, datetime.datetime):
+        text = value.astimezone(datetime.timezone.utc).isoformat()
+        return text[:-6] + 'Z' if text.endswith('+00:00') else text
+    if isinstance(value, datetime.date):
+        return value.isoformat()
+    return value
+
+
+def baseline_snapshot(apps, schema_editor):
+    """
+    Snapshot the roster as it is when history starts, so as-of reads after
+    this point know about people created before it.
+    """
+    Person = apps.get_model('people', 'Person')
+    HistorySnapshot = apps.get_model('people', 'HistorySnapshot')
+    PersonSnapshot = apps.get_model('people', 'PersonSnapshot')
+
+    columns = [field.name for field in Person._meta.concrete_fields]
+    snapshot = HistorySnapshot.objects.create(taken_at=timezone.now())
+    rows = [
+        PersonSnapshot(
+            snapshot=snapshot, person_id=row['id'],
+            data={column: representation(row[column]) for column in columns},
+        )
+        for row in Person.objects.order_by('id').values(*columns)
+    ]
+    PersonSnapshot.objects.bulk_create(rows, batch_size=2000)
+    snapshot.people_count = len(rows)
+    snapshot.save(update_fields=['people_count'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0006_person_manager_hierarchy'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HistorySnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('taken_at', models.DateTimeField(unique=True)),
+                ('people_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'people_history_snapshot',
+            },
+        ),
+        migrations.CreateModel(
+            name='PersonChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('person_id', models.BigIntegerField()),
+                ('action', models.CharField(choices=[('create', 'Create'), ('update', 'Update'), ('delete', 'Delete')], max_length=10)),
+                ('changes', models.JSONField()),
+                ('changed_at', models.DateTimeField()),
+                ('changed_by', models.TextField(blank=True, help_text='Username of the API caller, if any', null=True)),
+            ],
+            options={
+                'db_table': 'people_history',
+                'indexes': [models.Index(fields=['person_id', 'changed_at'], name='people_hist_person__b47b6b_idx'), models.Index(fields=['changed_at'], name='people_hist_changed_c9937d_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='PersonSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('person_id', models.BigIntegerField()),
+                ('data', models.JSONField()),
+                ('snapshot', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='people', to='people.historysnapshot')),
+            ],
+            options={
+                'db_table': 'people_snapshot',
+                'constraints': [models.UniqueConstraint(fields=('snapshot', 'person_id'), name='snapshot_person_unique')],
+            },
+        ),
+        migrations.RunPython(baseline_snapshot, migrations.RunPython.noop),
+    ]
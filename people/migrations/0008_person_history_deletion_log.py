@@ -0,0 +1,17 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0007_person_history'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='personchange',
+            index=models.Index(condition=models.Q(('action', 'delete')), fields=['changed_at', 'id'], name='people_history_deletions'),
+        ),
+    ]
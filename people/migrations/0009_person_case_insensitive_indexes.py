@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:07
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0008_person_history_deletion_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(django.db.models.functions.text.Lower('acdc_email'), name='people_acdc_email_ci_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(django.db.models.functions.text.Lower('personal_email'), name='people_personal_email_ci_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(django.db.models.functions.text.Lower('full_name'), name='people_full_name_ci_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.2.6 on 2026-10-18 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0009_person_case_insensitive_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedPerson',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('full_name', models.TextField()),
+                ('acdc_email', models.TextField(blank=True, null=True)),
+                ('personal_email', models.TextField(blank=True, null=True)),
+                ('phone', models.TextField(blank=True, null=True)),
+                ('department', models.TextField(choices=[('Engineering', 'Engineering'), ('Product Management', 'Product Management'), ('Design', 'Design'), ('Sales', 'Sales'), ('Marketing', 'Marketing'), ('Executive', 'Executive'), ('Human Resources', 'Human Resources'), ('Finance', 'Finance')])),
+                ('subteam', models.TextField(blank=True, null=True)),
+                ('position', models.TextField(blank=True, choices=[('Volunteer', 'Volunteer'), ('Asst. Director', 'Asst. Director'), ('Director', 'Director')], null=True)),
+                ('status', models.CharField(choices=[('active', 'Active'), ('inactive', 'Inactive'), ('on_leave', 'On Leave')], max_length=20)),
+                ('timezone', models.TextField(blank=True, null=True)),
+                ('reports_to', models.TextField(blank=True, choices=[('Director', 'Director'), ('Asst. Director', 'Asst. Director'), ('Jenny', 'Jenny')], null=True)),
+                ('manager', models.BigIntegerField(blank=True, help_text="Id of the person's manager", null=True)),
+                ('time_commitment', models.SmallIntegerField(blank=True, null=True)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('archived_at', models.DateTimeField()),
+                ('archived_by', models.TextField(blank=True, help_text='Who ran the archive pass', null=True)),
+            ],
+            options={
+                'db_table': 'people_archive',
+                'ordering': ['full_name'],
+                'indexes': [models.Index(fields=['full_name', 'id'], name='people_arch_full_na_07c270_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('people', '0010_person_archive'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['start_date', 'id'], name='people_start_d_709070_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='person',
+            index=models.Index(fields=['created_at', 'id'], name='people_created_d5ff46_idx'),
+        ),
+    ]
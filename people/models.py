@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Value
+from django.db.models.functions import Lower
 
 # Create your models here.
 from django.core.exceptions import ValidationError
@@ -29,6 +31,32 @@ STATUS_CHOICES = [
 ]
 
 
+# Fields matched case-insensitively (emails and names typed by people), each
+# with a LOWER(field) index in Person.Meta.indexes
+CASE_INSENSITIVE_FIELDS = ('acdc_email', 'personal_email', 'full_name')
+
+
+class PersonQuerySet(models.QuerySet):
+
+    def matching(self, **values):
+        """
+        Case-insensitive equality that the LOWER() indexes can serve:
+            Person.objects.matching(acdc_email='Ada@ACDC.com')
+
+        Use it instead of __iexact, which compiles to UPPER(col) = UPPER(%s) on
+        PostgreSQL and LIKE on SQLite - neither can use an index. Both sides
+        are lowered by the database, so SQLite (ASCII-only LOWER) and
+        PostgreSQL each compare consistently with their own index.
+        """
+        queryset = self
+        for field, value in values.items():
+            if field not in CASE_INSENSITIVE_FIELDS:
+                raise ValueError(f'{field} has no case-insensitive index')
+            key = f'{field}_key'
+            queryset = queryset.alias(**{key: Lower(field)}).filter(**{key: Lower(Value(value))})
+        return queryset
+
+
 class Person(models.Model):
     # -- Identity & contact --
     # Using full_name to match PostgreSQL, with proper validation
@@ -37,8 +65,9 @@ class Person(models.Model):
         # Django will handle the NOT NULL constraint
     )
     
-    # Using TextField to match PostgreSQL CITEXT behavior
-    # EmailField validation will still work, but storage matches CITEXT
+    # Plain text, compared case-sensitively by the unique constraints (no
+    # CITEXT). Case-insensitive lookups go through Person.objects.matching()
+    # and the LOWER() indexes below.
     acdc_email = models.TextField(
         unique=True, 
         blank=True, 
@@ -93,6 +122,16 @@ class Person(models.Model):
         help_text="Reporting manager"
     )
 
+    # Real reporting line - the org chart is kept in PersonHierarchy (closure table)
+    manager = models.ForeignKey(
+        'self',
+        on_delete=models.SET_NULL,
+        blank=True,
+        null=True,
+        related_name='direct_reports',
+        help_text="Person this person reports to"
+    )
+
     # SmallIntegerField matches PostgreSQL SMALLINT with range check
     time_commitment = models.SmallIntegerField(
         blank=True, 
@@ -110,11 +149,23 @@ class Person(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = PersonQuerySet.as_manager()
+
     class Meta:
         db_table = 'people'  # Match PostgreSQL table name exactly
         indexes = [
             models.Index(fields=["status"]),
             models.Index(fields=["department", "subteam"]),
+            # Keyset pagination walks (ordering field, id) - see people/pagination.py
+            models.Index(fields=["full_name", "id"]),
+            models.Index(fields=["start_date", "id"]),
+            models.Index(fields=["created_at", "id"]),
+            # MAX(updated_at) backs the ETag/Last-Modified validators - see people/conditional.py
+            models.Index(fields=["updated_at"]),
+            # Case-insensitive identity lookups - see PersonQuerySet.matching()
+            models.Index(Lower("acdc_email"), name="people_acdc_email_ci_idx"),
+            models.Index(Lower("personal_email"), name="people_personal_email_ci_idx"),
+            models.Index(Lower("full_name"), name="people_full_name_ci_idx"),
             # Note: PostgreSQL has trigram index on full_name
             # Django doesn't directly support this, but it will use the existing index
         ]
@@ -133,6 +184,11 @@ class Person(models.Model):
         return f"{self.full_name} ({self.acdc_email})"
 
     def clean(self):
+        self.clean_values()
+        self.clean_manager()
+
+    def clean_values(self):
+        """The rules that need only this row's values - no queries, so the bulk paths run it per row"""
         # Validate full_name is not empty (matches PostgreSQL CHECK)
         if not self.full_name or len(self.full_name.strip()) == 0:
             raise ValidationError({"full_name": "Full name cannot be empty."})
@@ -156,10 +212,20 @@ class Person(models.Model):
         if self.personal_email and '@' not in self.personal_email:
             raise ValidationError({"personal_email": "Invalid email format."})
 
+    def clean_manager(self):
+        """Reporting-line rule - reads the closure table"""
+        # A person cannot report to themselves or to anyone in their own reporting line
+        from .hierarchy import creates_cycle
+        if creates_cycle(self.pk, self.manager_id):
+            raise ValidationError({"manager": "A person cannot report to themselves or to one of their reports."})
+
     def save(self, *args, **kwargs):
         # Run clean validation before saving
         self.clean()
-        super().save(*args, **kwargs)
+        # One transaction for the row and everything the save signals write
+        # (history, headcount summary, hierarchy)
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     @property
     def is_active_member(self) -> bool:
@@ -176,4 +242,182 @@ class Person(models.Model):
     def last_name(self) -> str:
         """Extract last name from full_name"""
         parts = self.full_name.split() if self.full_name else []
-        return " ".join(parts[1:]) if len(parts) > 1 else ""
\ No newline at end of file
+        return " ".join(parts[1:]) if len(parts) > 1 else ""
+
+
+class HeadcountSummary(models.Model):
+    """
+    Headcount and summed time_commitment per (department, subteam, status, position).
+
+    Maintained by delta on every Person write (see people/headcount.py) so
+    GET /api/employees/stats/ reads one row per group instead of the roster.
+    Missing subteam/position are stored as '' so the unique constraint holds.
+    """
+    department = models.TextField()
+    subteam = models.TextField(blank=True, default='')
+    status = models.CharField(max_length=20)
+    position = models.TextField(blank=True, default='')
+
+    headcount = models.IntegerField(default=0)
+    time_commitment = models.BigIntegerField(default=0, help_text="Sum of time_commitment (hours)")
+
+    class Meta:
+        db_table = 'people_headcount_summary'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['department', 'subteam', 'status', 'position'],
+                name='headcount_summary_group_unique'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.department}/{self.subteam}/{self.status}/{self.position}: {self.headcount}"
+
+
+class PersonHierarchy(models.Model):
+    """
+    Closure table of the reporting hierarchy: one row for every
+    (manager above, person below) pair with the number of levels between them.
+
+    Direct reports have depth 1, their reports depth 2, and so on. There are
+    no self rows. Maintained from Person.manager by people/hierarchy.py, so
+    "everyone under X" and "everyone above Y" are single indexed queries.
+    """
+    # db_index=False: the composite indexes below lead with these columns
+    ancestor = models.ForeignKey(
+        Person, on_delete=models.CASCADE, related_name='hierarchy_descendants', db_index=False
+    )
+    descendant = models.ForeignKey(
+        Person, on_delete=models.CASCADE, related_name='hierarchy_ancestors', db_index=False
+    )
+    depth = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = 'people_hierarchy'
+        indexes = [
+            # Subtree of X ordered/limited by depth
+            models.Index(fields=['ancestor', 'depth']),
+            # Management chain of Y
+            models.Index(fields=['descendant', 'depth']),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['ancestor', 'descendant'], name='hierarchy_pair_unique'),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} → {self.descendant_id} ({self.depth})"
+
+
+class PersonChange(models.Model):
+    """
+    Append-only history of Person writes (see people/history.py).
+
+    changes holds a field-level diff in API representation:
+    - create: {field: [null, value]} for every field
+    - update: {field: [old, new]} for changed fields only
+    - delete: {field: [value, null]} for every field
+
+    person_id is a plain column, not a foreign key, so history outlives the person.
+    """
+    ACTION_CHOICES = [
+        ("create", "Create"),
+        ("update", "Update"),
+        ("delete", "Delete"),
+    ]
+
+    person_id = models.BigIntegerField()
+    action = models.CharField(max_length=10, choices=ACTION_CHOICES)
+    changes = models.JSONField()
+    changed_at = models.DateTimeField()
+    changed_by = models.TextField(blank=True, null=True, help_text="Username of the API caller, if any")
+
+    class Meta:
+        db_table = 'people_history'
+        indexes = [
+            # History of one person / replay of one person after a snapshot
+            models.Index(fields=['person_id', 'changed_at']),
+            # Replay of everyone between a snapshot and an as-of time
+            models.Index(fields=['changed_at']),
+            # Deletion log read by delta sync (see people/sync.py)
+            models.Index(fields=['changed_at', 'id'], condition=models.Q(action='delete'),
+                         name='people_history_deletions'),
+        ]
+
+    def __str__(self):
+        return f"{self.action} person {self.person_id} at {self.changed_at}"
+
+
+class HistorySnapshot(models.Model):
+    """
+    A full copy of the roster at taken_at (rows in PersonSnapshot).
+
+    As-of reads start from the latest snapshot at or before the requested
+    time and replay only the PersonChange rows after it.
+    """
+    taken_at = models.DateTimeField(unique=True)
+    people_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'people_history_snapshot'
+
+    def __str__(self):
+        return f"Snapshot at {self.taken_at} ({self.people_count} people)"
+
+
+class PersonSnapshot(models.Model):
+    """One person's full API representation inside a HistorySnapshot"""
+    snapshot = models.ForeignKey(HistorySnapshot, on_delete=models.CASCADE, related_name='people', db_index=False)
+    person_id = models.BigIntegerField()
+    data = models.JSONField()
+
+    class Meta:
+        db_table = 'people_snapshot'
+        constraints = [
+            # Leading snapshot column also serves "all people of a snapshot"
+            models.UniqueConstraint(fields=['snapshot', 'person_id'], name='snapshot_person_unique'),
+        ]
+
+    def __str__(self):
+        return f"Person {self.person_id} in snapshot {self.snapshot_id}"
+
+
+class ArchivedPerson(models.Model):
+    """
+    A departed person moved out of the people table (see people/archive.py).
+
+    Same columns as Person, so archived rows serialize and paginate like live
+    ones; the id is the person's original id and manager is a plain column -
+    the manager may be archived or deleted later. No unique constraints:
+    someone else may take the email meanwhile (restore checks for that).
+    """
+    id = models.BigIntegerField(primary_key=True)
+    full_name = models.TextField()
+    acdc_email = models.TextField(blank=True, null=True)
+    personal_email = models.TextField(blank=True, null=True)
+    phone = models.TextField(blank=True, null=True)
+    department = models.TextField(choices=DEPARTMENT_CHOICES)
+    subteam = models.TextField(blank=True, null=True)
+    position = models.TextField(choices=POSITION_CHOICES, blank=True, null=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    timezone = models.TextField(blank=True, null=True)
+    reports_to = models.TextField(choices=Person.REPORTS_TO_CHOICES, blank=True, null=True)
+    manager = models.BigIntegerField(blank=True, null=True, help_text="Id of the person's manager")
+    time_commitment = models.SmallIntegerField(blank=True, null=True)
+    start_date = models.DateField()
+    end_date = models.DateField(blank=True, null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    archived_at = models.DateTimeField()
+    archived_by = models.TextField(blank=True, null=True, help_text="Who ran the archive pass")
+
+    class Meta:
+        db_table = 'people_archive'
+        indexes = [
+            # Keyset pagination of ?include_archived=1 lists - see people/pagination.py
+            models.Index(fields=["full_name", "id"]),
+        ]
+        ordering = ["full_name"]
+
+    def __str__(self):
+        return f"{self.full_name} ({self.acdc_email}, archived)"
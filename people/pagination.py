@@ -0,0 +1,255 @@
+"""
+Keyset (Cursor) Pagination for Person and User Endpoints
+
+Pages are addressed by the position of the last row seen instead of an
+OFFSET, so fetching page 500 costs the same single indexed query as page 1:
+
+    WHERE (full_name > 'Jane Doe') OR (full_name = 'Jane Doe' AND id > 42)
+    ORDER BY full_name, id
+    LIMIT 51
+
+Every sort key is paired with the primary key as a tie-breaker, which keeps the
+order stable even for low-cardinality keys like department or status.
+The orderings people page through - full_name, start_date and created_at -
+each have a composite (field, id) index (Person.Meta.indexes).
+
+Works on model querysets and on .values() querysets (rows as dicts), which
+the PersonViewSet read path uses with PersonFastSerializer, and fetches
+asynchronously for the ASGI read path (apaginate_queryset).
+
+Usage:
+    GET /api/employees/                               - First page, sorted by full_name
+    GET /api/employees/?ordering=-start_date          - Newest starters first
+    GET /api/employees/?page_size=100                 - Bigger pages (capped at max_page_size)
+    GET /api/employees/?cursor=<opaque token>         - Follow a next/previous link
+
+Response:
+    {
+        "next": "http://.../api/employees/?cursor=eyJvIjoi...",
+        "previous": null,
+        "results": [ ... ]
+    }
+
+Cursors are opaque base64 tokens - clients should only ever follow the links
+returned by the API and never build cursors themselves.
+
+UserCursorPagination (GET /api/users/) and PersonHistoryCursorPagination
+(GET /api/employees/{id}/history/) use DRF's built-in CursorPagination,
+newest first.
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, CursorPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class PersonCursorPagination(BasePagination):
+    """
+    Cursor pagination over (<sort key>, id) for Person querysets.
+
+    Only NOT NULL columns are whitelisted as sort keys - a NULL would break the
+    "greater than" comparison the cursor relies on.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    ordering_query_param = 'ordering'
+    invalid_cursor_message = 'Invalid cursor'
+
+    # Whitelisted sort keys (prefix with "-" for descending order)
+    ordering_fields = ['full_name', 'department', 'status', 'start_date', 'created_at', 'updated_at']
+    default_ordering = 'full_name'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.set_page(list(self.page_queryset(queryset, request)))
+
+    async def apaginate_queryset(self, queryset, request):
+        """paginate_queryset() with an async fetch (async read path, people/async_views.py)"""
+        return self.set_page([row async for row in self.page_queryset(queryset, request)])
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        paginate_queryset() over several querysets with the same columns and
+        disjoint ids (people and archived people): each contributes its own
+        page, merged in (sort key, id) order - every row before the cursor
+        is in one of them.
+        """
+        rows = []
+        for queryset in querysets:
+            rows.extend(self.page_queryset(queryset, request))
+        walk_descending = self.ordering.startswith('-') != self.reverse
+        rows.sort(key=self.get_row_position, reverse=walk_descending)
+        return self.set_page(rows[:self.page_size + 1])
+
+    def page_queryset(self, queryset, request):
+        """The sliced, keyset-filtered queryset for the requested page (one extra row)"""
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request)
+
+        field_name = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        self.field = queryset.model._meta.get_field(field_name)
+
+        self.cursor = self.decode_cursor(request)
+        self.reverse = self.cursor is not None and self.cursor['reverse']
+
+        # Following a "previous" link walks the index backwards, then flips the page
+        walk_descending = descending != self.reverse
+        if walk_descending:
+            queryset = queryset.order_by(f'-{field_name}', '-pk')
+        else:
+            queryset = queryset.order_by(field_name, 'pk')
+
+        if self.cursor is not None:
+            op = 'lt' if walk_descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field_name}__{op}': self.cursor['value']}) |
+                Q(**{field_name: self.cursor['value'], f'pk__{op}': self.cursor['pk']})
+            )
+
+        # Fetch one extra row to find out whether there is another page
+        return queryset[:self.page_size + 1]
+
+    def set_page(self, rows):
+        """Trim the extra row fetched by page_queryset() and work out next/previous"""
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    # ------------------------------------------------------------------
+    # Request parsing
+    # ------------------------------------------------------------------
+
+    def get_page_size(self, request):
+        raw = request.query_params.get(self.page_size_query_param)
+        if raw is None:
+            return self.page_size
+        try:
+            size = int(raw)
+        except (TypeError, ValueError):
+            raise ValidationError({self.page_size_query_param: 'Must be a positive integer.'})
+        if size <= 0:
+            raise ValidationError({self.page_size_query_param: 'Must be a positive integer.'})
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, request):
+        ordering = request.query_params.get(self.ordering_query_param) or self.default_ordering
+        if ordering.lstrip('-') not in self.ordering_fields:
+            raise ValidationError({
+                self.ordering_query_param: f"Cannot sort by '{ordering}'. "
+                                           f"Allowed: {', '.join(self.ordering_fields)}"
+            })
+        return ordering
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if encoded is None:
+            return None
+
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            if payload['o'] != self.ordering:
+                raise ValueError('Cursor was issued for a different ordering')
+            return {
+                'value': self.field.to_python(payload['v']),
+                'pk': int(payload['id']),
+                'reverse': bool(payload['r']),
+            }
+        except (TypeError, ValueError, KeyError, binascii.Error, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_row_position(self, row):
+        """(sort value, pk) of a model instance or a .values() dict"""
+        if isinstance(row, dict):
+            return row[self.field.attname], row['id']
+        return getattr(row, self.field.attname), row.pk
+
+    def encode_cursor(self, row, reverse):
+        value, pk = self.get_row_position(row)
+        if isinstance(value, (datetime.date, datetime.datetime)):
+            value = value.isoformat()
+
+        payload = json.dumps({'o': self.ordering, 'v': value, 'id': pk, 'r': int(reverse)},
+                             separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Nothing exists before the cursor row, so the first page starts with it
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class UserCursorPagination(CursorPagination):
+    """
+    Cursor pagination for the superuser-only user list, newest accounts first.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    ordering = ('-date_joined', '-id')
+
+
+class PersonHistoryCursorPagination(CursorPagination):
+    """
+    Cursor pagination for GET /api/employees/{id}/history/, newest change first.
+    Walks the (person_id, changed_at) index.
+    """
+
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = 'page_size'
+    ordering = ('-changed_at', '-id')
@@ -18,11 +18,24 @@ Usage in views:
             elif self.action == 'destroy':
                 return [IsFullAccessUser()]
             return [IsAuthenticated()]
+
+Role claims:
+    When the request was authenticated with HRClaimsAuthentication, the user's
+    role comes from the JWT ("role" claim) and no database query is made.
+    Otherwise the checks fall back to the user's groups in auth_user_groups.
 """
 
 from rest_framework import permissions
 
 
+def get_token_role(user):
+    """
+    Return the HR role carried in the user's JWT, or None if the user was
+    loaded from the database (see people/authentication.py).
+    """
+    return getattr(user, 'hr_role', None)
+
+
 class IsReadOnlyOrAbove(permissions.BasePermission):
     """
     Permission check for Read-Only access and above.
@@ -48,9 +61,15 @@ class IsReadOnlyOrAbove(permissions.BasePermission):
         if request.user.is_superuser:
             return True
         
+        allowed_groups = ['HR_ReadOnly', 'HR_ReadWrite', 'HR_FullAccess']
+        
+        # Role from JWT claims - no database query
+        token_role = get_token_role(request.user)
+        if token_role is not None:
+            return token_role in allowed_groups
+        
         # Check if user belongs to any HR role group
         user_groups = request.user.groups.values_list('name', flat=True)
-        allowed_groups = ['HR_ReadOnly', 'HR_ReadWrite', 'HR_FullAccess']
         
         return any(group in allowed_groups for group in user_groups)
 
@@ -82,9 +101,15 @@ class IsReadWriteOrAbove(permissions.BasePermission):
         if request.user.is_superuser:
             return True
         
+        allowed_groups = ['HR_ReadWrite', 'HR_FullAccess']
+        
+        # Role from JWT claims - no database query
+        token_role = get_token_role(request.user)
+        if token_role is not None:
+            return token_role in allowed_groups
+        
         # Check if user belongs to ReadWrite or FullAccess group
         user_groups = request.user.groups.values_list('name', flat=True)
-        allowed_groups = ['HR_ReadWrite', 'HR_FullAccess']
         
         return any(group in allowed_groups for group in user_groups)
 
@@ -116,6 +141,11 @@ class IsFullAccessUser(permissions.BasePermission):
         if request.user.is_superuser:
             return True
         
+        # Role from JWT claims - no database query
+        token_role = get_token_role(request.user)
+        if token_role is not None:
+            return token_role == 'HR_FullAccess'
+        
         # Check if user belongs to FullAccess group
         return request.user.groups.filter(name='HR_FullAccess').exists()
 
@@ -171,6 +201,28 @@ class CannotModifySelf(permissions.BasePermission):
 # HELPER FUNCTIONS
 # ============================================================================
 
+HR_ROLES = ['HR_ReadOnly', 'HR_ReadWrite', 'HR_FullAccess']
+
+
+def role_from_group_names(group_names, no_role="No Role"):
+    """
+    Pick a role name from a user's group names (ordered by group id).
+    
+    Returns:
+        - First HR role found
+        - First group name if user only has non-HR groups
+        - no_role if the list is empty
+    """
+    if not group_names:
+        return no_role
+    
+    for name in group_names:
+        if name in HR_ROLES:
+            return name
+    
+    return group_names[0]
+
+
 def get_user_role(user):
     """
     Helper function to get a user's role name.
@@ -180,23 +232,19 @@ def get_user_role(user):
         - "HR_ReadOnly", "HR_ReadWrite", or "HR_FullAccess" if user has HR role
         - "No Role" if user has no groups
         - First group name if user has non-HR groups
+    
+    Costs at most one query (none for stateless token users).
     """
     if user.is_superuser:
         return "Superuser"
     
-    user_groups = user.groups.all()
-    
-    if not user_groups.exists():
-        return "No Role"
-    
-    # Check for HR roles
-    hr_roles = ['HR_ReadOnly', 'HR_ReadWrite', 'HR_FullAccess']
-    for group in user_groups:
-        if group.name in hr_roles:
-            return group.name
+    # Stateless token users carry their role in the JWT
+    token_role = get_token_role(user)
+    if token_role is not None:
+        return token_role
     
-    # Return first group if no HR role found
-    return user_groups.first().name
+    group_names = list(user.groups.order_by('id').values_list('name', flat=True))
+    return role_from_group_names(group_names)
 
 
 def user_has_permission_level(user, required_level):
@@ -217,7 +265,12 @@ def user_has_permission_level(user, required_level):
     if user.is_superuser:
         return True
     
-    user_groups = user.groups.values_list('name', flat=True)
+    # Role from JWT claims stands in for the group list
+    token_role = get_token_role(user)
+    if token_role is not None:
+        user_groups = [token_role]
+    else:
+        user_groups = user.groups.values_list('name', flat=True)
     
     if required_level == "read":
         # Any HR role can read
@@ -0,0 +1,103 @@
+"""
+Database Connection Pool Statistics
+
+With DB_POOL=True (company_portal/settings.py) every worker process keeps a
+psycopg 3 ConnectionPool per database alias (Django's "pool" option). A
+request borrows an open connection and hands it back when Django closes the
+connection at the end of the request, instead of paying for TCP + TLS +
+authentication on every request.
+
+pool_stats() reports each pool of this process:
+
+    {
+        "alias": "default",
+        "min_size": 2,
+        "max_size": 10,
+        "size": 6,                      # connections open
+        "in_use": 4,                    # lent to requests right now
+        "idle": 2,
+        "waiting": 0,                   # requests queued for a connection right now
+        "requests": 1520,               # connections handed out since start
+        "requests_queued": 12,          # ... of which had to wait for one
+        "acquire_wait_ms": 85,          # total time spent waiting
+        "acquire_wait_ms_avg": 0.056,   # per request
+        "request_errors": 0,            # timeouts (DB_POOL_TIMEOUT) and other failures
+        "connections_opened": 6,
+        "connect_ms": 210,              # total time spent connecting
+        "connection_errors": 0,
+        "connections_lost": 0,          # found broken by the health check or on return
+    }
+
+Served by GET /api/db/pool/ (superusers).
+"""
+
+from django.db import connections
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
+from rest_framework.response import Response
+
+
+def get_pool(alias):
+    """The psycopg pool of a database alias, or None when it is not pooled"""
+    return getattr(connections[alias], 'pool', None)
+
+
+def pool_stats():
+    """Statistics of every pooled database alias (see module docstring)"""
+    stats = []
+    for alias in connections:
+        pool = get_pool(alias)
+        if pool is None:
+            continue
+        raw = pool.get_stats()
+        requests = raw.get('requests_num', 0)
+        size, idle = raw.get('pool_size', 0), raw.get('pool_available', 0)
+        stats.append({
+            "alias": alias,
+            "min_size": raw.get('pool_min', pool.min_size),
+            "max_size": raw.get('pool_max', pool.max_size),
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": raw.get('requests_waiting', 0),
+            "requests": requests,
+            "requests_queued": raw.get('requests_queued', 0),
+            "acquire_wait_ms": raw.get('requests_wait_ms', 0),
+            "acquire_wait_ms_avg": round(raw.get('requests_wait_ms', 0) / requests, 3) if requests else 0.0,
+            "request_errors": raw.get('requests_errors', 0),
+            "connections_opened": raw.get('connections_num', 0),
+            "connect_ms": raw.get('connections_ms', 0),
+            "connection_errors": raw.get('connections_errors', 0),
+            "connections_lost": raw.get('connections_lost', 0) + raw.get('returns_bad', 0),
+        })
+    return stats
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])  # SECURED: Only superusers
+def database_pool_stats(request):
+    """
+    GET /api/db/pool/
+
+    Connection pool statistics of the worker process that answers
+    SECURITY: Requires authentication + superuser privileges
+
+    Headers:
+        Authorization: Bearer <access_token>
+
+    Response:
+    {
+        "pooled": true,
+        "pools": [{"alias": "default", "size": 6, "in_use": 4, "waiting": 0, ...}]
+    }
+
+    "pooled" is false (and "pools" empty) unless DB_POOL is on.
+    Each worker process has its own pools - with several workers, repeated
+    calls may be answered by different ones.
+
+    Error Responses:
+    - 401: Not authenticated
+    - 403: Not a superuser
+    """
+    pools = pool_stats()
+    return Response({"pooled": bool(pools), "pools": pools})
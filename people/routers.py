@@ -0,0 +1,187 @@
+"""
+Database Router: Read Replica for Employee Reads
+
+With a "replica" alias in settings.DATABASES (see company_portal/settings.py),
+the read endpoints that dominate traffic are served from the replica and
+everything else stays on the primary ("default"):
+
+    PersonViewSet read actions (list, retrieve, filter_employees, search, ...)  → replica
+    GET /api/users/ (UserListView)                                             → replica
+    async read views (people/async_views.py)                                   → replica
+    every write, and every other read                                          → primary
+
+Routing is opt-in per request: ReplicaReadsMixin (or the async read views)
+sets a context variable once the caller is authenticated, and
+ReadReplicaRouter sends reads made under it to the replica. Authentication,
+permission checks and writes never see the flag.
+
+Read-your-writes: a replica lags the primary, so someone who just saved a
+change could list employees and not see it. After a successful write
+(POST/PUT/PATCH/DELETE) the writer is pinned to the primary for
+PEOPLE_REPLICA_STICKY_SECONDS; the pin lives in the "people" cache, so it
+follows the user across workers. That cache must therefore be shared: with a
+replica configured, a per-process backend (LocMemCache, DummyCache) fails the
+system checks (people.E001) instead of silently losing the pin on every other
+worker.
+
+Delta sync (GET /api/employees/changes/) always reads the primary: its
+settle window only covers transactions still committing, not replication lag.
+
+Settings:
+    DATABASE_ROUTERS = ['people.routers.ReadReplicaRouter']
+    PEOPLE_REPLICA_READS = True          # False = every read on the primary
+    PEOPLE_REPLICA_STICKY_SECONDS = 10   # pin writers to the primary this long
+"""
+
+import contextvars
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import caches
+from django.db import DEFAULT_DB_ALIAS
+from rest_framework.permissions import SAFE_METHODS
+
+REPLICA_ALIAS = 'replica'
+
+# Cache key pinning a user to the primary after a write
+STICKY_KEY = 'people:primary:{user_id}'
+
+# Cache backends that do not share entries between worker processes
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# True while the current request may read from the replica
+replica_reads = contextvars.ContextVar('people_replica_reads', default=False)
+
+
+def replica_configured():
+    """True if there is a replica and reads may use it"""
+    return REPLICA_ALIAS in settings.DATABASES and getattr(settings, 'PEOPLE_REPLICA_READS', True)
+
+
+def sticky_seconds():
+    return getattr(settings, 'PEOPLE_REPLICA_STICKY_SECONDS', 10)
+
+
+def sticky_key(user):
+    return STICKY_KEY.format(user_id=user.pk)
+
+
+def sticky_cache():
+    # The people cache (people/cache.py imports this module, so look it up here)
+    return caches[getattr(settings, 'PEOPLE_CACHE_ALIAS', 'people')]
+
+
+# ============================================================================
+# READ-YOUR-WRITES
+# ============================================================================
+
+def stick_to_primary(user):
+    """Send user's reads to the primary for the next PEOPLE_REPLICA_STICKY_SECONDS"""
+    if replica_configured() and user.is_authenticated and sticky_seconds() > 0:
+        sticky_cache().set(sticky_key(user), True, timeout=sticky_seconds())
+
+
+def is_sticky(user):
+    return sticky_cache().get(sticky_key(user)) is not None
+
+
+async def ais_sticky(user):
+    return await sticky_cache().aget(sticky_key(user)) is not None
+
+
+def check_sticky_cache(app_configs=None, **kwargs):
+    """System check: read-your-writes needs a cache every worker shares"""
+    if not replica_configured() or sticky_seconds() <= 0:
+        return []
+    alias = getattr(settings, 'PEOPLE_CACHE_ALIAS', 'people')
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend not in PROCESS_LOCAL_CACHES:
+        return []
+    return [checks.Error(
+        f'CACHES["{alias}"] uses {backend.rsplit(".", 1)[-1]}, which is per-process, but reads go to '
+        f'the "{REPLICA_ALIAS}" database: a writer pinned to the primary by one worker would read '
+        f'the lagging replica on the others.',
+        hint='Set PEOPLE_CACHE_BACKEND to a shared backend (FileBasedCache, Redis, Memcached), '
+             'or PEOPLE_REPLICA_STICKY_SECONDS=0 / PEOPLE_REPLICA_READS=False.',
+        id='people.E001',
+    )]
+
+
+# ============================================================================
+# PER-REQUEST ROUTING
+# ============================================================================
+
+def use_replica(user):
+    """
+    Route this context's reads to the replica, unless there is none or user
+    wrote recently. Returns a token for release_replica() (None = not routed).
+    """
+    if not replica_configured() or is_sticky(user):
+        return None
+    return replica_reads.set(True)
+
+
+async def ause_replica(user):
+    """use_replica() for async views"""
+    if not replica_configured() or await ais_sticky(user):
+        return None
+    return replica_reads.set(True)
+
+
+def release_replica(token):
+    if token is not None:
+        replica_reads.reset(token)
+
+
+class ReplicaReadsMixin:
+    """
+    APIView mixin: safe-method requests read from the replica, successful
+    writes pin the caller to the primary.
+
+    replica_actions limits replica reads to those ViewSet actions
+    (None = every GET/HEAD/OPTIONS of the view).
+    """
+    replica_actions = None
+
+    def reads_from_replica(self, request):
+        if request.method not in SAFE_METHODS:
+            return False
+        return self.replica_actions is None or getattr(self, 'action', None) in self.replica_actions
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replica(request):
+            self._replica_token = use_replica(request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        release_replica(getattr(self, '_replica_token', None))
+        self._replica_token = None
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            stick_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+# ============================================================================
+# ROUTER
+# ============================================================================
+
+class ReadReplicaRouter:
+    """Reads flagged by replica_reads go to the replica; all writes go to the primary"""
+
+    def db_for_read(self, model, **hints):
+        if replica_reads.get() and replica_configured():
+            return REPLICA_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Primary and replica hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -0,0 +1,316 @@
+"""
+Fuzzy People Search (trigram similarity)
+
+Ranks people by how closely full_name, acdc_email or personal_email resemble
+the query, using the same trigram similarity as PostgreSQL's pg_trgm:
+
+    similarity(a, b) = shared trigrams / (trigrams(a) + trigrams(b) - shared trigrams)
+
+A person's score is the best similarity across the three fields. Only scores
+at or above SIMILARITY_THRESHOLD (pg_trgm's default, 0.3) are returned.
+
+Backends:
+- PostgreSQL: pg_trgm "%" operator + GIN trigram indexes (migration 0004),
+  ranked with GREATEST(similarity(...)) in one query
+- Other databases (SQLite dev.db / tests): TrigramIndex, an in-process inverted
+  index from trigram → documents, built once per process and kept current
+  from Person signals and the people version (see people/indexing.py)
+
+Usage:
+    from .search import search_people
+
+    ranked = search_people("jon smth", limit=20)   # [(person_id, score), ...]
+"""
+
+import heapq
+import re
+from collections import Counter, defaultdict
+
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Q
+from django.db.models.functions import Greatest
+
+from .indexing import PeopleIndex
+from .models import Person
+
+# Minimum similarity for a match (pg_trgm.similarity_threshold default)
+SIMILARITY_THRESHOLD = 0.3
+
+# Fields compared with the query
+SEARCH_FIELDS = ('full_name', 'acdc_email', 'personal_email')
+
+# A trigram's posting list is kept as a bitmap (Python int, one bit per
+# document) once it covers at least 1/DENSE_POSTING_RATIO of the key space -
+# at that point the bitmap is smaller than a set and far faster to count
+DENSE_POSTING_RATIO = 128
+
+WORD_RE = re.compile(r'[^\W_]+')
+
+
+def trigrams(text):
+    """
+    Trigram set of text, the way pg_trgm builds it: lowercase, split into
+    alphanumeric words, pad each word with two spaces in front and one behind.
+    """
+    grams = set()
+    if not text:
+        return grams
+    for word in WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def to_bitmap(keys):
+    """Bitmap (int) with the given bit positions set"""
+    keys = list(keys)
+    if not keys:
+        return 0
+    data = bytearray(max(keys) // 8 + 1)
+    for key in keys:
+        data[key >> 3] |= 1 << (key & 7)
+    return int.from_bytes(data, 'little')
+
+
+NONZERO_BYTE_RE = re.compile(rb'[^\x00]')
+
+
+def iter_bits(bitmap):
+    """Yield the positions of the set bits of bitmap"""
+    data = bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')
+    for match in NONZERO_BYTE_RE.finditer(data):
+        base = match.start() * 8
+        byte = data[match.start()]
+        while byte:
+            low = byte & -byte
+            yield base + low.bit_length() - 1
+            byte ^= low
+
+
+class TrigramIndex(PeopleIndex):
+    """
+    In-process trigram index over SEARCH_FIELDS of every person.
+
+    A document is one field of one person, keyed as
+    person_id * len(SEARCH_FIELDS) + field position.
+
+    Posting lists (trigram → documents) are sets for rare trigrams and bitmaps
+    for frequent ones (e.g. "com", "acd" in every email). A query counts
+    shared trigrams per document exactly:
+    - rare trigrams with collections.Counter (cost = their posting lengths)
+    - frequent trigrams with a bit-sliced counter over the bitmaps (cost = a
+      few big-int operations per trigram, independent of how many documents match)
+
+    Documents matched by frequent trigrams only are then visited one
+    (shared count, trigram count) band at a time, best similarity first, and
+    the walk stops as soon as the top `limit` people are settled.
+
+    Kept current by PeopleIndex (signals + people version, see people/indexing.py).
+    """
+
+    FIELDS = SEARCH_FIELDS
+
+    def reset(self):
+        self.sparse = {}                     # trigram → {doc key}
+        self.dense = {}                      # trigram → bitmap of doc keys
+        self.sizes = {}                      # trigram count → bitmap of doc keys
+        self.documents = {}                  # doc key → frozenset of trigrams
+        self.person_docs = {}                # person id → [doc key, ...]
+        self.dense_min = 1
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def apply(self, people):
+        """
+        Index {person_id: (full_name, acdc_email, personal_email)} in one batch,
+        replacing whatever was indexed for those people. A value of None removes the person.
+        """
+        added = defaultdict(list)
+        removed = defaultdict(list)
+        sized = defaultdict(list)
+        unsized = defaultdict(list)
+        width = len(SEARCH_FIELDS)
+
+        for person_id, values in people.items():
+            for key in self.person_docs.pop(person_id, ()):
+                grams = self.documents.pop(key)
+                unsized[len(grams)].append(key)
+                for gram in grams:
+                    removed[gram].append(key)
+
+            if values is None:
+                continue
+
+            keys = []
+            for position, text in enumerate(values):
+                grams = trigrams(text)
+                if not grams:
+                    continue
+                key = person_id * width + position
+                self.documents[key] = frozenset(grams)
+                sized[len(grams)].append(key)
+                for gram in grams:
+                    added[gram].append(key)
+                keys.append(key)
+            self.person_docs[person_id] = keys
+
+        for gram, keys in removed.items():
+            if gram in self.dense:
+                self.dense[gram] &= ~to_bitmap(keys)
+            else:
+                posting = self.sparse[gram]
+                posting.difference_update(keys)
+                if not posting:
+                    del self.sparse[gram]
+
+        for gram, keys in added.items():
+            if gram in self.dense:
+                self.dense[gram] |= to_bitmap(keys)
+                continue
+            posting = self.sparse.setdefault(gram, set())
+            posting.update(keys)
+            if len(posting) >= self.dense_min:
+                self.dense[gram] = to_bitmap(posting)
+                del self.sparse[gram]
+
+        for size, keys in unsized.items():
+            self.sizes[size] &= ~to_bitmap(keys)
+        for size, keys in sized.items():
+            self.sizes[size] = self.sizes.get(size, 0) | to_bitmap(keys)
+
+    def prepare(self, summary):
+        key_space = ((summary['last_id'] or 0) + 1) * len(SEARCH_FIELDS)
+        self.dense_min = max(1, key_space // DENSE_POSTING_RATIO)
+
+    def __len__(self):
+        return len(self.person_docs)
+
+    # ------------------------------------------------------------------
+    # Querying
+    # ------------------------------------------------------------------
+
+    def search(self, query, limit=20, threshold=SIMILARITY_THRESHOLD):
+        """Return [(person_id, score), ...] best first"""
+        query_grams = trigrams(query)
+        if not query_grams or limit <= 0:
+            return []
+
+        query_size = len(query_grams)
+        width = len(SEARCH_FIELDS)
+        best = {}
+
+        def similarity(shared, size):
+            return shared / (query_size + size - shared)
+
+        # Bit-sliced counter: bit i of the count of document k is bit k of slices[i]
+        slices = []
+        for gram in query_grams:
+            carry = self.dense.get(gram, 0)
+            index = 0
+            while carry:
+                if index == len(slices):
+                    slices.append(carry)
+                    break
+                current = slices[index]
+                slices[index] = current ^ carry
+                carry &= current
+                index += 1
+
+        # Documents hit by a rare trigram - exact count = rare hits + frequent hits
+        sparse_counts = Counter()
+        for gram in query_grams:
+            posting = self.sparse.get(gram)
+            if posting:
+                sparse_counts.update(posting)
+
+        if sparse_counts:
+            length = (max(sparse_counts) >> 3) + 1
+            slice_bytes = [part.to_bytes(max(length, (part.bit_length() + 7) // 8), 'little') for part in slices]
+            for key, hits in sparse_counts.items():
+                shared = hits
+                for bit, data in enumerate(slice_bytes):
+                    shared += ((data[key >> 3] >> (key & 7)) & 1) << bit
+                score = similarity(shared, len(self.documents[key]))
+                if score >= threshold:
+                    person_id = key // width
+                    if score > best.get(person_id, 0.0):
+                        best[person_id] = score
+
+        # Documents hit by frequent trigrams only, one (shared, size) band at a time
+        bands = sorted(
+            (
+                (similarity(shared, size), shared, size)
+                for shared in range(1, (1 << len(slices)))
+                for size, members in self.sizes.items()
+                if members and size >= shared and similarity(shared, size) >= threshold
+            ),
+            reverse=True,
+        )
+
+        exact = {}
+        cutoff = None
+        for score, shared, size in bands:
+            if len(best) >= limit:
+                if cutoff is None:
+                    cutoff = heapq.nlargest(limit, best.values())[-1]
+                if score < cutoff:
+                    break
+
+            matches = exact.get(shared)
+            if matches is None:
+                matches = -1
+                for bit, part in enumerate(slices):
+                    matches &= part if shared >> bit & 1 else ~part
+                exact[shared] = matches
+            matches &= self.sizes[size]
+            if not matches:
+                continue
+
+            for key in iter_bits(matches):
+                if key in sparse_counts:
+                    continue
+                person_id = key // width
+                if score > best.get(person_id, 0.0):
+                    best[person_id] = score
+                    cutoff = None
+
+        return heapq.nsmallest(limit, best.items(), key=lambda item: (-item[1], item[0]))
+
+
+_index = TrigramIndex()
+
+
+def get_trigram_index():
+    """The process-wide TrigramIndex, refreshed if people changed"""
+    _index.refresh()
+    return _index
+
+
+def search_people_postgres(query, limit):
+    """pg_trgm search - "%" uses the GIN trigram indexes, similarity() ranks"""
+    score = Greatest(*[TrigramSimilarity(field, query) for field in SEARCH_FIELDS])
+    matches = Q()
+    for field in SEARCH_FIELDS:
+        matches |= Q(**{f'{field}__trigram_similar': query})
+
+    rows = Person.objects.filter(matches).annotate(score=score).filter(
+        score__gte=SIMILARITY_THRESHOLD
+    ).order_by('-score', 'id').values_list('id', 'score')[:limit]
+    return list(rows)
+
+
+def search_people(query, limit=20):
+    """
+    Rank people by trigram similarity to query.
+
+    Returns:
+        [(person_id, score), ...] best match first, at most limit entries
+    """
+    if connection.vendor == 'postgresql':
+        return search_people_postgres(query, limit)
+    index = get_trigram_index()
+    with index.lock:
+        return index.search(query, limit)
@@ -0,0 +1,368 @@
+"""
+Synthetic Roster Data (benchmarks, staging)
+
+Generates valid Person rows - they pass Person.clean() - and one user per HR
+role, deterministically: person number i is the same for a given seed no
+matter how many people are generated at once or in which batches, so runs
+are comparable.
+
+Rows are generated column-wise per block of SEED_BLOCK_ROWS person numbers
+(one Random per (seed, block)), with realistic distributions: most people
+are active volunteers in Engineering, Sales, Design or Marketing, most have
+a subteam of their department, leads commit more hours than volunteers, and
+only people who left have an end date.
+
+Person number i gets unique emails derived from i (seed_email(i)), so
+several batches can be inserted side by side as long as their index ranges
+do not overlap.
+
+seed_people() streams rows with COPY on PostgreSQL and executemany() batches
+of one INSERT elsewhere (bulk_create is available, but its per-field
+preparation makes it several times slower). Large loads drop the secondary
+indexes and build them once at the end. No writer sends post_save signals,
+so seed_people() does the signal work for the whole load: one headcount
+delta and a people version bump (caches, in-process indexes). Seeded people have no manager and no change history
+(like a raw SQL load; run snapshot_people_history to baseline as-of reads).
+"""
+
+import datetime
+import io
+import random
+from contextlib import contextmanager, nullcontext
+from itertools import accumulate, islice
+
+from django.contrib.auth.models import Group, User
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .cache import bump_people_version
+from .headcount import HeadcountDelta
+from .models import Person
+from .permissions import HR_ROLES
+
+# Person numbers per generation block (the unit of determinism)
+SEED_BLOCK_ROWS = 10_000
+
+# Rows per INSERT batch (COPY streams everything at once)
+SEED_BATCH_SIZE = 5000
+
+# Loads at least this large (that also at least double the table) drop the
+# secondary indexes and build them again afterwards - see deferred_indexes()
+SEED_DEFER_INDEXES_ROWS = 100_000
+
+# maintenance_work_mem for those index builds (PostgreSQL)
+SEED_INDEX_BUILD_MEMORY = '512MB'
+
+# Column order of generated rows
+SEED_COLUMNS = (
+    'full_name', 'acdc_email', 'personal_email', 'phone', 'department', 'subteam',
+    'position', 'status', 'timezone', 'time_commitment', 'start_date', 'end_date',
+)
+
+FIRST_NAMES = (
+    'Ada', 'Ben', 'Chloe', 'Dev', 'Elena', 'Farah', 'Gus', 'Hana', 'Ivan', 'Jia',
+    'Kofi', 'Lena', 'Mateo', 'Nia', 'Omar', 'Priya', 'Quinn', 'Rosa', 'Sam', 'Tariq',
+    'Uma', 'Victor', 'Wen', 'Ximena', 'Yusuf', 'Zoe', 'Aisha', 'Bruno', 'Carmen', 'Daniel',
+    'Emeka', 'Fatima', 'Grace', 'Hiro', 'Isla', 'Jonas', 'Kira', 'Leo', 'Maya', 'Noah',
+)
+LAST_NAMES = (
+    'Adams', 'Baker', 'Chen', 'Diaz', 'Evans', 'Fischer', 'Garcia', 'Haddad', 'Ito', 'Jones',
+    'Kim', 'Lopez', 'Mensah', 'Novak', 'Okafor', 'Patel', 'Rossi', 'Singh', 'Tanaka', 'Walsh',
+    'Nguyen', 'Silva', 'Cohen', 'Murphy', 'Ahmed', 'Kowalski', 'Martin', 'Yilmaz', 'Brown', 'Dubois',
+    'Santos', 'Kaur', 'Larsen', 'Moreau', 'Ortiz', 'Park', 'Reyes', 'Schmidt', 'Torres', 'Wright',
+)
+
+# (value, relative weight)
+DEPARTMENT_WEIGHTS = (
+    ('Engineering', 30), ('Sales', 14), ('Design', 12), ('Marketing', 12),
+    ('Product Management', 10), ('Human Resources', 8), ('Finance', 6), ('Executive', 2),
+)
+STATUS_WEIGHTS = (('active', 78), ('inactive', 17), ('on_leave', 5))
+POSITION_WEIGHTS = (('Volunteer', 86), ('Asst. Director', 9), ('Director', 5))
+TIMEZONE_WEIGHTS = (
+    ('America/New_York', 40), ('America/Chicago', 15), ('America/Denver', 8),
+    ('America/Los_Angeles', 25), ('Europe/London', 7), ('Asia/Kolkata', 5),
+)
+VOLUNTEER_HOURS_WEIGHTS = ((5, 25), (10, 35), (15, 15), (20, 15), (0, 5), (30, 5))
+LEAD_HOURS_WEIGHTS = ((20, 25), (30, 30), (40, 35), (60, 7), (80, 3))
+
+SUBTEAMS = {
+    'Engineering': ('Web', 'Mobile', 'Backend', 'Data', 'Infrastructure'),
+    'Sales': ('Partnerships', 'Outreach'),
+    'Design': ('UX', 'Visual', 'Research'),
+    'Marketing': ('Content', 'Social', 'Events'),
+    'Product Management': ('Growth', 'Platform'),
+    'Human Resources': ('Recruiting', 'People Ops'),
+    'Finance': ('Accounting', 'Grants'),
+    'Executive': (),
+}
+# Share of people (in departments with subteams) without one
+NO_SUBTEAM_SHARE = 0.15
+
+# Start dates fall in FIRST_DATE..LAST_DATE (more recent ones more likely);
+# people who left have an end date 30-1500 days later, no later than LAST_DATE
+FIRST_DATE = datetime.date(2015, 1, 1)
+LAST_DATE = datetime.date(2025, 12, 31)
+DATES = [FIRST_DATE + datetime.timedelta(days=day) for day in range((LAST_DATE - FIRST_DATE).days + 1)]
+
+# Users created by seed_role_users(): username → HR role group (None = superuser)
+ROLE_USERNAMES = {
+    'bench_readonly': 'HR_ReadOnly',
+    'bench_readwrite': 'HR_ReadWrite',
+    'bench_fullaccess': 'HR_FullAccess',
+    'bench_admin': None,
+}
+
+
+def weighted(pairs):
+    """(values, cumulative weights) for random.choices"""
+    return tuple(value for value, _ in pairs), tuple(accumulate(weight for _, weight in pairs))
+
+
+DEPARTMENTS = weighted(DEPARTMENT_WEIGHTS)
+STATUSES = weighted(STATUS_WEIGHTS)
+POSITIONS = weighted(POSITION_WEIGHTS)
+TIMEZONES = weighted(TIMEZONE_WEIGHTS)
+VOLUNTEER_HOURS = weighted(VOLUNTEER_HOURS_WEIGHTS)
+LEAD_HOURS = weighted(LEAD_HOURS_WEIGHTS)
+
+
+def batched(rows, size):
+    """Lists of up to size rows"""
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def seed_email(index):
+    """ACDC email of person number index"""
+    return f'person{index}@bench.acdc.com'
+
+
+def generate_block(seed, block):
+    """SEED_COLUMNS tuples of person numbers block * SEED_BLOCK_ROWS .. + SEED_BLOCK_ROWS - 1"""
+    randomizer = random.Random(f'{seed}:{block}')
+    size = SEED_BLOCK_ROWS
+
+    def choices(values_and_weights):
+        values, cum_weights = values_and_weights
+        return randomizer.choices(values, cum_weights=cum_weights, k=size)
+
+    departments, statuses, positions, timezones = (
+        choices(DEPARTMENTS), choices(STATUSES), choices(POSITIONS), choices(TIMEZONES)
+    )
+    volunteer_hours, lead_hours = choices(VOLUNTEER_HOURS), choices(LEAD_HOURS)
+    first_names = randomizer.choices(FIRST_NAMES, k=size)
+    last_names = randomizer.choices(LAST_NAMES, k=size)
+    draw = randomizer.random
+    last_day = len(DATES) - 1
+
+    rows = []
+    first_index = block * size
+    for offset in range(size):
+        index = first_index + offset
+        department, position, status = departments[offset], positions[offset], statuses[offset]
+
+        subteams = SUBTEAMS[department]
+        pick = draw()
+        subteam = None
+        if subteams and pick >= NO_SUBTEAM_SHARE:
+            subteam = subteams[int((pick - NO_SUBTEAM_SHARE) / (1 - NO_SUBTEAM_SHARE) * len(subteams))]
+
+        start_day = int(max(draw(), draw()) * last_day)
+        end_date = None
+        if status == 'inactive':
+            end_date = DATES[min(start_day + 30 + int(draw() * 1470), last_day)]
+
+        rows.append((
+            f'{first_names[offset]} {last_names[offset]}',
+            seed_email(index),
+            f'person{index}@example.com',
+            f'+1-555-{index % 10_000_000:07d}',
+            department,
+            subteam,
+            position,
+            status,
+            timezones[offset],
+            volunteer_hours[offset] if position == 'Volunteer' else lead_hours[offset],
+            DATES[start_day],
+            end_date,
+        ))
+    return rows
+
+
+def generate_rows(count, seed=0, first_index=0):
+    """SEED_COLUMNS tuples of person numbers first_index .. first_index + count - 1, block by block"""
+    stop = first_index + count
+    for block in range(first_index // SEED_BLOCK_ROWS, (stop - 1) // SEED_BLOCK_ROWS + 1 if count else 0):
+        block_start = block * SEED_BLOCK_ROWS
+        yield from generate_block(seed, block)[max(first_index - block_start, 0):stop - block_start]
+
+
+def build_people(count, seed=0, first_index=0):
+    """People number first_index .. first_index + count - 1 (unsaved)"""
+    return [Person(**dict(zip(SEED_COLUMNS, row))) for row in generate_rows(count, seed, first_index)]
+
+
+def table_columns():
+    """Quoted people table and column names of generated rows plus the audit timestamps"""
+    quote = connection.ops.quote_name
+    columns = [Person._meta.get_field(name).column for name in SEED_COLUMNS] + ['created_at', 'updated_at']
+    return quote(Person._meta.db_table), ', '.join(map(quote, columns))
+
+
+def copy_rows(rows, batch_size=SEED_BATCH_SIZE):
+    """Stream rows into the people table with COPY (PostgreSQL, psycopg 3 or psycopg2)"""
+    now = timezone.now()
+    table, columns = table_columns()
+    sql = f'COPY {table} ({columns}) FROM STDIN'
+
+    with connection.cursor() as cursor:
+        raw = cursor.cursor
+        if callable(getattr(raw, 'copy', None)):
+            # psycopg 3
+            with raw.copy(sql) as copy:
+                for row in rows:
+                    copy.write_row(row + (now, now))
+            return
+
+        # psycopg2: text format, one buffer per batch_size rows
+        def text(value):
+            if value is None:
+                return '\\N'
+            return str(value).replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+        stamps = f'\t{now.isoformat()}\t{now.isoformat()}\n'
+        for batch in batched(rows, batch_size):
+            raw.copy_expert(sql, io.StringIO(''.join('\t'.join(map(text, row)) + stamps for row in batch)))
+
+
+def insert_rows(rows, batch_size=SEED_BATCH_SIZE):
+    """
+    executemany() of one INSERT, batch_size rows at a time. Values are
+    adapted once per date column instead of going through the ORM's
+    per-field preparation (several times faster than bulk_create).
+    """
+    ops = connection.ops
+    now = ops.adapt_datetimefield_value(timezone.now())
+    table, columns = table_columns()
+    sql = f'INSERT INTO {table} ({columns}) VALUES ({", ".join(["%s"] * (len(SEED_COLUMNS) + 2))})'
+    start_date, end_date = SEED_COLUMNS.index('start_date'), SEED_COLUMNS.index('end_date')
+
+    def adapted(row):
+        row = list(row)
+        row[start_date] = ops.adapt_datefield_value(row[start_date])
+        row[end_date] = ops.adapt_datefield_value(row[end_date])
+        return (*row, now, now)
+
+    with connection.cursor() as cursor:
+        for batch in batched(rows, batch_size):
+            cursor.executemany(sql, [adapted(row) for row in batch])
+
+
+def bulk_create_rows(rows, batch_size=SEED_BATCH_SIZE):
+    """bulk_create rows, batch_size people per batch (portable, slowest)"""
+    for batch in batched(rows, batch_size):
+        Person.objects.bulk_create([Person(**dict(zip(SEED_COLUMNS, row))) for row in batch])
+
+
+def secondary_indexes():
+    """
+    [(name, CREATE statement)] of the people indexes that no constraint
+    needs (primary key and unique emails stay), PostgreSQL and SQLite
+    """
+    table = Person._meta.db_table
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute("""
+                SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) FROM pg_index
+                WHERE indrelid = %s::regclass AND NOT indisprimary
+                  AND indexrelid NOT IN (SELECT conindid FROM pg_constraint)
+            """, [table])
+        elif connection.vendor == 'sqlite':
+            # Indexes behind UNIQUE have no sql
+            cursor.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = %s AND sql IS NOT NULL",
+                [table]
+            )
+        else:
+            return []
+        return cursor.fetchall()
+
+
+@contextmanager
+def deferred_indexes():
+    """
+    Drop the secondary indexes for the duration of a load and build them
+    again afterwards - one sorted build per index instead of an update per
+    row (the trigram GIN indexes above all). Must run inside the load's
+    transaction; the people table stays locked until it commits.
+    """
+    indexes = secondary_indexes()
+    with connection.cursor() as cursor:
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+        if connection.vendor == 'postgresql':
+            cursor.execute(f"SET LOCAL maintenance_work_mem = '{SEED_INDEX_BUILD_MEMORY}'")
+
+    yield
+
+    # Fire the deferred manager FK checks queued per row - PostgreSQL
+    # refuses CREATE INDEX on a table with pending trigger events
+    connection.check_constraints(table_names=[Person._meta.db_table])
+    with connection.cursor() as cursor:
+        for _, definition in indexes:
+            cursor.execute(definition)
+
+
+def seed_people(count, seed=0, first_index=0, batch_size=SEED_BATCH_SIZE, method=None, defer_indexes=None):
+    """
+    Insert people number first_index .. first_index + count - 1 in one
+    transaction; returns how many were inserted.
+
+    method: 'copy' (PostgreSQL only), 'insert' or 'bulk_create'; default
+    COPY on PostgreSQL and insert elsewhere.
+    defer_indexes: rebuild the secondary indexes after the load instead of
+    updating them per row; default for loads of at least
+    SEED_DEFER_INDEXES_ROWS people that at least double the table.
+    """
+    method = method or ('copy' if connection.vendor == 'postgresql' else 'insert')
+    writers = {'copy': copy_rows, 'insert': insert_rows, 'bulk_create': bulk_create_rows}
+    headcount = HeadcountDelta()
+    department, subteam, position, status, hours = (
+        SEED_COLUMNS.index(name) for name in ('department', 'subteam', 'position', 'status', 'time_commitment')
+    )
+
+    def counted(rows):
+        for row in rows:
+            headcount.add((row[department], row[subteam], row[status], row[position], row[hours]))
+            yield row
+
+    rows = counted(generate_rows(count, seed, first_index))
+    with transaction.atomic():
+        if defer_indexes is None:
+            defer_indexes = count >= SEED_DEFER_INDEXES_ROWS and count >= Person.objects.count()
+        with deferred_indexes() if defer_indexes else nullcontext():
+            writers[method](rows, batch_size)
+        # None of the writers sends post_save signals
+        headcount.apply()
+        bump_people_version()
+    return count
+
+
+def seed_role_users(password):
+    """
+    One user per HR role plus a superuser (ROLE_USERNAMES), created or reset
+    to password. Returns {username: User}.
+    """
+    groups = {name: Group.objects.get_or_create(name=name)[0] for name in HR_ROLES}
+    users = {}
+    for username, role in ROLE_USERNAMES.items():
+        user = User.objects.filter(username=username).first() or User(username=username)
+        user.email = f'{username}@acdcco.org'
+        user.is_superuser = user.is_staff = role is None
+        user.set_password(password)
+        user.save()
+        user.groups.set([groups[role]] if role else [])
+        users[username] = user
+    return users
@@ -1,13 +1,135 @@
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from django.contrib.auth.models import User, Group
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
 from .models import Person
+from .hierarchy import creates_cycle
+from .authentication import add_role_claims
+from .permissions import get_user_role, role_from_group_names
 
 class PersonSerializer(serializers.ModelSerializer):
     class Meta:
         model = Person
         fields = '__all__'
+    
+    def validate_manager(self, value):
+        """Reject reporting lines that would loop back to this person"""
+        if value is not None and self.instance is not None and creates_cycle(self.instance.pk, value.pk):
+            raise serializers.ValidationError("A person cannot report to themselves or to one of their reports.")
+        return value
+
+
+class PersonFastSerializer:
+    """
+    Read-only fast path for Person lists (list, filter_employees, export)
+    
+    Builds output dicts straight from QuerySet.values() rows with one
+    converter per column, chosen once per request from PersonSerializer's
+    fields. Skips DRF's per-row field machinery but produces exactly the
+    same JSON as PersonSerializer.
+    
+    Usage:
+        serializer = PersonFastSerializer()
+        rows = queryset.values(*serializer.columns)
+        data = PersonFastSerializer(rows, many=True).data
+    """
+    
+    def __init__(self, instance=None, many=False):
+        self.instance = instance
+        self.many = many
+        fields = {
+            name: field for name, field in PersonSerializer().fields.items()
+            if not field.write_only
+        }
+        self.columns = list(fields.keys())
+        self.converters = [
+            (name, self.build_converter(field)) for name, field in fields.items()
+        ]
+    
+    @staticmethod
+    def build_converter(field):
+        """
+        Return a plain function equivalent to field.to_representation for non-null values
+        """
+        if isinstance(field, serializers.DateTimeField):
+            output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+            field_timezone = field.timezone if hasattr(field, 'timezone') else field.default_timezone()
+            if output_format is None or output_format.lower() != 'iso-8601' or field_timezone is None:
+                return field.to_representation
+            
+            def convert_datetime(value):
+                if isinstance(value, str) or value.tzinfo is None:
+                    return field.to_representation(value)
+                text = value.astimezone(field_timezone).isoformat()
+                if text.endswith('+00:00'):
+                    text = text[:-6] + 'Z'
+                return text
+            return convert_datetime
+        
+        if isinstance(field, serializers.DateField):
+            output_format = getattr(field, 'format', api_settings.DATE_FORMAT)
+            if output_format is None or output_format.lower() != 'iso-8601':
+                return field.to_representation
+            
+            def convert_date(value):
+                return value if isinstance(value, str) else value.isoformat()
+            return convert_date
+        
+        if isinstance(field, serializers.ChoiceField):
+            lookup = field.choice_strings_to_values
+            
+            def convert_choice(value):
+                if value == '':
+                    return value
+                return lookup.get(str(value), value)
+            return convert_choice
+        
+        if isinstance(field, serializers.PrimaryKeyRelatedField) and field.pk_field is None:
+            # values() already holds the related id
+            return lambda value: value
+        
+        if isinstance(field, serializers.IntegerField):
+            return int
+        
+        if isinstance(field, serializers.CharField):
+            return str
+        
+        return field.to_representation
+    
+    def to_representation(self, row):
+        """Convert one values() dict into the PersonSerializer output dict"""
+        result = {}
+        for name, convert in self.converters:
+            value = row[name]
+            result[name] = None if value is None else convert(value)
+        return result
+    
+    @property
+    def data(self):
+        if self.many:
+            return [self.to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
+
+
+class PersonBulkSerializer(PersonSerializer):
+    """
+    Row validator for bulk writes (see people/bulk.py)
+    
+    Same fields as PersonSerializer, but without the per-row UniqueValidator
+    queries on acdc_email/personal_email. Uniqueness is checked for the whole
+    batch in a single query, and acdc_email conflicts become updates (upsert).
+    manager is ignored - reporting lines are set per person (see people/hierarchy.py).
+    """
+    class Meta(PersonSerializer.Meta):
+        extra_kwargs = {
+            'acdc_email': {'validators': []},
+            'personal_email': {'validators': []},
+            'manager': {'read_only': True},
+        }
 
 # ============================================================================
 # USER AUTHENTICATION SERIALIZERS WITH RBAC
@@ -190,25 +312,18 @@ class UserSerializer(serializers.ModelSerializer):
         - "No Role Assigned" if user has no groups
         - "Superuser" if user is a superuser
         - First group name if user has multiple groups
+        
+        Reads obj.groups.all() once: free when the queryset used
+        prefetch_related (see UserListView), one query otherwise.
         """
         # Check if superuser
         if obj.is_superuser:
             return "Superuser"
         
-        # Get user's groups
-        user_groups = obj.groups.all()
-        
-        if not user_groups.exists():
-            return "No Role Assigned"
+        # Sort by id so the "first group" fallback is stable with or without prefetch
+        group_names = [group.name for group in sorted(obj.groups.all(), key=lambda group: group.id)]
         
-        # Get first HR role (users should only have one HR role)
-        hr_roles = ['HR_ReadOnly', 'HR_ReadWrite', 'HR_FullAccess']
-        for group in user_groups:
-            if group.name in hr_roles:
-                return group.name
-        
-        # If no HR role found, return first group name
-        return user_groups.first().name
+        return role_from_group_names(group_names, no_role="No Role Assigned")
 
 
 class ChangePasswordSerializer(serializers.Serializer):
@@ -229,4 +344,72 @@ class ChangePasswordSerializer(serializers.Serializer):
             raise serializers.ValidationError({
                 "new_password2": "New password fields didn't match."
             })
-        return attrs
\ No newline at end of file
+        return attrs
+
+
+# ============================================================================
+# JWT SERIALIZERS WITH ROLE CLAIMS
+# ============================================================================
+
+class HRTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """
+    Login serializer (POST /api/token/) that stamps the user's HR role into the tokens
+    
+    The access token copies these claims from the refresh token, so
+    HRClaimsAuthentication can authorize requests without a database query.
+    
+    Enabled via SIMPLE_JWT['TOKEN_OBTAIN_SERIALIZER'] in settings.py
+    """
+    
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        return add_role_claims(token, user, get_user_role(user))
+
+
+class HRTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Refresh serializer (POST /api/token/refresh/) that re-resolves the HR role
+    
+    Role changes made by a superuser take effect the next time the client
+    refreshes its access token.
+    
+    Enabled via SIMPLE_JWT['TOKEN_REFRESH_SERIALIZER'] in settings.py
+    """
+    
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        
+        # Load the user once to check they are still active and get their current role
+        user_id = refresh.payload.get(jwt_settings.USER_ID_CLAIM, None)
+        try:
+            user = User.objects.get(**{jwt_settings.USER_ID_FIELD: user_id})
+        except User.DoesNotExist:
+            user = None
+        
+        if user is None or not jwt_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(
+                self.error_messages["no_active_account"],
+                "no_active_account",
+            )
+        
+        add_role_claims(refresh, user, get_user_role(user))
+        data = {"access": str(refresh.access_token)}
+        
+        if jwt_settings.ROTATE_REFRESH_TOKENS:
+            if jwt_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    # Blacklist the refresh token that was just used
+                    refresh.blacklist()
+                except AttributeError:
+                    # Blacklist app not installed
+                    pass
+            
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            
+            data["refresh"] = str(refresh)
+        
+        return data
@@ -0,0 +1,136 @@
+"""
+Signal Receivers for Person
+
+Connected in PeopleConfig.ready() (people/apps.py).
+
+- post_save / post_delete → bump the people version so cached responses are
+  never served after a write (see people/cache.py)
+- post_save / post_delete → after commit, apply the person to the in-process
+  search and autocomplete indexes (see people/indexing.py)
+- pre_save / post_save / post_delete → move the person between headcount
+  summary groups (see people/headcount.py)
+- post_save / pre_delete → keep the reporting hierarchy closure table in step
+  with Person.manager (see people/hierarchy.py)
+- pre_delete → clear manager on the deleted person's reports as a recorded
+  bulk write, before the delete collector's silent SET_NULL
+- pre_save / post_save / post_delete → append a field-level diff to the
+  change history (see people/history.py)
+
+pre_save reads and locks the stored row once; the headcount, hierarchy and
+history receivers all diff against it.
+
+Bulk paths (bulk_create, QuerySet.update) do not send these signals;
+people/bulk.py bumps the version, adjusts the headcount summary and records
+history itself.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .bulk import record_bulk_write, rows_by_id
+from .cache import bump_people_version
+from .headcount import HEADCOUNT_FIELDS, HeadcountDelta, person_values
+from .hierarchy import detach_subtree, move_subtree
+from .history import build_change, history_columns, instance_row, record_changes
+from .indexing import update_people_indexes
+from .models import Person
+
+
+@receiver(post_save, sender=Person, dispatch_uid='people_version_on_save')
+def person_saved(sender, instance, using, **kwargs):
+    bump_people_version(using)
+
+
+@receiver(post_delete, sender=Person, dispatch_uid='people_version_on_delete')
+def person_deleted(sender, instance, using, **kwargs):
+    bump_people_version(using)
+
+
+@receiver(post_save, sender=Person, dispatch_uid='people_indexes_on_save')
+def person_saved_index(sender, instance, using, **kwargs):
+    transaction.on_commit(update_people_indexes(instance.pk, instance), using=using)
+
+
+@receiver(post_delete, sender=Person, dispatch_uid='people_indexes_on_delete')
+def person_deleted_index(sender, instance, using, **kwargs):
+    transaction.on_commit(update_people_indexes(instance.pk), using=using)
+
+
+@receiver(pre_save, sender=Person, dispatch_uid='people_stored_values_before_save')
+def person_before_save(sender, instance, raw, using, **kwargs):
+    # Values as stored, not as loaded - the instance may be stale. The row is
+    # locked (Person.save is atomic) so a concurrent save cannot change it
+    # between this read and our UPDATE, which would skew the headcount deltas
+    instance._stored_row = None
+    if not raw and not instance._state.adding and instance.pk is not None:
+        instance._stored_row = Person.objects.using(using).select_for_update().filter(
+            pk=instance.pk
+        ).values(*history_columns()).first()
+
+
+@receiver(post_save, sender=Person, dispatch_uid='people_history_on_save')
+def person_history_saved(sender, instance, raw, using, **kwargs):
+    if raw:
+        return
+    before = getattr(instance, '_stored_row', None)
+    action = 'update' if before is not None else 'create'
+    record_changes([build_change(instance.pk, action, before, instance_row(instance))])
+
+
+@receiver(post_delete, sender=Person, dispatch_uid='people_history_on_delete')
+def person_history_deleted(sender, instance, using, **kwargs):
+    record_changes([build_change(instance.pk, 'delete', instance_row(instance), None)])
+
+
+@receiver(post_save, sender=Person, dispatch_uid='people_headcount_on_save')
+def person_headcount_saved(sender, instance, raw, using, **kwargs):
+    if raw:
+        return
+    stored = getattr(instance, '_stored_row', None)
+    before = tuple(stored[field] for field in HEADCOUNT_FIELDS) if stored else None
+    after = person_values(instance)
+    if before == after:
+        return
+
+    delta = HeadcountDelta()
+    if before is not None:
+        delta.add(before, -1)
+    delta.add(after)
+    delta.apply()
+
+
+@receiver(post_delete, sender=Person, dispatch_uid='people_headcount_on_delete')
+def person_headcount_deleted(sender, instance, using, **kwargs):
+    delta = HeadcountDelta()
+    delta.add(person_values(instance), -1)
+    delta.apply()
+
+
+@receiver(post_save, sender=Person, dispatch_uid='people_hierarchy_on_save')
+def person_hierarchy_saved(sender, instance, created, raw, using, **kwargs):
+    if raw:
+        return
+    stored = getattr(instance, '_stored_row', None)
+    manager_before = stored['manager'] if stored else None
+    if manager_before != instance.manager_id:
+        move_subtree(instance.pk, instance.manager_id, using)
+
+
+@receiver(pre_delete, sender=Person, dispatch_uid='people_hierarchy_before_delete')
+def person_hierarchy_deleting(sender, instance, using, **kwargs):
+    # Reports become top-level (manager is SET_NULL) - cut their links to managers above
+    detach_subtree(instance.pk)
+
+
+@receiver(pre_delete, sender=Person, dispatch_uid='people_reports_before_delete')
+def person_reports_detaching(sender, instance, using, **kwargs):
+    # on_delete=SET_NULL is a raw UPDATE: no updated_at, history or change event,
+    # so sync clients, ETags and as-of reads would keep the old manager
+    reports = Person.objects.using(using).filter(manager_id=instance.pk)
+    before = rows_by_id(reports, lock=True)
+    if not before:
+        return
+    reports.update(manager=None, updated_at=timezone.now())
+    record_bulk_write(before, rows_by_id(Person.objects.using(using).filter(pk__in=list(before))))
@@ -0,0 +1,104 @@
+"""
+Server-Sent Events Stream of Person Changes
+
+    GET /api/employees/stream/
+    GET /api/employees/stream/?department=Engineering&status=active
+
+An async Django view (served without a thread per connection under ASGI, e.g.
+`uvicorn company_portal.asgi:application`) that keeps the response open and
+writes one SSE message per change published by people/events.py:
+
+    id: 981
+    event: person.updated
+    data: {"id": 981, "action": "update", "person_id": 42, "changes": {...}, "person": {...}}
+
+    : keep-alive                   ← comment sent after HEARTBEAT_SECONDS of silence
+
+    event: resync                  ← events were missed; catch up with
+    data: {}                         GET /api/employees/changes/ and reconnect
+
+Authentication and authorization match the read endpoints of PersonViewSet:
+a JWT (Authorization: Bearer ...) or a session, and any HR role
+(IsReadOnlyOrAbove), checked asynchronously (people/async_views.py).
+Under WSGI the stream works but ties up a worker thread per client - deploy
+it behind ASGI.
+"""
+
+import json
+
+from django.http import StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .async_views import authorize_reader
+from .events import ACTION_EVENTS, RESYNC, broker
+
+# Seconds of silence before a keep-alive comment (also how soon a dropped client is noticed)
+HEARTBEAT_SECONDS = 15
+
+# Reconnect delay suggested to EventSource clients, in milliseconds
+RETRY_MILLISECONDS = 3000
+
+# Query params usable as filters
+STREAM_FILTERS = ('department', 'status')
+
+
+def format_event(event):
+    """One SSE message (bytes) for an event dict"""
+    if event is RESYNC:
+        return b'event: resync\ndata: {}\n\n'
+    data = json.dumps(event, separators=(',', ':'))
+    return f'id: {event["id"]}\nevent: {ACTION_EVENTS[event["action"]]}\ndata: {data}\n\n'.encode('utf-8')
+
+
+async def event_stream(subscription):
+    """Yield SSE messages until the client disconnects (the task is cancelled) or must resync"""
+    try:
+        yield f'retry: {RETRY_MILLISECONDS}\n: connected\n\n'.encode('utf-8')
+        while True:
+            event = await subscription.get(timeout=HEARTBEAT_SECONDS)
+            if event is None:
+                yield b': keep-alive\n\n'
+                continue
+            yield format_event(event)
+            if event is RESYNC:
+                return
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@require_GET
+async def person_event_stream(request):
+    """
+    Stream Person create/update/delete events as Server-Sent Events
+
+    SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+    Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+
+    Examples:
+    GET /api/employees/stream/
+    GET /api/employees/stream/?department=Engineering
+    GET /api/employees/stream/?department=Design&status=active
+
+    An update is sent to a filtered stream when the old OR the new value
+    matches, so subscribers also learn about people leaving their filter.
+
+    Headers:
+        Authorization: Bearer <access_token>
+        Accept: text/event-stream
+
+    Response codes:
+        200 - Stream opened (text/event-stream)
+        401 - Not authenticated
+        403 - Insufficient permissions (not in any HR role)
+    """
+    _, error = await authorize_reader(request)
+    if error is not None:
+        return error
+
+    filters = {field: request.GET[field] for field in STREAM_FILTERS if request.GET.get(field)}
+    subscription = broker.subscribe(filters)
+
+    response = StreamingHttpResponse(event_stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'       # nginx: do not buffer the stream
+    return response
@@ -0,0 +1,150 @@
+"""
+Delta Sync for Roster Clients
+
+Lets a client keep a local copy of the roster current without re-downloading it:
+
+    GET /api/employees/changes/                 → everyone + a sync token
+    GET /api/employees/changes/?since=<token>   → only what changed since the token
+
+Two keyset streams, each walked with one index range scan:
+- Changed people:  people WHERE (updated_at, id) > token position
+                   (the people.updated_at index, migration 0003)
+- Deleted people:  people_history WHERE action = 'delete' AND (changed_at, id) > token position
+                   (the deletion log - a partial index over delete rows of the
+                   append-only history, see people/history.py)
+
+A client that is already in sync costs one empty probe per stream; the work is
+proportional to the number of changes, never to the roster.
+
+Rows newer than the settle window are held back until the next poll. A write
+stamps updated_at when it runs but only becomes visible when its transaction
+commits, so without the window a slow transaction could commit a row just
+behind a position already handed out and the client would never see it.
+
+Tokens are opaque base64 JSON - clients store the "next" value and send it back.
+
+Settings:
+    PEOPLE_SYNC_SETTLE_SECONDS = 5   # hold back rows updated in the last N seconds
+"""
+
+import base64
+import binascii
+import datetime
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Person, PersonChange
+from .serializers import PersonFastSerializer
+
+
+class InvalidSyncToken(ValueError):
+    """The since token could not be decoded"""
+
+
+def settle_cutoff():
+    """Newest updated_at / changed_at handed out now"""
+    seconds = getattr(settings, 'PEOPLE_SYNC_SETTLE_SECONDS', 5)
+    return timezone.now() - datetime.timedelta(seconds=seconds)
+
+
+# ============================================================================
+# TOKENS
+# ============================================================================
+
+def encode_token(changed, deleted):
+    """Token from the (timestamp, id) positions of both streams (id None = whole timestamp seen)"""
+    payload = {
+        stream: [moment.isoformat(), pk] if moment is not None else None
+        for stream, (moment, pk) in (('c', changed), ('d', deleted))
+    }
+    return base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    ).decode('ascii')
+
+
+def decode_token(token):
+    """((timestamp, id), (timestamp, id)) positions from a token. Raises InvalidSyncToken."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+        positions = []
+        for stream in ('c', 'd'):
+            position = payload[stream]
+            if position is None:
+                positions.append((None, None))
+                continue
+            moment = parse_datetime(position[0])
+            if moment is None or timezone.is_naive(moment):
+                raise ValueError('Invalid position timestamp')
+            pk = position[1]
+            if pk is not None and not isinstance(pk, int):
+                raise ValueError('Invalid position id')
+            positions.append((moment, pk))
+        return tuple(positions)
+    except (TypeError, ValueError, KeyError, IndexError, UnicodeError, binascii.Error):
+        raise InvalidSyncToken('Invalid sync token')
+
+
+def after_position(time_field, position):
+    """Q for rows past a (timestamp, id) keyset position"""
+    moment, pk = position
+    if moment is None:
+        return Q()
+    if pk is None:
+        return Q(**{f'{time_field}__gt': moment})
+    return Q(**{f'{time_field}__gt': moment}) | Q(**{time_field: moment, 'id__gt': pk})
+
+
+# ============================================================================
+# SYNC
+# ============================================================================
+
+def people_changes(token=None, limit=500):
+    """
+    Changes after token (None = initial sync of everyone).
+
+    Returns:
+        {
+            "changed": [serialized person, ...],   # created or updated, oldest first
+            "deleted": [person_id, ...],           # tombstones
+            "has_more": bool,                      # call again with "next" right away
+            "next": token
+        }
+    Raises InvalidSyncToken for a malformed token.
+    """
+    cutoff = settle_cutoff()
+    if token is None:
+        # Nothing deleted before the first sync can be in the client's copy
+        changed_position, deleted_position = (None, None), (cutoff, None)
+    else:
+        changed_position, deleted_position = decode_token(token)
+
+    serializer = PersonFastSerializer()
+    rows = list(
+        Person.objects.filter(after_position('updated_at', changed_position), updated_at__lte=cutoff)
+        .order_by('updated_at', 'id').values(*serializer.columns)[:limit + 1]
+    )
+    deletions = list(
+        PersonChange.objects.filter(
+            after_position('changed_at', deleted_position), action='delete', changed_at__lte=cutoff
+        ).order_by('changed_at', 'id').values_list('changed_at', 'id', 'person_id')[:limit + 1]
+    )
+
+    has_more = len(rows) > limit or len(deletions) > limit
+    rows, deletions = rows[:limit], deletions[:limit]
+
+    if rows:
+        changed_position = (rows[-1]['updated_at'], rows[-1]['id'])
+    if deletions:
+        deleted_position = deletions[-1][:2]
+
+    serializer.instance, serializer.many = rows, True
+    return {
+        "changed": serializer.data,
+        "deleted": [person_id for _, _, person_id in deletions],
+        "has_more": has_more,
+        "next": encode_token(changed_position, deleted_position),
+    }
@@ -1,3 +1,1950 @@
-from django.test import TestCase
+import asyncio
+import base64
+import csv
+import datetime
+import io
+import json
+import os
+import tempfile
+from collections import Counter
+from importlib.util import find_spec
+from io import StringIO
+from unittest import skipUnless
+from urllib.parse import parse_qs, urlparse
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth.models import Group, User
+from django.core.asgi import get_asgi_application
+from django.core.cache import caches
+from django.core.management import call_command
+from django.core.management.base import CommandError, SystemCheckError
+from django.db import connection
+from django.test import AsyncClient, AsyncRequestFactory, Client, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from .archive import archive_people
+from .async_views import alist, async_read_urlpatterns, async_read_view
+from .authentication import HRClaimsAuthentication, HRTokenUser, add_role_claims
+from .autocomplete import PrefixIndex, autocomplete_people, get_prefix_index
+from .bulk import BULK_MAX_ROWS
+from .events import broker
+from .exports import stream_csv
+from .headcount import compare_headcount_summary
+from .history import history_actor, take_snapshot
+from .imports import import_people
+from .indexing import PEOPLE_INDEXES
+from .metrics import registry
+from .models import ArchivedPerson, HeadcountSummary, Person, PersonChange, PersonHierarchy
+from .pagination import PersonCursorPagination
+from .permissions import get_user_role
+from .routers import check_sticky_cache, release_replica, replica_reads, sticky_key
+from .search import trigrams
+from .seeding import (
+    SEED_BLOCK_ROWS,
+    SEED_COLUMNS,
+    SUBTEAMS,
+    build_people,
+    generate_rows,
+    secondary_indexes,
+    seed_people,
+    seed_role_users,
+)
+from .serializers import PersonFastSerializer, PersonSerializer
+from .urls import router
+
+
+class PeopleAPITestCase(TestCase):
+    """
+    Base for the API tests: an empty people cache and self.client
+    authenticated as a superuser (self.admin).
+    """
+
+    def setUp(self):
+        caches['people'].clear()
+        self.admin = User.objects.create_superuser('admin', 'admin@acdcco.org', 'AdminPass123!')
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+
+class UserRoleQueryCountTests(TestCase):
+    """
+    Regression tests: user roles must not be looked up once per user (N+1).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@acdcco.org', 'AdminPass123!')
+        groups = [Group.objects.create(name=name) for name in ('HR_ReadOnly', 'HR_ReadWrite', 'HR_FullAccess')]
+        other = Group.objects.create(name='Volunteers')
+
+        for i in range(30):
+            user = User.objects.create_user(f'user{i}', f'user{i}@acdcco.org')
+            user.groups.add(other, groups[i % 3])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_user_list_role_lookup_is_constant(self):
+        # One query for the page of users + one prefetch for all their groups
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/users/?page_size=100')
+
+        self.assertEqual(response.status_code, 200)
+        roles = {user['username']: user['role'] for user in response.data['results']}
+        self.assertEqual(roles['admin'], 'Superuser')
+        self.assertEqual(roles['user0'], 'HR_ReadOnly')
+        self.assertEqual(roles['user1'], 'HR_ReadWrite')
+        self.assertEqual(roles['user2'], 'HR_FullAccess')
+
+    def test_user_list_is_paginated(self):
+        response = self.client.get('/api/users/?page_size=10')
+
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertIsNotNone(response.data['next'])
+
+    def test_current_user_role_is_one_query(self):
+        user = User.objects.get(username='user4')
+        self.client.force_authenticate(user)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/me/')
+
+        self.assertEqual(response.data['role'], 'HR_ReadWrite')
+
+
+class RoleClaimAuthenticationTests(TestCase):
+    """
+    JWTs carry the HR role: employee requests are authorized from the token
+    alone, and /api/token/refresh/ picks up role changes.
+    """
+
+    def setUp(self):
+        self.users = seed_role_users('BenchPass123!')
+        self.client = APIClient()
+
+    def obtain(self, username):
+        response = self.client.post('/api/token/', {'username': username, 'password': 'BenchPass123!'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def claims(self, token):
+        return AccessToken(token).payload
+
+    def get_employees(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/employees/')
+        self.client.credentials()
+        return response, [query['sql'] for query in queries.captured_queries if 'auth_' in query['sql']]
+
+    def test_login_stamps_role_claims(self):
+        claims = self.claims(self.obtain('bench_readwrite')['access'])
+        self.assertEqual(claims['role'], 'HR_ReadWrite')
+        self.assertEqual(claims['username'], 'bench_readwrite')
+        self.assertIs(claims['is_superuser'], False)
+        self.assertIs(claims['is_staff'], False)
+
+        claims = self.claims(self.obtain('bench_admin')['access'])
+        self.assertEqual(claims['role'], 'Superuser')
+        self.assertIs(claims['is_superuser'], True)
+        self.assertIs(claims['is_staff'], True)
+
+    def test_refresh_resolves_the_current_role(self):
+        tokens = self.obtain('bench_readonly')
+        user = self.users['bench_readonly']
+        user.groups.set([Group.objects.get(name='HR_FullAccess')])
+
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.claims(response.json()['access'])['role'], 'HR_FullAccess')
+
+        # Role removed: the next refresh drops it and the API refuses the new token
+        user.groups.clear()
+        response = self.client.post('/api/token/refresh/', {'refresh': response.json()['refresh']}, format='json')
+        access = response.json()['access']
+        self.assertEqual(self.claims(access)['role'], 'No Role')
+        self.assertEqual(self.get_employees(access)[0].status_code, 403)
+
+    def test_refresh_rejects_deactivated_user(self):
+        tokens = self.obtain('bench_readonly')
+        User.objects.filter(username='bench_readonly').update(is_active=False)
+
+        response = self.client.post('/api/token/refresh/', {'refresh': tokens['refresh']}, format='json')
+        self.assertEqual(response.status_code, 401)
+
+    def test_permissions_use_claims_without_user_queries(self):
+        readonly = self.obtain('bench_readonly')['access']
+        response, auth_queries = self.get_employees(readonly)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(auth_queries, [])
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {readonly}')
+        response = self.client.post('/api/employees/', {}, format='json')
+        self.client.credentials()
+        self.assertEqual(response.status_code, 403)
+
+    def test_token_without_role_claim_loads_the_user(self):
+        access = RefreshToken.for_user(self.users['bench_readonly']).access_token
+        self.assertNotIn('role', access.payload)
+
+        response, auth_queries = self.get_employees(str(access))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(any('auth_user_groups' in sql for sql in auth_queries))
+        self.assertTrue(any('"auth_user"' in sql for sql in auth_queries))
+
+    @override_settings(HR_STATELESS_AUTH=False)
+    def test_stateless_auth_can_be_disabled(self):
+        access = self.obtain('bench_readonly')['access']
+        User.objects.filter(username='bench_readonly').update(is_active=False)
+
+        response, auth_queries = self.get_employees(access)
+        self.assertEqual(response.status_code, 401)
+        self.assertTrue(auth_queries)
+
+    def test_superuser_and_staff_come_from_the_token(self):
+        access = self.obtain('bench_admin')['access']
+        # Demoted after login: the token keeps its claims until it expires
+        User.objects.filter(username='bench_admin').update(is_superuser=False, is_staff=False)
+        request = APIRequestFactory().get('/api/employees/', HTTP_AUTHORIZATION=f'Bearer {access}')
+
+        with self.assertNumQueries(0):
+            user, _ = HRClaimsAuthentication().authenticate(request)
+        self.assertIsInstance(user, HRTokenUser)
+        self.assertTrue(user.is_superuser)
+        self.assertTrue(user.is_staff)
+        self.assertEqual(user.hr_role, 'Superuser')
+
+        response, auth_queries = self.get_employees(access)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(auth_queries, [])
+
+
+class PersonFastSerializerTests(TestCase):
+    """
+    PersonFastSerializer must render exactly the same JSON as PersonSerializer.
+    """
+
+    def test_output_matches_person_serializer(self):
+        Person.objects.create(
+            full_name='Ada Lovelace', acdc_email='ada@acdc.com', personal_email='ada@example.com',
+            phone='555-0100', department='Engineering', subteam='Platform', position='Director',
+            status='on_leave', timezone='Europe/London', reports_to='Jenny', time_commitment=0,
+            start_date=datetime.date(2024, 2, 29), end_date=datetime.date(2025, 1, 1),
+        )
+        Person.objects.create(full_name='Grace Hopper', department='Design', start_date=datetime.date(2023, 1, 1))
+
+        queryset = Person.objects.order_by('pk')
+        expected = JSONRenderer().render(PersonSerializer(queryset, many=True).data)
+        columns = PersonFastSerializer().columns
+        actual = JSONRenderer().render(PersonFastSerializer(queryset.values(*columns), many=True).data)
+
+        self.assertEqual(actual, expected)
+
+
+class PersonCursorPaginationTests(PeopleAPITestCase):
+    """
+    Keyset pagination walks every person exactly once, in (sort key, id) order, both ways.
+    """
+
+    def setUp(self):
+        super().setUp()
+        # Few distinct values per key, so most pages end inside a run of ties
+        for i in range(11):
+            Person.objects.create(
+                full_name=['Ada Lovelace', 'Grace Hopper', 'Alan Turing'][i % 3],
+                acdc_email=f'p{i}@acdc.com', department=['Engineering', 'Design'][i % 2],
+                status=['active', 'inactive', 'on_leave'][i % 3],
+                start_date=datetime.date(2024, 1 + i % 4, 1),
+            )
+
+    def expected(self, ordering):
+        field = ordering.lstrip('-')
+        rows = sorted(Person.objects.values_list(field, 'id'))
+        ids = [person_id for _, person_id in rows]
+        return ids[::-1] if ordering.startswith('-') else ids
+
+    def get(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.json()
+
+    def walk(self, url):
+        """Follow next links from url, then previous links back; returns both id lists"""
+        forward, pages = [], []
+        while url:
+            page = self.get(url)
+            pages.append(page)
+            forward.extend(person['id'] for person in page['results'])
+            url = page['next']
+
+        backward = [person['id'] for person in pages[-1]['results']]
+        url = pages[-1]['previous']
+        while url:
+            page = self.get(url)
+            backward[:0] = [person['id'] for person in page['results']]
+            url = page['previous']
+        return forward, backward
+
+    def test_round_trip_for_every_sort_key(self):
+        for field in PersonCursorPagination.ordering_fields:
+            for ordering in (field, f'-{field}'):
+                with self.subTest(ordering=ordering):
+                    forward, backward = self.walk(f'/api/employees/?ordering={ordering}&page_size=3')
+                    self.assertEqual(forward, self.expected(ordering))
+                    self.assertEqual(backward, forward)
+
+    def test_id_breaks_ties(self):
+        Person.objects.update(full_name='Same Name')
+        forward, backward = self.walk('/api/employees/?page_size=2')
+
+        self.assertEqual(forward, sorted(Person.objects.values_list('id', flat=True)))
+        self.assertEqual(backward, forward)
+
+    def test_first_and_last_pages(self):
+        first = self.get('/api/employees/?page_size=4')
+        self.assertIsNone(first['previous'])
+        self.assertEqual(len(first['results']), 4)
+
+        everything = self.get('/api/employees/?page_size=11')
+        self.assertIsNone(everything['next'])
+        self.assertEqual(len(everything['results']), 11)
+
+    def test_invalid_and_tampered_cursors(self):
+        next_link = self.get('/api/employees/?page_size=3')['next']
+        cursor = parse_qs(urlparse(next_link).query)['cursor'][0]
+        payload = json.loads(base64.urlsafe_b64decode(cursor))
+
+        def encode(**changes):
+            return base64.urlsafe_b64encode(json.dumps({**payload, **changes}).encode()).decode()
+
+        bad_cursors = {
+            'not base64': '%%%',
+            'not json': base64.urlsafe_b64encode(b'{not json').decode(),
+            'missing keys': base64.urlsafe_b64encode(b'{}').decode(),
+            'other ordering': encode(o='-full_name'),
+            'id not a number': encode(id='abc'),
+        }
+        for name, bad in bad_cursors.items():
+            with self.subTest(name):
+                response = self.client.get('/api/employees/', {'page_size': 3, 'cursor': bad})
+                self.assertEqual(response.status_code, 404)
+                self.assertEqual(response.json()['detail'], 'Invalid cursor')
+
+        # A cursor value that cannot be a start_date
+        response = self.client.get('/api/employees/', {
+            'ordering': 'start_date', 'cursor': encode(o='start_date', v='not a date'),
+        })
+        self.assertEqual(response.status_code, 404)
+
+    def test_page_size_bounds(self):
+        for page_size in ('0', '-5', 'abc'):
+            with self.subTest(page_size=page_size):
+                response = self.client.get('/api/employees/', {'page_size': page_size})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('page_size', response.json())
+
+        # Oversized pages are capped (one extra row tells whether there is a next page)
+        with CaptureQueriesContext(connection) as queries:
+            self.get('/api/employees/?page_size=100000')
+        limit = PersonCursorPagination.max_page_size + 1
+        self.assertTrue(any(f'LIMIT {limit}' in query['sql'] for query in queries.captured_queries))
+
+    def test_unknown_ordering_is_rejected(self):
+        response = self.client.get('/api/employees/?ordering=personal_email')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('ordering', response.json())
+
+
+class PersonResponseCacheTests(PeopleAPITestCase):
+    """
+    Cached employee responses must never be served after a write.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.person = Person.objects.create(
+            full_name='Ada Lovelace', acdc_email='ada@acdc.com',
+            department='Engineering', start_date=datetime.date(2024, 1, 1),
+        )
+
+    def get_names(self):
+        response = self.client.get('/api/employees/filter_employees/?department=Engineering')
+        return [person['full_name'] for person in response.data['results']]
+
+    def test_repeated_read_is_served_from_cache(self):
+        self.get_names()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_names(), ['Ada Lovelace'])
+
+    def test_save_invalidates_cache(self):
+        self.get_names()
+        self.person.full_name = 'Ada King'
+        self.person.save()
+
+        self.assertEqual(self.get_names(), ['Ada King'])
+
+    def test_bulk_update_invalidates_cache(self):
+        self.get_names()
+        response = self.client.patch(
+            '/api/employees/bulk_update_by_identifier/',
+            {'emails': ['ada@acdc.com'], 'changes': {'department': 'Design'}},
+            format='json',
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_names(), [])
+
+
+class ConditionalGetTests(PeopleAPITestCase):
+    """
+    List and retrieve answer 304 to a matching If-None-Match until a write changes their data.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.ada = Person.objects.create(full_name='Ada Lovelace', acdc_email='ada@acdc.com',
+                                         department='Engineering', start_date=datetime.date(2024, 1, 1))
+        self.grace = Person.objects.create(full_name='Grace Hopper', acdc_email='grace@acdc.com',
+                                           department='Design', start_date=datetime.date(2024, 1, 1))
+        self.paths = ['/api/employees/', f'/api/employees/{self.ada.pk}/']
+
+    def etag(self, path):
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Last-Modified', response)
+        return response['ETag']
+
+    def revalidate(self, path, etag):
+        return self.client.get(path, headers={'If-None-Match': etag})
+
+    def assertChanged(self, etags):
+        for path, etag in etags.items():
+            response = self.revalidate(path, etag)
+            self.assertEqual(response.status_code, 200, path)
+            self.assertNotEqual(response['ETag'], etag, path)
+
+    def test_matching_etag_is_not_modified(self):
+        for path in self.paths + ['/api/employees/filter_employees/?department=Design']:
+            with self.subTest(path=path):
+                etag = self.etag(path)
+                response = self.revalidate(path, etag)
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b'')
+                self.assertEqual(response['ETag'], etag)
+
+                self.assertEqual(self.revalidate(path, 'W/"stale"').status_code, 200)
+
+    def test_not_modified_without_fetching_rows(self):
+        path = self.paths[1]
+        etag = self.etag(path)
+        caches['people'].clear()        # no cached response to answer from
+
+        # Only the validator query (SELECT updated_at)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.revalidate(path, etag).status_code, 304)
+
+    def test_save_changes_etags(self):
+        etags = {path: self.etag(path) for path in self.paths}
+        self.ada.department = 'Design'
+        self.ada.save()
+
+        self.assertChanged(etags)
+
+    def test_delete_changes_list_etag(self):
+        etag = self.etag('/api/employees/')
+        detail = self.paths[1]
+        detail_etag = self.etag(detail)
+        self.grace.delete()
+
+        self.assertChanged({'/api/employees/': etag})
+        self.assertEqual(self.revalidate(detail, detail_etag).status_code, 304)   # Ada is untouched
+
+        self.ada.delete()
+        self.assertEqual(self.revalidate(detail, detail_etag).status_code, 404)
+
+    def test_bulk_update_changes_etags(self):
+        etags = {path: self.etag(path) for path in self.paths}
+        response = self.client.patch('/api/employees/bulk_update_by_identifier/', {
+            'emails': ['ada@acdc.com'], 'changes': {'status': 'inactive'},
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertChanged(etags)
+
+
+class RosterExportTests(PeopleAPITestCase):
+    """
+    GET /api/employees/export/ streams CSV or NDJSON matching the API representation.
+    """
+
+    def setUp(self):
+        super().setUp()
+        Person.objects.create(full_name='Grace Hopper', acdc_email='grace@acdc.com', department='Design',
+                              status='inactive', start_date=datetime.date(2023, 5, 1))
+        Person.objects.create(full_name='Ada Lovelace', acdc_email='ada@acdc.com', department='Engineering',
+                              phone='555-0100', reports_to='Jenny, "JJ"', start_date=datetime.date(2024, 2, 29))
+        Person.objects.create(full_name='Zoë Ünal', acdc_email='zoe@acdc.com', department='Engineering',
+                              start_date=datetime.date(2024, 3, 1))
+
+    def export(self, query=''):
+        response = self.client.get(f'/api/employees/export/{query}')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def expected(self, **filters):
+        people = Person.objects.filter(**filters).order_by('full_name', 'pk')
+        return [dict(person) for person in PersonSerializer(people, many=True).data]
+
+    def test_csv_is_the_default(self):
+        response, body = self.export()
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="employees.csv"')
+
+        rows = list(csv.DictReader(io.StringIO(body)))
+        expected = [{key: '' if value is None else str(value) for key, value in person.items()}
+                    for person in self.expected()]
+        self.assertEqual(rows, expected)
+
+    def test_ndjson_lines_match_the_api(self):
+        response, body = self.export('?format=ndjson')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="employees.ndjson"')
+
+        self.assertTrue(body.endswith('\n'))
+        self.assertIn('Zoë Ünal', body)         # UTF-8, not \u escapes
+        self.assertEqual([json.loads(line) for line in body.splitlines()], self.expected())
+
+    def test_filters_are_applied(self):
+        _, body = self.export('?format=ndjson&department=Engineering&status=active')
+        self.assertEqual([json.loads(line) for line in body.splitlines()],
+                         self.expected(department='Engineering', status='active'))
+
+        _, body = self.export('?format=csv&department=Sales')
+        self.assertEqual(body.splitlines()[1:], [])
+
+    def test_format_negotiation(self):
+        response, _ = self.export('?format=CSV')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+
+        # ?format= picks the file type, not a DRF renderer - errors stay JSON
+        response = self.client.get('/api/employees/export/?format=xml')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertIn("Unsupported format 'xml'", response.json()['error'])
+
+    def test_rows_are_streamed_in_chunks(self):
+        lines = stream_csv(Person.objects.order_by('full_name', 'pk'), chunk_size=1)
+        with CaptureQueriesContext(connection) as queries:
+            header = next(lines)
+            self.assertEqual(len(queries), 0)        # the header needs no query
+            self.assertIn('Ada Lovelace', next(lines))
+        self.assertTrue(header.startswith('id,'))
+        self.assertEqual(len(list(lines)), 2)
+
+
+class BulkEndpointTests(PeopleAPITestCase):
+    """
+    Bulk create/upsert, update and delete validate every row or identifier and write in a few statements.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.person = Person.objects.create(full_name='Ada Lovelace', acdc_email='ada@acdc.com',
+                                            department='Engineering', start_date=datetime.date(2024, 1, 1))
+
+    def row(self, name, email, **extra):
+        return {'full_name': name, 'acdc_email': email, 'department': 'Engineering',
+                'start_date': '2024-01-01', **extra}
+
+    def bulk(self, rows):
+        return self.client.post('/api/employees/bulk/', rows, format='json')
+
+    def test_rows_are_rejected_with_their_index(self):
+        response = self.bulk([
+            self.row('Grace Hopper', 'grace@acdc.com'),
+            {'acdc_email': 'nameless@acdc.com', 'department': 'Engineering', 'start_date': '2024-01-01'},
+            self.row('Bad Department', 'bad@acdc.com', department='Nowhere'),
+            'not an object',
+            self.row('Time Traveller', 'tt@acdc.com', end_date='2023-01-01'),
+            self.row('Alan Turing', 'alan@acdc.com'),
+        ])
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual((response.data['created'], response.data['updated']), (2, 0))
+        errors = {error['index']: error['errors'] for error in response.data['errors']}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertIn('full_name', errors[1])
+        self.assertIn('department', errors[2])
+        self.assertIn('non_field_errors', errors[3])
+        self.assertIn('end_date', errors[4])
+        self.assertEqual(set(Person.objects.values_list('acdc_email', flat=True)),
+                         {'ada@acdc.com', 'grace@acdc.com', 'alan@acdc.com'})
+
+    def test_duplicates_in_batch_are_rejected_ignoring_case(self):
+        response = self.bulk([
+            self.row('Grace Hopper', 'grace@acdc.com', personal_email='grace@example.com'),
+            self.row('Grace Again', 'GRACE@acdc.com'),
+            self.row('Alan Turing', 'alan@acdc.com', personal_email='Grace@Example.com'),
+        ])
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual([(error['index'], list(error['errors'])) for error in response.data['errors']],
+                         [(1, ['acdc_email']), (2, ['personal_email'])])
+
+    def test_existing_acdc_email_is_updated_in_place(self):
+        response = self.bulk([self.row('Ada King', 'ada@acdc.com', department='Design')])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        person = Person.objects.get()
+        self.assertEqual((person.pk, person.full_name, person.department), (self.person.pk, 'Ada King', 'Design'))
+        change = PersonChange.objects.filter(person_id=person.pk).latest('id')
+        self.assertEqual(change.action, 'update')
+        self.assertEqual(change.changes['department'], ['Engineering', 'Design'])
+
+    def test_existing_acdc_email_in_other_case_is_updated_in_place(self):
+        response = self.bulk([self.row('Ada King', 'ADA@acdc.com', department='Design')])
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['updated']), (0, 1))
+        person = Person.objects.get()
+        self.assertEqual((person.pk, person.acdc_email, person.full_name), (self.person.pk, 'ada@acdc.com', 'Ada King'))
+
+        response = self.client.patch('/api/employees/update_by_identifier/?email=Ada@acdc.com',
+                                     {'subteam': 'Platform'}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_personal_email_of_another_person_is_rejected(self):
+        Person.objects.filter(pk=self.person.pk).update(personal_email='ada@example.com')
+        for personal_email in ('ada@example.com', 'Ada@Example.com'):
+            response = self.bulk([self.row('Grace Hopper', 'grace@acdc.com', personal_email=personal_email)])
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(list(response.data['errors'][0]['errors']), ['personal_email'])
+
+    def test_batch_is_written_in_constant_queries(self):
+        rows = [self.row(f'Person {i}', f'p{i}@acdc.com') for i in range(40)]
+        rows.append(self.row('Ada King', 'ada@acdc.com'))
+
+        # Existing emails, savepoint, locked "before" rows, one INSERT ... ON CONFLICT,
+        # "after" rows, headcount delta, one history INSERT, release
+        with self.assertNumQueries(8):
+            response = self.bulk(rows)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['updated']), (40, 1))
+
+    def test_invalid_bodies_are_rejected(self):
+        self.assertEqual(self.bulk([]).status_code, 400)
+        self.assertEqual(self.bulk({'full_name': 'Not a list'}).status_code, 400)
+        self.assertEqual(self.bulk([{}] * (BULK_MAX_ROWS + 1)).status_code, 400)
+
+    def test_bulk_delete_runs_constant_queries(self):
+        for size in (5, 20):
+            with self.subTest(size=size):
+                people = [Person.objects.create(full_name=f'Leaver {size}-{i}', acdc_email=f'l{size}-{i}@acdc.com',
+                                                department='Design', start_date=datetime.date(2024, 1, 1))
+                          for i in range(size)]
+                Person.objects.create(full_name=f'Stayer {size}', acdc_email=f's{size}@acdc.com', manager=people[0],
+                                      department='Design', start_date=datetime.date(2024, 1, 1))
+
+                # Resolve, lock, reports (lock, UPDATE, re-read), closure DELETE,
+                # headcount (UPDATE, prune), history INSERT, DELETE, savepoint + release
+                with self.assertNumQueries(12):
+                    response = self.client.delete('/api/employees/bulk_delete_by_identifier/', {
+                        'emails': [person.acdc_email for person in people],
+                    }, format='json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['deleted'], size)
+                self.assertEqual(compare_headcount_summary(), [])
+
+    def test_bulk_update_runs_constant_queries(self):
+        for size in (5, 20):
+            with self.subTest(size=size):
+                people = [Person.objects.create(full_name=f'Mover {size}-{i}', acdc_email=f'm{size}-{i}@acdc.com',
+                                                department='Design', start_date=datetime.date(2024, 1, 1))
+                          for i in range(size)]
+
+                # Resolve, savepoint, lock, UPDATE, re-read, headcount (2 groups, prune),
+                # history INSERT, release - validation itself runs in memory
+                with self.assertNumQueries(10):
+                    response = self.client.patch('/api/employees/bulk_update_by_identifier/', {
+                        'emails': [person.acdc_email for person in people],
+                        'changes': {'department': 'Engineering', 'time_commitment': 20},
+                    }, format='json')
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.data['updated'], size)
+                self.assertEqual(compare_headcount_summary(), [])
+
+    def identified_people(self):
+        def person(name, email, **extra):
+            return Person.objects.create(full_name=name, acdc_email=email, department='Engineering',
+                                         start_date=datetime.date(2024, 1, 1), **extra)
+
+        return {
+            'grace': person('Grace Hopper', 'Grace@ACDC.com'),
+            'alan': person('Alan Turing', 'alan@acdc.com', end_date=datetime.date(2024, 12, 31)),
+            'sam': person('Sam Smith', 'sam@acdc.com'),
+            'other_sam': person('Sam Smith', 'sam.smith@acdc.com'),
+        }
+
+    def statuses(self, response):
+        return [(result['identifier'], result['status']) for result in response.data['results']]
+
+    def test_bulk_update_reports_every_identifier_in_order(self):
+        people = self.identified_people()
+        response = self.client.patch('/api/employees/bulk_update_by_identifier/', {
+            'emails': ['grace@acdc.com', 'nobody@acdc.com', 'ADA@acdc.com'],
+            'full_names': ['sam smith', 'ALAN TURING'],
+            'changes': {'start_date': '2025-01-01'},       # after Alan's end_date
+        }, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(self.statuses(response), [
+            ('grace@acdc.com', 'matched'), ('nobody@acdc.com', 'not_found'), ('ADA@acdc.com', 'matched'),
+            ('sam smith', 'ambiguous'), ('ALAN TURING', 'invalid'),
+        ])
+        self.assertEqual(len(response.data['results'][3]['matches']), 2)
+        self.assertIn('end_date', response.data['results'][4]['errors'])
+
+        self.assertEqual(set(Person.objects.filter(start_date=datetime.date(2025, 1, 1)).values_list('pk', flat=True)),
+                         {self.person.pk, people['grace'].pk})
+        self.assertEqual(compare_headcount_summary(), [])
+        self.assertEqual(
+            dict(PersonChange.objects.filter(action='update').values_list('person_id', 'changes')),
+            {pk: {'start_date': ['2024-01-01', '2025-01-01']} for pk in (self.person.pk, people['grace'].pk)},
+        )
+
+    def test_bulk_delete_reports_every_identifier_in_order(self):
+        people = self.identified_people()
+        response = self.client.delete('/api/employees/bulk_delete_by_identifier/', {
+            'emails': ['ADA@acdc.com', 'missing@acdc.com'],
+            'full_names': ['SAM SMITH', 'grace HOPPER'],
+        }, format='json')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertEqual(self.statuses(response), [
+            ('ADA@acdc.com', 'matched'), ('missing@acdc.com', 'not_found'),
+            ('SAM SMITH', 'ambiguous'), ('grace HOPPER', 'matched'),
+        ])
+
+        self.assertEqual(Person.objects.count(), 3)
+        self.assertEqual(HeadcountSummary.objects.get(department='Engineering').headcount, 3)
+        self.assertEqual(compare_headcount_summary(), [])
+        self.assertEqual(set(PersonChange.objects.filter(action='delete').values_list('person_id', flat=True)),
+                         {self.person.pk, people['grace'].pk})
+
+    def bulk_update(self, changes):
+        return self.client.patch('/api/employees/bulk_update_by_identifier/',
+                                 {'emails': ['ada@acdc.com'], 'changes': changes}, format='json')
+
+    def test_bulk_update_without_updatable_fields_is_rejected(self):
+        updated_at = self.person.updated_at
+        for changes in ({}, {'nickname': 'Ada'}, {'id': 99, 'created_at': '2020-01-01T00:00:00Z'}):
+            response = self.bulk_update(changes)
+            self.assertEqual(response.status_code, 400, changes)
+            self.assertIn('changes', response.data)
+
+        self.assertEqual(Person.objects.get(pk=self.person.pk).updated_at, updated_at)
+        self.assertEqual(self.bulk_update({'nickname': 'Ada', 'department': 'Design'}).status_code, 200)
+
+
+class PersonSearchTests(PeopleAPITestCase):
+    """
+    Fuzzy search ranks by trigram similarity and tolerates typos.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for name, email in [('Jonathan Smith', 'jsmith@acdc.com'),
+                            ('Joan Smyth', 'joan@acdc.com'),
+                            ('Priya Patel', 'priya.patel@acdc.com')]:
+            Person.objects.create(
+                full_name=name, acdc_email=email,
+                department='Engineering', start_date=datetime.date(2024, 1, 1),
+            )
+
+    def search(self, query):
+        response = self.client.get('/api/employees/search/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [person['full_name'] for person in response.data['results']]
+
+    def test_trigram_similarity_matches_pg_trgm(self):
+        self.assertEqual(trigrams('cat'), {'  c', ' ca', 'cat', 'at '})
+
+    def test_typo_finds_best_match_first(self):
+        self.assertEqual(self.search('jonathon smith')[0], 'Jonathan Smith')
+        self.assertEqual(self.search('priya.patel'), ['Priya Patel'])
+
+    def test_index_follows_writes(self):
+        self.search('smith')
+        Person.objects.filter(full_name='Priya Patel').delete()
+        Person.objects.filter(full_name='Joan Smyth').update(full_name='Joan Patel')
+        Person.objects.get(full_name='Joan Patel').save()
+
+        self.assertEqual(self.search('patel'), ['Joan Patel'])
+
+    def test_missing_query_is_rejected(self):
+        response = self.client.get('/api/employees/search/')
+        self.assertEqual(response.status_code, 400)
+
+
+class PersonAutocompleteTests(PeopleAPITestCase):
+    """
+    Autocomplete answers from memory and follows writes through signals.
+    """
+
+    def setUp(self):
+        super().setUp()
+        for name, email in [('José Núñez', 'jose@acdc.com'),
+                            ('Mary Ann Smith', 'mary@acdc.com'),
+                            ('Joan Smythe', 'jsmythe@acdc.com')]:
+            Person.objects.create(
+                full_name=name, acdc_email=email,
+                department='Engineering', start_date=datetime.date(2024, 1, 1),
+            )
+
+    def suggest(self, prefix):
+        response = self.client.get('/api/employees/autocomplete/', {'prefix': prefix})
+        self.assertEqual(response.status_code, 200)
+        return [person['full_name'] for person in response.data['results']]
+
+    def test_matches_names_words_and_emails(self):
+        self.assertEqual(self.suggest('jo'), ['Joan Smythe', 'José Núñez'])
+        self.assertEqual(self.suggest('NUN'), ['José Núñez'])
+        self.assertEqual(self.suggest('sm'), ['Mary Ann Smith', 'Joan Smythe'])
+        self.assertEqual(self.suggest('jsm'), ['Joan Smythe'])
+
+    def test_lookup_does_not_query_database(self):
+        autocomplete_people('jo')
+        with self.assertNumQueries(0):
+            self.assertEqual(len(autocomplete_people('ma')), 1)
+
+    def test_index_follows_saves_and_deletes(self):
+        self.suggest('jo')
+        person = Person.objects.get(acdc_email='jose@acdc.com')
+        person.full_name = 'Pepe Núñez'
+        person.save()
+        Person.objects.filter(acdc_email='jsmythe@acdc.com').delete()
+
+        self.assertEqual(self.suggest('jo'), ['Pepe Núñez'])
+        self.assertEqual(self.suggest('pe'), ['Pepe Núñez'])
+
+    def test_signal_updates_index_after_commit(self):
+        index = get_prefix_index()
+        person = Person.objects.get(acdc_email='mary@acdc.com')
+        with self.captureOnCommitCallbacks(execute=True):
+            person.full_name = 'Maria Smith'
+            person.save()
+
+        self.assertEqual([p['full_name'] for p in index.lookup('maria')], ['Maria Smith'])
+        self.assertEqual(index.lookup('mary a'), [])
+
+
+class HeadcountSummaryTests(PeopleAPITestCase):
+    """
+    The headcount summary stays equal to a fresh aggregate after every kind of write.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.people = [
+            Person.objects.create(
+                full_name=f'Person {i}', acdc_email=f'p{i}@acdc.com',
+                department='Engineering' if i % 2 else 'Design', subteam='Web' if i % 3 else None,
+                time_commitment=10 * i, start_date=datetime.date(2024, 1, 1),
+            )
+            for i in range(6)
+        ]
+
+    def assertConsistent(self):
+        self.assertEqual(compare_headcount_summary(), [])
+
+    def test_single_writes_update_summary(self):
+        person = self.people[0]
+        person.department = 'Sales'
+        person.time_commitment = 25
+        person.save()
+        self.people[1].delete()
+
+        self.assertConsistent()
+
+    def test_save_locks_the_stored_row(self):
+        person = self.people[0]
+        person.department = 'Sales'
+        with CaptureQueriesContext(connection) as queries:
+            person.save()
+
+        before = next(query['sql'] for query in queries.captured_queries if query['sql'].startswith('SELECT'))
+        self.assertIn('FROM "people"', before)
+        if connection.features.has_select_for_update:
+            self.assertIn('FOR UPDATE', before)
+
+    def test_bulk_writes_update_summary(self):
+        response = self.client.post('/api/employees/bulk/', [
+            {'full_name': 'Person 0', 'acdc_email': 'p0@acdc.com', 'department': 'Finance',
+             'start_date': '2024-01-01', 'time_commitment': 5},
+            {'full_name': 'New Person', 'acdc_email': 'new@acdc.com', 'department': 'Design',
+             'start_date': '2024-01-01'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertConsistent()
+
+        response = self.client.patch('/api/employees/bulk_update_by_identifier/', {
+            'emails': ['p1@acdc.com', 'p2@acdc.com'], 'changes': {'status': 'inactive'},
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertConsistent()
+
+        response = self.client.delete('/api/employees/bulk_delete_by_identifier/', {
+            'emails': ['p3@acdc.com', 'new@acdc.com'],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertConsistent()
+
+    def test_stats_endpoint_reads_summary(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/employees/stats/')
+
+        self.assertEqual(response.data['total'], {'headcount': 6, 'time_commitment': 150})
+        self.assertEqual(response.data['by_department'], [
+            {'department': 'Design', 'headcount': 3, 'time_commitment': 60},
+            {'department': 'Engineering', 'headcount': 3, 'time_commitment': 90},
+        ])
+        self.assertEqual(response.data['by_subteam'][-1], {'subteam': None, 'headcount': 2, 'time_commitment': 30})
+
+    def test_rebuild_command_repairs_drift(self):
+        HeadcountSummary.objects.update(headcount=99)
+        with self.assertRaises(CommandError):
+            call_command('rebuild_headcount_summary', '--check', stdout=StringIO())
+
+        call_command('rebuild_headcount_summary', stdout=StringIO())
+        self.assertConsistent()
+
+
+class ReportingHierarchyTests(PeopleAPITestCase):
+    """
+    The closure table matches Person.manager after creates, moves and deletes.
+    """
+
+    def setUp(self):
+        super().setUp()
+
+        def person(name, manager=None):
+            return Person.objects.create(
+                full_name=name, acdc_email=f'{name.lower()}@acdc.com', manager=manager,
+                department='Engineering', start_date=datetime.date(2024, 1, 1),
+            )
+
+        # ceo → (cto → (lead → dev), cfo)
+        self.ceo = person('Ceo')
+        self.cto = person('Cto', self.ceo)
+        self.cfo = person('Cfo', self.ceo)
+        self.lead = person('Lead', self.cto)
+        self.dev = person('Dev', self.lead)
+
+    def assertClosureConsistent(self):
+        managers = dict(Person.objects.values_list('id', 'manager_id'))
+        expected = set()
+        for person_id in managers:
+            manager_id, depth = managers[person_id], 1
+            while manager_id is not None:
+                expected.add((manager_id, person_id, depth))
+                manager_id, depth = managers[manager_id], depth + 1
+
+        stored = set(PersonHierarchy.objects.values_list('ancestor_id', 'descendant_id', 'depth'))
+        self.assertEqual(stored, expected)
+
+    def names(self, response):
+        return [person['full_name'] for person in response.data['results']]
+
+    def test_subtree_and_chain(self):
+        self.assertClosureConsistent()
+
+        with self.assertNumQueries(2):
+            response = self.client.get(f'/api/employees/{self.ceo.pk}/reports/')
+        self.assertEqual(self.names(response), ['Cfo', 'Cto', 'Dev', 'Lead'])
+
+        response = self.client.get(f'/api/employees/{self.ceo.pk}/reports/?depth=1')
+        self.assertEqual(self.names(response), ['Cfo', 'Cto'])
+
+        response = self.client.get(f'/api/employees/{self.dev.pk}/chain/')
+        self.assertEqual([(m['full_name'], m['level']) for m in response.data['chain']],
+                         [('Lead', 1), ('Cto', 2), ('Ceo', 3)])
+
+    def test_moving_a_manager_moves_their_subtree(self):
+        self.lead.manager = self.cfo
+        self.lead.save()
+        self.assertClosureConsistent()
+
+        response = self.client.get(f'/api/employees/{self.dev.pk}/chain/')
+        self.assertEqual([m['full_name'] for m in response.data['chain']], ['Lead', 'Cfo', 'Ceo'])
+
+        response = self.client.patch(f'/api/employees/{self.cto.pk}/', {'manager': self.dev.pk}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertClosureConsistent()
+
+        response = self.client.patch(f'/api/employees/{self.ceo.pk}/', {'manager': self.dev.pk}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_deleting_a_manager_makes_reports_top_level(self):
+        self.cto.delete()
+        self.assertClosureConsistent()
+
+        response = self.client.get('/api/employees/org_chart/')
+        self.assertEqual(self.names(response), ['Ceo', 'Lead'])
+
+    def test_bulk_delete_detaches_the_hierarchy(self):
+        response = self.client.delete('/api/employees/bulk_delete_by_identifier/', {
+            'emails': ['cto@acdc.com', 'lead@acdc.com'],
+        }, format='json')
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertClosureConsistent()
+
+        self.dev.refresh_from_db()
+        self.assertIsNone(self.dev.manager_id)
+        self.assertEqual(PersonChange.objects.filter(person_id=self.dev.pk).latest('id').changes,
+                         {'manager': [self.lead.pk, None]})
+        self.assertEqual(PersonChange.objects.filter(action='delete').count(), 2)
+
+    def test_org_chart_nests_reports(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/employees/org_chart/?depth=3')
+
+        [ceo] = response.data['results']
+        self.assertEqual(ceo['total_reports'], 4)
+        self.assertEqual([node['full_name'] for node in ceo['reports']], ['Cfo', 'Cto'])
+        cto = ceo['reports'][1]
+        self.assertEqual([node['full_name'] for node in cto['reports']], ['Lead'])
+        self.assertEqual(cto['reports'][0]['reports'], [])
+        self.assertEqual(cto['reports'][0]['total_reports'], 1)
+
+
+class PersonHistoryTests(PeopleAPITestCase):
+    """
+    Every write leaves a field-level diff, and as-of reads rebuild past state from it.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.start_date = datetime.date(2024, 1, 1)
+
+    def changes(self, person_id):
+        return list(PersonChange.objects.filter(person_id=person_id).order_by('changed_at', 'id'))
+
+    def test_api_writes_are_recorded_with_actor(self):
+        response = self.client.post('/api/employees/', {
+            'full_name': 'Jane Doe', 'acdc_email': 'jane@acdc.com',
+            'department': 'Engineering', 'start_date': '2024-01-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        person_id = response.data['id']
+
+        self.client.patch(f'/api/employees/{person_id}/', {'status': 'inactive'}, format='json')
+        self.client.patch(f'/api/employees/{person_id}/', {'status': 'inactive'}, format='json')
+        self.client.delete(f'/api/employees/{person_id}/')
+
+        created, updated, deleted = self.changes(person_id)
+        self.assertEqual(created.action, 'create')
+        self.assertEqual(created.changes['full_name'], [None, 'Jane Doe'])
+        self.assertEqual(updated.changes, {'status': ['active', 'inactive']})
+        self.assertEqual(deleted.action, 'delete')
+        self.assertEqual({change.changed_by for change in (created, updated, deleted)}, {'admin'})
+
+        response = self.client.get(f'/api/employees/{person_id}/history/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([entry['action'] for entry in response.data['results']], ['delete', 'update', 'create'])
+
+        self.assertEqual(self.client.get('/api/employees/999999/history/').status_code, 404)
+
+    def test_person_without_history_gets_empty_page(self):
+        # Written before the history existed (bulk_create sends no signals)
+        person, = Person.objects.bulk_create([Person(full_name='Old Timer', acdc_email='old@acdc.com',
+                                                     department='Design', start_date=self.start_date)])
+        response = self.client.get(f'/api/employees/{person.pk}/history/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'], [])
+        self.assertIsNone(response.data['next'])
+
+    def test_bulk_writes_are_recorded(self):
+        person = Person.objects.create(full_name='Old Name', acdc_email='old@acdc.com',
+                                       department='Design', start_date=self.start_date)
+        response = self.client.post('/api/employees/bulk/', [
+            {'full_name': 'New Name', 'acdc_email': 'old@acdc.com', 'department': 'Design',
+             'start_date': '2024-01-01'},
+            {'full_name': 'Someone', 'acdc_email': 'someone@acdc.com', 'department': 'Design',
+             'start_date': '2024-01-01'},
+        ], format='json')
+        self.assertEqual(response.status_code, 201)
+        self.client.patch('/api/employees/bulk_update_by_identifier/', {
+            'emails': ['old@acdc.com'], 'changes': {'department': 'Sales'},
+        }, format='json')
+
+        self.assertEqual([change.changes for change in self.changes(person.pk)[1:]], [
+            {'full_name': ['Old Name', 'New Name']},
+            {'department': ['Design', 'Sales']},
+        ])
+        someone = Person.objects.get(acdc_email='someone@acdc.com')
+        self.assertEqual([change.action for change in self.changes(someone.pk)], ['create'])
+
+    def test_as_of_reads_rebuild_past_state(self):
+        jane = Person.objects.create(full_name='Jane Doe', acdc_email='jane@acdc.com',
+                                     department='Engineering', start_date=self.start_date)
+        john = Person.objects.create(full_name='John Roe', acdc_email='john@acdc.com',
+                                     department='Design', start_date=self.start_date)
+        before_snapshot = self.changes(john.pk)[-1].changed_at
+
+        take_snapshot()
+        jane.department = 'Sales'
+        jane.save()
+        john.delete()
+        Person.objects.create(full_name='Anna Poe', acdc_email='anna@acdc.com',
+                              department='Design', start_date=self.start_date)
+        after_move = self.changes(jane.pk)[-1].changed_at
+
+        response = self.client.get('/api/employees/', {'as_of': before_snapshot.isoformat()})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([(p['full_name'], p['department']) for p in response.data['results']],
+                         [('Jane Doe', 'Engineering'), ('John Roe', 'Design')])
+
+        response = self.client.get('/api/employees/', {'as_of': after_move.isoformat(), 'department': 'Sales'})
+        self.assertEqual([p['full_name'] for p in response.data['results']], ['Jane Doe'])
+
+        # Replayed state is identical to what the live API returned at that time
+        live = self.client.get(f'/api/employees/{jane.pk}/').data
+        response = self.client.get(f'/api/employees/{jane.pk}/', {'as_of': after_move.isoformat()})
+        self.assertEqual(response.data, live)
+
+        response = self.client.get(f'/api/employees/{john.pk}/', {'as_of': after_move.isoformat()})
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get('/api/employees/', {'as_of': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
+
+
+@override_settings(PEOPLE_SYNC_SETTLE_SECONDS=0)
+class PersonDeltaSyncTests(PeopleAPITestCase):
+    """
+    A client applying every changes/ response ends up with the live roster.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.start_date = datetime.date(2024, 1, 1)
+        self.people = [
+            Person.objects.create(full_name=f'Person {i}', acdc_email=f'p{i}@acdc.com',
+                                  department='Engineering', start_date=self.start_date)
+            for i in range(5)
+        ]
+        self.local = {}
+        self.token = None
+
+    def sync(self, limit=2):
+        """Apply changes/ responses until has_more is false; returns the number of calls"""
+        calls = 0
+        while True:
+            params = {'limit': limit}
+            if self.token:
+                params['since'] = self.token
+            response = self.client.get('/api/employees/changes/', params)
+            self.assertEqual(response.status_code, 200)
+            calls += 1
+            for person in response.data['changed']:
+                self.local[person['id']] = person
+            for person_id in response.data['deleted']:
+                self.local.pop(person_id, None)
+            self.token = response.data['next']
+            if not response.data['has_more']:
+                return calls
+
+    def assertInSync(self):
+        live = self.client.get('/api/employees/', {'page_size': 500}).data['results']
+        self.assertEqual(self.local, {person['id']: person for person in live})
+
+    def test_initial_sync_then_deltas(self):
+        self.assertEqual(self.sync(), 3)
+        self.assertInSync()
+
+        self.people[0].department = 'Sales'
+        self.people[0].save()
+        deleted_id = self.people[1].pk
+        self.people[1].delete()
+        Person.objects.create(full_name='Newcomer', acdc_email='new@acdc.com',
+                              department='Design', start_date=self.start_date)
+        self.client.patch('/api/employees/bulk_update_by_identifier/', {
+            'emails': ['p2@acdc.com'], 'changes': {'status': 'inactive'},
+        }, format='json')
+
+        response = self.client.get('/api/employees/changes/', {'since': self.token})
+        self.assertEqual(sorted(p['full_name'] for p in response.data['changed']),
+                         ['Newcomer', 'Person 0', 'Person 2'])
+        self.assertEqual(response.data['deleted'], [deleted_id])
+
+        self.sync()
+        self.assertInSync()
+
+    def test_deleting_a_manager_updates_their_reports(self):
+        boss, report = self.people[0], self.people[1]
+        report.manager = boss
+        report.save()
+        self.sync()
+        updated_at = Person.objects.get(pk=report.pk).updated_at
+
+        boss_id = boss.pk
+        boss.delete()
+
+        report.refresh_from_db()
+        self.assertIsNone(report.manager_id)
+        self.assertGreater(report.updated_at, updated_at)
+        change = PersonChange.objects.filter(person_id=report.pk).latest('id')
+        self.assertEqual((change.action, change.changes), ('update', {'manager': [boss_id, None]}))
+        response = self.client.get('/api/employees/changes/', {'since': self.token})
+        self.assertEqual([person['id'] for person in response.data['changed']], [report.pk])
+        self.sync()
+        self.assertInSync()
+
+    def test_in_sync_client_gets_empty_response(self):
+        self.sync()
+
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/employees/changes/', {'since': self.token})
+        self.assertEqual((response.data['changed'], response.data['deleted']), ([], []))
+        self.assertFalse(response.data['has_more'])
+
+    def test_recent_rows_wait_for_settle_window(self):
+        with self.settings(PEOPLE_SYNC_SETTLE_SECONDS=60):
+            response = self.client.get('/api/employees/changes/')
+        self.assertEqual(response.data['changed'], [])
+
+    def test_invalid_token_is_rejected(self):
+        response = self.client.get('/api/employees/changes/', {'since': 'not-a-token'})
+        self.assertEqual(response.status_code, 400)
+
+
+class PersonEventStreamTests(PeopleAPITestCase):
+    """
+    Writes are pushed to stream subscribers after commit, filtered and authorized.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.start_date = datetime.date(2024, 1, 1)
+        self.outsider = User.objects.create_user('outsider', 'outsider@acdcco.org', 'OutsiderPass123!')
+        self.tokens = {
+            user.username: str(add_role_claims(RefreshToken.for_user(user), user, None).access_token)
+            for user in (self.admin, self.outsider)
+        }
+
+    def test_writes_reach_matching_subscribers(self):
+        loop = asyncio.new_event_loop()
+
+        async def subscribe():
+            return broker.subscribe({'department': 'Design'}), broker.subscribe()
+
+        async def drain(subscription):
+            events = []
+            while (event := await subscription.get(timeout=0.05)) is not None:
+                events.append((event['action'], event['person']['full_name'], event['person']['department']))
+            return events
+
+        design, everyone = loop.run_until_complete(subscribe())
+        try:
+            with self.captureOnCommitCallbacks(execute=True):
+                jane = Person.objects.create(full_name='Jane Doe', acdc_email='jane@acdc.com',
+                                             department='Design', start_date=self.start_date)
+            with self.captureOnCommitCallbacks(execute=True):
+                jane.department = 'Sales'
+                jane.save()
+            with self.captureOnCommitCallbacks(execute=True):
+                Person.objects.create(full_name='John Roe', acdc_email='john@acdc.com',
+                                      department='Engineering', start_date=self.start_date)
+
+            self.assertEqual(loop.run_until_complete(drain(design)), [
+                ('create', 'Jane Doe', 'Design'),
+                ('update', 'Jane Doe', 'Sales'),      # left the filter - still reported
+            ])
+            self.assertEqual(len(loop.run_until_complete(drain(everyone))), 3)
+        finally:
+            broker.unsubscribe(design)
+            broker.unsubscribe(everyone)
+            loop.close()
+
+    def test_stream_requires_hr_role(self):
+        self.assertEqual(Client().get('/api/employees/stream/').status_code, 401)
+        response = Client().get('/api/employees/stream/',
+                                HTTP_AUTHORIZATION=f'Bearer {self.tokens["outsider"]}')
+        self.assertEqual(response.status_code, 403)
+
+    async def test_stream_opens_for_hr_reader_and_closes_on_disconnect(self):
+        communicator = ApplicationCommunicator(get_asgi_application(), {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': '/api/employees/stream/', 'raw_path': b'/api/employees/stream/',
+            'query_string': b'department=Design', 'root_path': '', 'server': ('testserver', 80),
+            'client': ('127.0.0.1', 50000),
+            'headers': [(b'host', b'testserver'), (b'authorization', f'Bearer {self.tokens["admin"]}'.encode())],
+        })
+        await communicator.send_input({'type': 'http.request', 'body': b'', 'more_body': False})
+
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'Content-Type', b'text/event-stream'), start['headers'])
+        body = await communicator.receive_output(timeout=5)
+        self.assertTrue(body['body'].startswith(b'retry:'))
+        self.assertEqual(broker.subscriber_count(), 1)
+
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+        self.assertEqual(broker.subscriber_count(), 0)
+
+
+class AsyncReadPathTests(PeopleAPITestCase):
+    """
+    The ASGI read views answer exactly like PersonViewSet.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.outsider = User.objects.create_user('outsider', 'outsider@acdcco.org', 'OutsiderPass123!')
+        self.tokens = {
+            user.username: str(add_role_claims(RefreshToken.for_user(user), user, None).access_token)
+            for user in (self.admin, self.outsider)
+        }
+        self.people = [
+            Person.objects.create(full_name=f'Person {i}', acdc_email=f'p{i}@acdc.com',
+                                  department='Engineering' if i % 2 else 'Design',
+                                  start_date=datetime.date(2024, 1, 1))
+            for i in range(5)
+        ]
+        self.views = {f"'{pattern.pattern}'": pattern.callback for pattern in async_read_urlpatterns(router)}
+
+    async def call(self, route, path, user='admin', method='get', headers=None, **kwargs):
+        headers = {'Authorization': f'Bearer {self.tokens[user]}', **(headers or {})}
+        request = getattr(AsyncRequestFactory(), method)(path, headers=headers, **kwargs.pop('request', {}))
+        view = next(view for pattern, view in self.views.items() if route in pattern)
+        response = await view(request, **kwargs)
+        if hasattr(response, 'render'):
+            response.render()
+        body = json.loads(response.content) if response.content else None
+        return response, body
+
+    async def test_reads_match_sync_viewset(self):
+        sync_get = sync_to_async(lambda path: self.client.get(path).json())
+        pk = self.people[0].pk
+
+        for route, path, kwargs in [
+            ("'api/employees/'", '/api/employees/?page_size=2', {}),
+            ('filter_employees', '/api/employees/filter_employees/?department=Design', {}),
+            ('(?P<pk>', f'/api/employees/{pk}/', {'pk': str(pk)}),
+        ]:
+            response, body = await self.call(route, path, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(body, await sync_get(path))
+
+            response, _ = await self.call(route, path, headers={'If-None-Match': response['ETag']}, **kwargs)
+            self.assertEqual(response.status_code, 304)
+
+        response, _ = await self.call('(?P<pk>', '/api/employees/999999/', pk='999999')
+        self.assertEqual(response.status_code, 404)
+
+    async def test_permissions_and_fallback(self):
+        response, _ = await self.call("'api/employees/'", '/api/employees/', user='outsider')
+        self.assertEqual(response.status_code, 403)
+
+        response = await self.views["'api/employees/'"](AsyncRequestFactory().get('/api/employees/'))
+        self.assertEqual(response.status_code, 401)
+
+        # Writes go to PersonViewSet
+        response, body = await self.call("'api/employees/'", '/api/employees/', method='post', request={
+            'data': {'full_name': 'New Person', 'acdc_email': 'new@acdc.com',
+                     'department': 'Design', 'start_date': '2024-01-01'},
+            'content_type': 'application/json',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(body['full_name'], 'New Person')
+
+
+class DatabasePoolStatsTests(TestCase):
+    """
+    GET /api/db/pool/ is for superusers and reports no pools unless DB_POOL is on.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_requires_superuser(self):
+        self.assertEqual(self.client.get('/api/db/pool/').status_code, 401)
+        self.client.force_authenticate(User.objects.create_user('hr', 'hr@acdcco.org', 'HrPass123!'))
+        self.assertEqual(self.client.get('/api/db/pool/').status_code, 403)
+
+    def test_reports_pools(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@acdcco.org', 'AdminPass123!'))
+        response = self.client.get('/api/db/pool/')
+        self.assertEqual(response.status_code, 200)
+        pooled = bool(connection.settings_dict['OPTIONS'].get('pool'))
+        self.assertEqual(response.json()['pooled'], pooled)
+        if pooled:
+            pool = response.json()['pools'][0]
+            self.assertEqual(pool['alias'], 'default')
+            self.assertEqual(pool['in_use'] + pool['idle'], pool['size'])
+
+@skipUnless(
+    'replica' in settings.DATABASES and not settings.DATABASES['replica'].get('TEST', {}).get('MIRROR'),
+    'needs a separate "replica" database (see the sqlite example in company_portal/settings.py)',
+)
+@override_settings(PEOPLE_REPLICA_READS=True)
+class ReadReplicaRoutingTests(PeopleAPITestCase):
+    """
+    Employee reads come from the replica, writes go to the primary, and a
+    writer keeps reading the primary for a while.
+    """
+    databases = {'default', 'replica'} & set(settings.DATABASES)    # the runner checks aliases before skipping
+
+    def setUp(self):
+        super().setUp()
+        self.other_admin = User.objects.create_superuser('admin2', 'admin2@acdcco.org', 'AdminPass123!')
+        self.other_client = APIClient()
+        self.other_client.force_authenticate(self.other_admin)
+
+        Person.objects.create(full_name='Primary Person', acdc_email='primary@acdc.com',
+                              department='Design', start_date=datetime.date(2024, 1, 1))
+        # A lagging replica: it has a row the primary no longer has, and none of the primary's
+        self.replica_person = Person(full_name='Replica Person', acdc_email='replica@acdc.com',
+                                     department='Design', start_date=datetime.date(2024, 1, 1))
+        Person.objects.using('replica').bulk_create([self.replica_person])
+
+    def names(self, client, path='/api/employees/'):
+        response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return sorted(person['full_name'] for person in response.json()['results'])
+
+    def test_reads_use_replica(self):
+        self.assertEqual(self.names(self.client), ['Replica Person'])
+        self.assertEqual(self.names(self.client, '/api/employees/filter_employees/?department=Design'),
+                         ['Replica Person'])
+        response = self.client.get(f'/api/employees/{self.replica_person.pk}/')
+        self.assertEqual(response.json()['full_name'], 'Replica Person')
+
+        # Users exist only on the primary
+        self.assertEqual(self.client.get('/api/users/').json()['results'], [])
+
+    def test_writer_reads_primary_until_window_ends(self):
+        response = self.client.post('/api/employees/', {
+            'full_name': 'New Person', 'acdc_email': 'new@acdc.com',
+            'department': 'Design', 'start_date': '2024-01-01',
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(Person.objects.using('default').filter(acdc_email='new@acdc.com').exists())
+        self.assertFalse(Person.objects.using('replica').filter(acdc_email='new@acdc.com').exists())
+
+        # The writer sees their change; everyone else still reads the replica
+        self.assertEqual(self.names(self.client), ['New Person', 'Primary Person'])
+        self.assertEqual(self.names(self.other_client), ['Replica Person'])
+
+        caches['people'].delete(sticky_key(self.admin))        # window over
+        self.assertEqual(self.names(self.client), ['Replica Person'])
+
+    @override_settings(PEOPLE_REPLICA_STICKY_SECONDS=0)
+    def test_stickiness_can_be_disabled(self):
+        response = self.client.patch('/api/employees/update_by_identifier/?email=primary@acdc.com',
+                                     {'department': 'Engineering'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.names(self.client), ['Replica Person'])
+
+    async def test_async_reads_use_replica(self):
+        refresh = await sync_to_async(RefreshToken.for_user)(self.admin)
+        token = add_role_claims(refresh, self.admin, None).access_token
+        request = AsyncRequestFactory().get('/api/employees/', headers={'Authorization': f'Bearer {token}'})
+        response = await async_read_view(alist, None)(request)
+        self.assertEqual([person['full_name'] for person in json.loads(response.content)['results']],
+                         ['Replica Person'])
+
+    def test_indexes_load_from_primary(self):
+        index = PrefixIndex()
+        token = replica_reads.set(True)
+        try:
+            index.refresh()
+        finally:
+            release_replica(token)
+            PEOPLE_INDEXES.remove(index)
+        self.assertEqual([person['full_name'] for person in index.people.values()], ['Primary Person'])
+
+    def test_per_process_cache_fails_checks(self):
+        locmem = {**settings.CACHES['people'], 'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+        filebased = {**locmem, 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+                     'LOCATION': '/tmp/acdc_people_check'}
+
+        with override_settings(CACHES={**settings.CACHES, 'people': locmem}):
+            self.assertEqual([error.id for error in check_sticky_cache()], ['people.E001'])
+            with self.assertRaisesMessage(SystemCheckError, 'people.E001'):
+                call_command('check')
+            with override_settings(PEOPLE_REPLICA_STICKY_SECONDS=0):
+                self.assertEqual(check_sticky_cache(), [])
+        with override_settings(CACHES={**settings.CACHES, 'people': filebased}):
+            self.assertEqual(check_sticky_cache(), [])
+
+
+class RosterSeedingTests(TestCase):
+    """
+    Seeded rosters (benchmarks) are valid, deterministic and keep the summary in step.
+    """
+
+    def test_seeded_people_are_valid_and_deterministic(self):
+        people = build_people(200, seed=7, first_index=100)
+        for person in people:
+            person.full_clean()
+        self.assertEqual([person.acdc_email for person in people][:2],
+                         ['person100@bench.acdc.com', 'person101@bench.acdc.com'])
+
+        # Person number i does not depend on how the range was cut
+        start = SEED_BLOCK_ROWS - 50
+        whole = list(generate_rows(100, seed=7, first_index=start))
+        self.assertEqual(whole, list(generate_rows(50, seed=7, first_index=start))
+                         + list(generate_rows(50, seed=7, first_index=SEED_BLOCK_ROWS)))
+        self.assertNotEqual(whole, list(generate_rows(100, seed=8, first_index=start)))
+
+    def test_seeded_distributions(self):
+        rows = [dict(zip(SEED_COLUMNS, row)) for row in generate_rows(5000, seed=1)]
+        statuses = Counter(row['status'] for row in rows)
+        self.assertGreater(statuses['active'], statuses['inactive'] + statuses['on_leave'])
+        self.assertEqual(Counter(row['department'] for row in rows).most_common(1)[0][0], 'Engineering')
+        for row in rows:
+            self.assertIn(row['subteam'], SUBTEAMS[row['department']] + (None,))
+            self.assertTrue(0 <= row['time_commitment'] <= 80)
+            self.assertEqual(row['end_date'] is not None, row['status'] == 'inactive')
+            if row['end_date']:
+                self.assertLessEqual(row['start_date'], row['end_date'])
+
+    def test_seed_people_and_role_users(self):
+        indexes = sorted(secondary_indexes())
+        seed_people(30, batch_size=7)
+        seed_people(5, first_index=30, method='bulk_create')
+        seed_people(40, first_index=35, defer_indexes=True)
+        self.assertEqual(Person.objects.count(), 75)
+        self.assertEqual(compare_headcount_summary(), [])
+        self.assertEqual(sorted(secondary_indexes()), indexes)        # rebuilt after the deferred load
+        self.assertEqual(Person.objects.get(acdc_email='person74@bench.acdc.com').personal_email,
+                         'person74@example.com')
+
+        users = seed_role_users('BenchPass123!')
+        self.assertEqual({username: get_user_role(user) for username, user in users.items()}, {
+            'bench_readonly': 'HR_ReadOnly', 'bench_readwrite': 'HR_ReadWrite',
+            'bench_fullaccess': 'HR_FullAccess', 'bench_admin': 'Superuser',
+        })
+        self.assertTrue(users['bench_admin'].is_superuser)
+        seed_role_users('OtherPass123!')                        # idempotent, resets passwords
+        self.assertEqual(User.objects.filter(username__startswith='bench_').count(), 4)
+        self.assertTrue(User.objects.get(username='bench_readonly').check_password('OtherPass123!'))
+
+
+class RequestMetricsTests(PeopleAPITestCase):
+    """
+    Every request lands in the per-route histograms, served to superusers at /api/metrics/.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(None)      # each test picks its caller
+        registry.reset()
+        Person.objects.create(full_name='Ada Lovelace', acdc_email='ada@acdc.com', department='Engineering',
+                              start_date=datetime.date(2024, 1, 1))
+
+    def series(self, route, action, status, method='GET'):
+        """[(bucket counts, sum)] per histogram of one label set"""
+        return registry.snapshot()[(route, method, action, status)]
+
+    def test_requires_superuser(self):
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 401)
+        self.client.force_authenticate(User.objects.create_user('hr', 'hr@acdcco.org', 'HrPass123!'))
+        self.assertEqual(self.client.get('/api/metrics/').status_code, 403)
+
+    @override_settings(PEOPLE_METRICS_TOKEN='scrape-secret')
+    def test_scrape_token(self):
+        for authorization, expected in [('Metrics scrape-secret', 200), ('Metrics wrong', 401),
+                                        ('Bearer scrape-secret', 401)]:
+            response = self.client.get('/api/metrics/', headers={'Authorization': authorization})
+            self.assertEqual(response.status_code, expected, authorization)
+
+        with self.settings(PEOPLE_METRICS_TOKEN=''):
+            response = self.client.get('/api/metrics/', headers={'Authorization': 'Metrics '})
+            self.assertEqual(response.status_code, 401)
+
+    def test_records_latency_queries_and_size_per_action(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/employees/')
+        self.assertEqual(response.status_code, 200)
+        self.client.get('/api/employees/')
+
+        latency, queries, query_time, size = self.series('person-list', 'list', 200)
+        self.assertEqual(sum(latency[0]), 2)
+        self.assertGreater(latency[1], 0)
+        self.assertEqual(sum(queries[0]), 2)
+        self.assertGreaterEqual(queries[1], 2)
+        self.assertGreater(query_time[1], 0)
+        self.assertEqual(size[1], 2 * len(response.content))
+
+        response = self.client.patch('/api/employees/update_by_identifier/?email=ada@acdc.com',
+                                     {'time_commitment': 10}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(self.series('person-update-by-identifier', 'update_by_identifier', 200,
+                                       method='PATCH')[1][1], 0)
+
+    def test_unresolved_paths_share_one_route(self):
+        self.client.get('/no/such/page/')
+        self.client.get('/another/missing/page/')
+        self.assertEqual(list(registry.snapshot()), [('unmatched', 'GET', '', 404)])
+        self.assertEqual(sum(self.series('unmatched', '', 404)[0][0]), 2)
+
+    def test_prometheus_text(self):
+        self.client.force_authenticate(self.admin)
+        self.client.get('/api/employees/')
+        response = self.client.get('/api/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+
+        text = response.content.decode()
+        self.assertIn('# TYPE acdc_http_request_duration_seconds histogram', text)
+        labels = 'route="person-list",method="GET",action="list",status="200"'
+        self.assertIn(f'acdc_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1', text)
+        self.assertIn(f'acdc_http_request_queries_count{{{labels}}} 1', text)
+        self.assertIn(f'acdc_http_response_size_bytes_count{{{labels}}} 1', text)
+        # Buckets are cumulative
+        buckets = [int(line.rsplit(' ', 1)[1]) for line in text.splitlines()
+                   if line.startswith(f'acdc_http_request_queries_bucket{{{labels}')]
+        self.assertEqual(buckets, sorted(buckets))
+
+    async def test_asgi_requests(self):
+        token = (await sync_to_async(RefreshToken.for_user)(self.admin)).access_token
+        response = await AsyncClient().get('/api/employees/', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 200)
+        latency, queries, _, size = await sync_to_async(self.series)('person-list', 'list', 200)
+        self.assertEqual(sum(latency[0]), 1)
+        self.assertGreaterEqual(queries[1], 2)          # counted in the sync_to_async thread
+        self.assertEqual(size[1], len(response.content))
+
+    def test_streaming_responses_have_no_size(self):
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/employees/export/')
+        self.assertEqual(response.status_code, 200)
+        size = self.series('person-export', 'export', 200)[3]
+        self.assertEqual(sum(size[0]), 0)
+
+
+class RosterImportTests(PeopleAPITestCase):
+    """
+    CSV/XLSX imports upsert valid rows chunk by chunk and report the rejected ones.
+    """
+
+    HEADER = 'Full Name,acdc_email,Department,start_date,time_commitment,id\n'
+
+    def setUp(self):
+        super().setUp()
+        self.users = seed_role_users('BenchPass123!')
+
+    def roster(self, *lines):
+        return io.BytesIO(('﻿' + self.HEADER + ''.join(line + '\n' for line in lines)).encode())
+
+    def test_csv_import_reports_rejected_rows(self):
+        Person.objects.create(full_name='Old Name', acdc_email='ada@acdc.com', department='Sales',
+                              start_date='2020-01-01')
+        report = io.StringIO()
+        token = history_actor.set('importer')
+        try:
+            summary = import_people(self.roster(
+                'Ada Lovelace,ada@acdc.com,Engineering,2024-01-01,40,17',
+                '',                                                     # blank lines are skipped
+                'Grace Hopper,grace@acdc.com,Engineering,2024-02-01,,',
+                'Grace Again,grace@acdc.com,Design,2024-03-01,20,',      # duplicate within the chunk
+                'No Start,nostart@acdc.com,Design,,20,',
+                'Too Busy,busy@acdc.com,Design,2024-03-01,99,',
+            ), 'csv', report=report, chunk_size=3)
+        finally:
+            history_actor.reset(token)
+
+        self.assertEqual({key: summary[key] for key in ('rows', 'created', 'updated', 'rejected')},
+                         {'rows': 5, 'created': 1, 'updated': 1, 'rejected': 3})
+        self.assertEqual(summary['ignored_columns'], ['id'])
+        self.assertEqual([error['line'] for error in summary['errors']], [5, 6, 7])
+        self.assertEqual(Person.objects.get(acdc_email='ada@acdc.com').department, 'Engineering')
+        self.assertEqual(Person.objects.filter(acdc_email='grace@acdc.com').count(), 1)
+        self.assertTrue(PersonChange.objects.filter(changed_by='importer').exists())
+
+        rows = list(csv.reader(io.StringIO(report.getvalue())))
+        self.assertEqual(rows[0], ['line', 'errors', 'Full Name', 'acdc_email', 'Department', 'start_date',
+                                   'time_commitment', 'id'])
+        self.assertEqual([row[0] for row in rows[1:]], ['5', '6', '7'])
+        self.assertIn('acdc_email:', rows[1][1])
+        self.assertIn('start_date:', rows[2][1])
+        self.assertEqual(rows[2][2:], ['No Start', 'nostart@acdc.com', 'Design', '', '20', ''])
+        self.assertIn('time_commitment:', rows[3][1])
+
+    def test_partial_sheet_keeps_other_columns(self):
+        Person.objects.create(
+            full_name='Ada Lovelace', acdc_email='ada@acdc.com', personal_email='ada@example.com',
+            phone='555-0100', department='Sales', subteam='EMEA', time_commitment=20, start_date='2020-01-01',
+        )
+        summary = import_people(io.BytesIO(
+            b'full_name,acdc_email,department,start_date\nAda King,ada@acdc.com,Sales,2020-01-01\n'
+        ), 'csv')
+
+        self.assertEqual((summary['created'], summary['updated']), (0, 1))
+        ada = Person.objects.get(acdc_email='ada@acdc.com')
+        self.assertEqual(ada.full_name, 'Ada King')
+        self.assertEqual((ada.personal_email, ada.phone, ada.subteam, ada.time_commitment),
+                         ('ada@example.com', '555-0100', 'EMEA', 20))
+
+    def test_bad_files_are_rejected(self):
+        with self.assertRaisesMessage(ValueError, 'empty'):
+            import_people(io.BytesIO(b''), 'csv')
+        with self.assertRaisesMessage(ValueError, 'No Person columns'):
+            import_people(io.BytesIO(b'a,b\n1,2\n'), 'csv')
+        with self.assertRaisesMessage(ValueError, 'Unsupported format'):
+            import_people(io.BytesIO(b''), 'ods')
+
+    def test_upload_endpoint(self):
+        self.client.force_authenticate(self.users['bench_readonly'])
+        response = self.client.post('/api/employees/import/', {'file': self.roster()}, format='multipart')
+        self.assertEqual(response.status_code, 403)
+
+        self.client.force_authenticate(self.users['bench_readwrite'])
+        upload = self.roster('Ada Lovelace,ada@acdc.com,Engineering,2024-01-01,40,',
+                             'No Start,nostart@acdc.com,Design,,20,')
+        upload.name = 'roster.csv'
+        response = self.client.post('/api/employees/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(response.data['errors'][0]['line'], 3)
+        self.assertEqual(response.data['saved_by'], 'bench_readwrite')
+        self.assertTrue(Person.objects.filter(acdc_email='ada@acdc.com').exists())
+
+        upload = self.roster('No Start,nostart@acdc.com,Design,,20,')
+        upload.name = 'roster.txt'
+        response = self.client.post('/api/employees/import/?report=csv',
+                                    {'file': upload, 'file_format': 'csv'}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertTrue(response.content.decode().startswith('line,errors,Full Name'))
+
+        upload.seek(0)
+        response = self.client.post('/api/employees/import/', {'file': upload}, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unsupported format', response.data['error'])
+
+    def test_import_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'roster.csv')
+            with open(path, 'wb') as file:
+                file.write(self.roster('Ada Lovelace,ada@acdc.com,Engineering,2024-01-01,40,',
+                                       'No Start,nostart@acdc.com,Design,,20,').getvalue())
+            call_command('import_people', path, stdout=open(os.devnull, 'w'))
+            self.assertTrue(Person.objects.filter(acdc_email='ada@acdc.com').exists())
+            with open(f'{path}.errors.csv') as report:
+                self.assertEqual(len(report.readlines()), 2)
+
+    @skipUnless(find_spec('openpyxl'), 'openpyxl is not installed')
+    def test_xlsx_import(self):
+        import openpyxl
+
+        workbook = openpyxl.Workbook()
+        sheet = workbook.active
+        sheet.append(['full_name', 'acdc_email', 'department', 'start_date', 'time_commitment'])
+        sheet.append(['Ada Lovelace', 'ada@acdc.com', 'Engineering', datetime.datetime(2024, 1, 1), 40.0])
+        sheet.append([None, None, None, None, None])
+        sheet.append(['Grace Hopper', 'grace@acdc.com', 'Engineering', datetime.date(2024, 2, 1), None])
+        file = io.BytesIO()
+        workbook.save(file)
+        file.seek(0)
+
+        summary = import_people(file, 'xlsx')
+        self.assertEqual((summary['created'], summary['rejected']), (2, 0))
+        ada = Person.objects.get(acdc_email='ada@acdc.com')
+        self.assertEqual((ada.start_date, ada.time_commitment), (datetime.date(2024, 1, 1), 40))
+
+
+class CaseInsensitiveLookupTests(PeopleAPITestCase):
+    """
+    Identifier lookups ignore case and are served by the LOWER() indexes.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.person = Person.objects.create(
+            full_name='Ada Lovelace', acdc_email='Ada@ACDC.com', personal_email='ada@example.com',
+            department='Engineering', start_date=datetime.date(2024, 1, 1),
+        )
+
+    def plan(self, queryset):
+        if connection.vendor == 'postgresql':
+            # A handful of rows is cheaper to scan - ask whether the index can be used
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+        return queryset.explain()
+
+    def test_lookups_use_lower_indexes(self):
+        for field, value, index in [
+            ('acdc_email', 'ada@acdc.COM', 'people_acdc_email_ci_idx'),
+            ('personal_email', 'ADA@example.com', 'people_personal_email_ci_idx'),
+            ('full_name', 'ada LOVELACE', 'people_full_name_ci_idx'),
+        ]:
+            queryset = Person.objects.matching(**{field: value})
+            self.assertEqual(list(queryset), [self.person])
+            self.assertIn(index, self.plan(queryset))
+
+    def test_iexact_cannot_use_them(self):
+        self.assertNotIn('people_acdc_email_ci_idx', self.plan(Person.objects.filter(acdc_email__iexact='ada@acdc.com')))
+
+    def test_matching_rejects_unindexed_fields(self):
+        with self.assertRaises(ValueError):
+            Person.objects.matching(department='engineering')
+
+    def test_identifier_endpoints(self):
+        response = self.client.patch('/api/employees/update_by_identifier/?full_name=ADA lovelace',
+                                     {'subteam': 'Platform'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete('/api/employees/delete_by_identifier/?email=ada@acdc.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Person.objects.exists())
+
+
+class PersonArchiveTests(PeopleAPITestCase):
+    """
+    Departed people move to people_archive in batches, drop out of the default
+    reads, and stay reachable with ?include_archived=1 and restore.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.users = seed_role_users('BenchPass123!')
+        self.client.force_authenticate(self.users['bench_readonly'])
+
+        def person(name, **fields):
+            fields.setdefault('department', 'Engineering')
+            fields.setdefault('start_date', datetime.date(2015, 1, 1))
+            email = name.split()[0].lower()
+            return Person.objects.create(full_name=name, acdc_email=f'{email}@acdc.com', **fields)
+
+        self.boss = person('Bea Boss', status='inactive', end_date=datetime.date(2018, 1, 1))
+        self.managed = person('Mo Managed', manager=self.boss)
+        self.gone = [
+            person('Al Gone', status='inactive', end_date=datetime.date(2018, 1, 1), manager=self.boss),
+            person('Cy Gone', status='inactive'),
+            person('Di Gone', end_date=datetime.date(2019, 6, 30), personal_email='di@example.com'),
+        ]
+        self.recent = person('Ed Recent', status='inactive', end_date=timezone.now().date())
+        self.active = person('Zoe Active')
+        long_ago = timezone.now() - datetime.timedelta(days=800)
+        Person.objects.exclude(pk=self.recent.pk).update(updated_at=long_ago)
+
+    def archive(self, **kwargs):
+        token = history_actor.set('archiver')
+        try:
+            return archive_people(actor='archiver', **kwargs)
+        finally:
+            history_actor.reset(token)
+
+    def test_archive_pass(self):
+        self.assertEqual(self.archive(batch_size=1, max_batches=2), 2)
+        self.assertEqual(self.archive(batch_size=1), 1)
+        self.assertEqual(self.archive(), 0)
+
+        gone_ids = {person.pk for person in self.gone}
+        self.assertEqual(set(ArchivedPerson.objects.values_list('id', flat=True)), gone_ids)
+        # Still managing someone, departed recently, or not departed
+        self.assertEqual(set(Person.objects.values_list('full_name', flat=True)),
+                         {'Bea Boss', 'Mo Managed', 'Ed Recent', 'Zoe Active'})
+        archived = ArchivedPerson.objects.get(pk=self.gone[0].pk)
+        self.assertEqual((archived.manager, archived.archived_by), (self.boss.pk, 'archiver'))
+        self.assertEqual(archived.created_at, self.gone[0].created_at)
+        deletions = PersonChange.objects.filter(action='delete', changed_by='archiver')
+        self.assertEqual(set(deletions.values_list('person_id', flat=True)), gone_ids)
+        self.assertEqual(compare_headcount_summary(), [])
+
+        # Once their report is gone too, the manager is archived
+        self.managed.manager = None
+        self.managed.save()
+        Person.objects.filter(pk=self.boss.pk).update(updated_at=archived.updated_at)
+        self.assertEqual(self.archive(), 1)
+
+    def test_search_indexes_drop_archived_people(self):
+        self.assertEqual(len(autocomplete_people('gone')), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.archive()
+        self.assertEqual(autocomplete_people('gone'), [])
+
+    def test_reads_include_archived_only_when_asked(self):
+        self.archive()
+
+        names = lambda response: [person['full_name'] for person in response.data['results']]
+        self.assertEqual(names(self.client.get('/api/employees/')),
+                         ['Bea Boss', 'Ed Recent', 'Mo Managed', 'Zoe Active'])
+        response = self.client.get('/api/employees/?include_archived=1')
+        self.assertEqual(names(response), ['Al Gone', 'Bea Boss', 'Cy Gone', 'Di Gone', 'Ed Recent',
+                                           'Mo Managed', 'Zoe Active'])
+        archived_at = {person['full_name']: person['archived_at'] for person in response.data['results']}
+        self.assertIsNone(archived_at['Bea Boss'])
+        self.assertIsNotNone(archived_at['Al Gone'])
+
+        # Pages merge both tables in order, both ways
+        url, seen = '/api/employees/?include_archived=1&page_size=2&ordering=-full_name', []
+        while url:
+            response = self.client.get(url)
+            seen += names(response)
+            url = response.data['next']
+        self.assertEqual(seen, ['Zoe Active', 'Mo Managed', 'Ed Recent', 'Di Gone', 'Cy Gone', 'Bea Boss',
+                                'Al Gone'])
+        self.assertEqual(names(self.client.get(response.data['previous'])), ['Cy Gone', 'Bea Boss'])
+
+        response = self.client.get('/api/employees/filter_employees/?status=inactive&include_archived=1')
+        self.assertEqual(names(response), ['Al Gone', 'Bea Boss', 'Cy Gone', 'Ed Recent'])
+
+        pk = self.gone[2].pk
+        self.assertEqual(self.client.get(f'/api/employees/{pk}/').status_code, 404)
+        response = self.client.get(f'/api/employees/{pk}/?include_archived=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['acdc_email'], 'di@acdc.com')
+        self.assertIsNotNone(response.data['archived_at'])
+
+    def test_restore(self):
+        self.archive()
+        pk = self.gone[0].pk
+        self.assertEqual(self.client.post(f'/api/employees/{pk}/restore/').status_code, 403)
+
+        self.client.force_authenticate(self.users['bench_readwrite'])
+        response = self.client.post(f'/api/employees/{pk}/restore/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['person']['id'], pk)
+        person = Person.objects.get(pk=pk)
+        self.assertEqual((person.manager_id, person.created_at), (self.boss.pk, self.gone[0].created_at))
+        self.assertFalse(ArchivedPerson.objects.filter(pk=pk).exists())
+        self.assertTrue(PersonChange.objects.filter(person_id=pk, action='create',
+                                                    changed_by='bench_readwrite').exists())
+        self.assertEqual(self.archive(), 0)         # just updated - kept for another retention period
+
+        self.assertEqual(self.client.post(f'/api/employees/{pk}/restore/').status_code, 404)
+
+        Person.objects.create(full_name='New Di', acdc_email='new.di@acdc.com', personal_email='di@example.com',
+                              department='Design', start_date='2024-01-01')
+        response = self.client.post(f'/api/employees/{self.gone[2].pk}/restore/')
+        self.assertEqual(response.status_code, 409)
+        self.assertIn('di@example.com', response.data['error'])
+
+    def test_command_dry_run(self):
+        out = io.StringIO()
+        call_command('archive_people', '--dry-run', stdout=out)
+        self.assertIn('3 people', out.getvalue())
+        call_command('archive_people', '--days', '10000', stdout=io.StringIO())
+        self.assertFalse(ArchivedPerson.objects.exists())
+        call_command('archive_people', stdout=io.StringIO())
+        self.assertEqual(ArchivedPerson.objects.count(), 3)
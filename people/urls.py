@@ -1,7 +1,12 @@
+from django.conf import settings
 from django.urls import path, include
 from django.http import HttpResponse
 from rest_framework.routers import DefaultRouter
 from .views import PersonViewSet
+from .stream import person_event_stream
+from .async_views import async_read_urlpatterns
+from .pooling import database_pool_stats
+from .metrics import metrics_view
 
 def home_view(request):
     return HttpResponse("<h1>People App</h1><p><a href='/admin/'>Admin</a> | <a href='/api/employees/'>API</a></p>")
@@ -11,6 +16,17 @@ router.register(r'employees', PersonViewSet)
 
 urlpatterns = [
     path('', home_view, name='home'),  # This is the new line you're adding
+    # Before the router, which would read "stream" as an employee id
+    path('api/employees/stream/', person_event_stream, name='employee-stream'),
+    path('api/db/pool/', database_pool_stats, name='database-pool-stats'),
+    path('api/metrics/', metrics_view, name='metrics'),
+]
+
+# ASGI: async list/retrieve/filter_employees in front of the router (see people/async_views.py)
+if settings.PEOPLE_ASYNC_READS:
+    urlpatterns += async_read_urlpatterns(router)
+
+urlpatterns += [
     path('api/', include(router.urls)),
     path('api/', include('people.auth_urls')),
 ]
\ No newline at end of file
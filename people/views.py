@@ -1,14 +1,78 @@
+import tempfile
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.authentication import SessionAuthentication
 from rest_framework.permissions import IsAuthenticated
-from django.shortcuts import get_object_or_404
-from .models import Person
-from .serializers import PersonSerializer
+from rest_framework.renderers import JSONRenderer
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
+from django.http import HttpResponse, StreamingHttpResponse
+from .models import ArchivedPerson, Person, PersonChange
+from .serializers import PersonSerializer, PersonFastSerializer
+from .pagination import PersonCursorPagination, PersonHistoryCursorPagination
+from .exports import EXPORT_FORMATS, stream_export
+from .imports import detect_format, import_people
+from .archive import RestoreConflict, archived_rows, live_rows, restore_person
+from .search import search_people
+from .autocomplete import autocomplete_people
+from .headcount import headcount_stats
+from .hierarchy import build_org_chart, management_chain_queryset, reports_queryset
+from .history import (
+    history_actor, parse_as_of, people_as_of, person_as_of, representation_of_updated_at
+)
+from .sync import InvalidSyncToken, people_changes
+from .bulk import (
+    BULK_MAX_IDENTIFIERS,
+    BULK_MAX_ROWS,
+    bulk_delete_people,
+    bulk_update_people,
+    bulk_upsert,
+    resolve_identifiers,
+    validate_bulk_changes,
+)
 from .permissions import IsReadOnlyOrAbove, IsReadWriteOrAbove, IsFullAccessUser
+from .authentication import HRClaimsAuthentication
+from .cache import cached_response
+from .routers import ReplicaReadsMixin
+from .conditional import (
+    detail_validators,
+    list_validators,
+    not_modified_response,
+    set_validator_headers,
+)
+
+
+# Result limits for the search action
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 100
+
+# Result limits for the autocomplete action
+AUTOCOMPLETE_DEFAULT_LIMIT = 10
+AUTOCOMPLETE_MAX_LIMIT = 50
+
+# Levels below each top-level person shown by org_chart
+ORG_CHART_DEFAULT_DEPTH = 2
+ORG_CHART_MAX_DEPTH = 5
+
+# Deepest ?depth= accepted by reports
+REPORTS_MAX_DEPTH = 100
+
+# Changes per stream returned by one delta sync call
+SYNC_DEFAULT_LIMIT = 500
+SYNC_MAX_LIMIT = 5000
 
+# Read actions served from the read replica when one is configured (people/routers.py).
+# changes stays on the primary - replication lag could skip rows past a sync token -
+# and so does export, which streams its rows after the view has returned.
+REPLICA_ACTIONS = {
+    'list', 'retrieve', 'by_department', 'search', 'autocomplete', 'stats',
+    'reports', 'chain', 'org_chart', 'history',
+}
 
-class PersonViewSet(viewsets.ModelViewSet):
+
+class PersonViewSet(ReplicaReadsMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Person (Employee) records
     
@@ -29,11 +93,63 @@ class PersonViewSet(viewsets.ModelViewSet):
     
     Custom endpoints:
     - GET    /api/employees/filter_employees/      - Filter by department/status (READ)
+    - GET    /api/employees/export/                - Stream roster as CSV/NDJSON (READ)
+    - GET    /api/employees/search/?q=             - Fuzzy search by name/email (READ)
+    - GET    /api/employees/autocomplete/?prefix=  - Typeahead suggestions (READ)
+    - GET    /api/employees/stats/                 - Headcount/time commitment breakdowns (READ)
+    - GET    /api/employees/{id}/reports/          - Everyone under a person (READ)
+    - GET    /api/employees/{id}/chain/            - Management chain above a person (READ)
+    - GET    /api/employees/org_chart/             - Paged org chart tree (READ)
+    - GET    /api/employees/{id}/history/          - Field-level change history (READ)
+    - GET    /api/employees/changes/?since=        - Delta sync: changed rows + tombstones (READ)
+    - GET    /api/employees/stream/                - Server-Sent Events of changes (READ, async view
+                                                     in people/stream.py)
+    - POST   /api/employees/bulk/                  - Bulk create/upsert by acdc_email (WRITE)
+    - POST   /api/employees/import/                - Upload a CSV/XLSX roster, upsert by acdc_email (WRITE)
     - DELETE /api/employees/delete_by_identifier/  - Delete by email or name (DELETE)
     - PATCH  /api/employees/update_by_identifier/  - Update by email or name (WRITE)
+    - PATCH  /api/employees/bulk_update_by_identifier/  - Update many by emails/names (WRITE)
+    - DELETE /api/employees/bulk_delete_by_identifier/  - Delete many by emails/names (DELETE)
+    - POST   /api/employees/{id}/restore/          - Move an archived person back (WRITE)
+    
+    Authentication:
+    - JWTs issued by /api/token/ carry the HR role claim, so permission checks
+      run without database queries (see people/authentication.py)
+    
+    Pagination:
+    - list and filter_employees are cursor-paginated (see people/pagination.py)
+    - ?ordering=<field> sorts by a whitelisted key, ?cursor=<token> follows next/previous links
+    
+    Read path:
+    - list, filter_employees and export serialize with PersonFastSerializer
+      (values() rows + precompiled converters, same output as PersonSerializer)
+    - list, filter_employees and retrieve send ETag/Last-Modified and answer
+      conditional requests with 304 (see people/conditional.py)
+    - responses of those three actions are cached per role and query, and
+      invalidated by a global people version on every write (see people/cache.py)
+    
+    History:
+    - every write is recorded as a field-level diff, attributed to the caller
+      (see people/history.py)
+    - list and retrieve accept ?as_of=<ISO date/time> to read past state,
+      rebuilt from the latest snapshot plus the changes after it
+    
+    Archive:
+    - departed people are moved to people_archive by archive passes and are
+      not part of any endpoint's data (see people/archive.py)
+    - list, filter_employees and retrieve include them with ?include_archived=1,
+      marked with "archived_at"
+    
+    Read replica:
+    - with a "replica" database configured, REPLICA_ACTIONS read from it and
+      writes go to the primary; a writer reads from the primary for
+      PEOPLE_REPLICA_STICKY_SECONDS afterwards (see people/routers.py)
     """
     queryset = Person.objects.all()
     serializer_class = PersonSerializer
+    pagination_class = PersonCursorPagination
+    authentication_classes = [HRClaimsAuthentication, SessionAuthentication]
+    replica_actions = REPLICA_ACTIONS
     
     # Default permission (fallback)
     permission_classes = [IsAuthenticated]
@@ -46,22 +162,25 @@ class PersonViewSet(viewsets.ModelViewSet):
         classes should be used based on the action being performed.
         
         Permission Mapping:
-        - list, retrieve, filter_employees → IsReadOnlyOrAbove (any HR role)
-        - create → IsReadWriteOrAbove (ReadWrite and FullAccess only)
-        - update, partial_update, update_by_identifier → IsReadWriteOrAbove
-        - destroy, delete_by_identifier → IsFullAccessUser (FullAccess only)
+        - list, retrieve, filter_employees, export, search, autocomplete, stats,
+          reports, chain, org_chart, history, changes → IsReadOnlyOrAbove (any HR role)
+        - create, bulk, import_roster, restore → IsReadWriteOrAbove (ReadWrite and FullAccess only)
+        - update, partial_update, update_by_identifier, bulk_update_by_identifier → IsReadWriteOrAbove
+        - destroy, delete_by_identifier, bulk_delete_by_identifier → IsFullAccessUser (FullAccess only)
         """
         
         # READ operations - Any HR role can view
-        if self.action in ['list', 'retrieve', 'by_department']:
+        if self.action in ['list', 'retrieve', 'by_department', 'export', 'search', 'autocomplete', 'stats',
+                           'reports', 'chain', 'org_chart', 'history', 'changes']:
             permission_classes = [IsReadOnlyOrAbove]
         
         # WRITE operations - ReadWrite and FullAccess can create/update
-        elif self.action in ['create', 'update', 'partial_update', 'update_by_identifier']:
+        elif self.action in ['create', 'bulk', 'import_roster', 'restore', 'update', 'partial_update',
+                             'update_by_identifier', 'bulk_update_by_identifier']:
             permission_classes = [IsReadWriteOrAbove]
         
         # DELETE operations - Only FullAccess can delete
-        elif self.action in ['destroy', 'delete_by_identifier']:
+        elif self.action in ['destroy', 'delete_by_identifier', 'bulk_delete_by_identifier']:
             permission_classes = [IsFullAccessUser]
         
         # Default fallback - require authentication
@@ -70,6 +189,280 @@ class PersonViewSet(viewsets.ModelViewSet):
         
         return [permission() for permission in permission_classes]
     
+    def initial(self, request, *args, **kwargs):
+        """Attribute history rows written during this request to the caller"""
+        super().initial(request, *args, **kwargs)
+        self._history_actor_token = history_actor.set(request.user.get_username() or None)
+    
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_history_actor_token', None)
+        if token is not None:
+            history_actor.reset(token)
+            self._history_actor_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+    
+    def get_identifier_lists(self, request):
+        """
+        Read the "emails" and "full_names" lists from a bulk identifier request body.
+        
+        Returns:
+            (emails, full_names, error_response) - error_response is None when valid
+        """
+        emails = request.data.get('emails') or []
+        full_names = request.data.get('full_names') or []
+        
+        for name, values in (('emails', emails), ('full_names', full_names)):
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                return None, None, Response(
+                    {"error": f"'{name}' must be a list of strings"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        if not emails and not full_names:
+            return None, None, Response(
+                {"error": "Provide at least one identifier in 'emails' or 'full_names'"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(emails) + len(full_names) > BULK_MAX_IDENTIFIERS:
+            return None, None, Response(
+                {"error": f"Too many identifiers. Send at most {BULK_MAX_IDENTIFIERS} per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return emails, full_names, None
+    
+    def bulk_identifier_status(self, results, applied):
+        """
+        Pick the response code for a bulk identifier request:
+        200 all applied, 207 partly applied, otherwise 409/400/404 like the single-person actions
+        """
+        outcomes = {result["status"] for result in results}
+        
+        if outcomes == {"matched"}:
+            return status.HTTP_200_OK
+        if applied:
+            return status.HTTP_207_MULTI_STATUS
+        if "ambiguous" in outcomes:
+            return status.HTTP_409_CONFLICT
+        if "invalid" in outcomes:
+            return status.HTTP_400_BAD_REQUEST
+        return status.HTTP_404_NOT_FOUND
+    
+    def perform_content_negotiation(self, request, force=False):
+        """
+        On the export action ?format= picks the file type (csv/ndjson), not a
+        DRF renderer. Skip negotiation there so error responses stay JSON.
+        """
+        if self.action == 'export':
+            renderer = JSONRenderer()
+            return (renderer, renderer.media_type)
+        return super().perform_content_negotiation(request, force)
+    
+    def include_archived(self):
+        """?include_archived=1 - archived people (people/archive.py) are only read when asked for"""
+        return self.request.query_params.get('include_archived') in ('1', 'true')
+    
+    def fast_page_response(self, queryset, archived=None):
+        """
+        Paginate a Person queryset as values() rows and serialize them with
+        PersonFastSerializer - no model instances or DRF field objects per row.
+        
+        With an ArchivedPerson queryset (archived), pages merge both tables and
+        every row gets "archived_at" (null for people in the people table).
+        """
+        serializer = PersonFastSerializer()
+        if archived is None:
+            page = self.paginate_queryset(queryset.values(*serializer.columns))
+        else:
+            page = self.paginator.paginate_querysets(
+                [live_rows(queryset, serializer.columns), archived_rows(archived, serializer.columns)],
+                self.request
+            )
+        serializer.instance, serializer.many = page, True
+        data = serializer.data
+        if archived is not None:
+            self.add_archived_at(data, page)
+        return self.get_paginated_response(data)
+    
+    def add_archived_at(self, people, rows):
+        """Copy archived_at from values() rows into their representations"""
+        convert = representation_of_updated_at()
+        for person, row in zip(people, rows):
+            person["archived_at"] = None if row["archived_at"] is None else convert(row["archived_at"])
+    
+    def conditional_list_response(self, queryset, archived=None):
+        """
+        Serve a list page, or 304 if the client's If-None-Match still matches.
+        
+        The validators cost one MAX(updated_at)/COUNT query; nothing is
+        fetched or serialized for a 304. They cover archived people too: rows
+        only enter or leave the archive by leaving or entering the people table.
+        """
+        etag, last_modified = list_validators(self.request, queryset)
+        
+        not_modified = not_modified_response(self.request, etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = self.fast_page_response(queryset, archived)
+        return set_validator_headers(response, etag, last_modified)
+    
+    def get_as_of(self):
+        """
+        Parse ?as_of=. Returns (None, None) when absent, (datetime, None) when
+        valid, or (None, 400 response) when it is not an ISO date/time.
+        """
+        raw = self.request.query_params.get('as_of')
+        if not raw:
+            return None, None
+        as_of = parse_as_of(raw)
+        if as_of is None:
+            return None, Response(
+                {"error": "as_of must be an ISO 8601 date or date/time"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return as_of, None
+    
+    def as_of_list_response(self, as_of):
+        """Everyone who existed at as_of (optionally ?department= / ?status=), by name"""
+        department = self.request.query_params.get('department')
+        status_filter = self.request.query_params.get('status')
+        
+        people = [
+            person for person in people_as_of(as_of).values()
+            if (not department or person.get('department') == department)
+            and (not status_filter or person.get('status') == status_filter)
+        ]
+        people.sort(key=lambda person: (person.get('full_name') or '', person['id']))
+        
+        return Response({
+            "as_of": as_of.isoformat(),
+            "count": len(people),
+            "results": people
+        }, status=status.HTTP_200_OK)
+    
+    def list(self, request, *args, **kwargs):
+        """
+        List employees (cursor-paginated, fast read serializer, conditional GET)
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        
+        ?as_of=<ISO date/time> returns the roster as it was then instead
+        (unpaginated, sorted by name, ?department= / ?status= still apply).
+        
+        ?include_archived=1 adds archived people (see people/archive.py).
+        """
+        as_of, error = self.get_as_of()
+        if error is not None:
+            return error
+        if as_of is not None:
+            return cached_response(self, request, lambda: self.as_of_list_response(as_of))
+        
+        archived = ArchivedPerson.objects.all() if self.include_archived() else None
+        return cached_response(
+            self, request,
+            lambda: self.conditional_list_response(self.filter_queryset(self.get_queryset()), archived)
+        )
+    
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Get one employee, or 304 if their updated_at matches the client's validators
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        
+        ?as_of=<ISO date/time> returns the employee as they were then
+        (404 if they did not exist at that time).
+        
+        ?include_archived=1 also finds archived people (with "archived_at").
+        """
+        as_of, error = self.get_as_of()
+        if error is not None:
+            return error
+        if as_of is not None:
+            return cached_response(self, request, lambda: self.as_of_retrieve_response(kwargs['pk'], as_of))
+        
+        if self.include_archived():
+            response = self.archived_retrieve_response(kwargs['pk'])
+            if response is not None:
+                return response
+        
+        return cached_response(
+            self, request,
+            lambda: self.conditional_retrieve_response(request, *args, **kwargs),
+            use_last_modified=True
+        )
+    
+    def as_of_retrieve_response(self, pk, as_of):
+        try:
+            person = person_as_of(int(pk), as_of)
+        except ValueError:
+            person = None
+        if person is None:
+            return Response(
+                {"error": f"Employee {pk} did not exist at {as_of.isoformat()}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(person, status=status.HTTP_200_OK)
+    
+    def archived_retrieve_response(self, pk):
+        """An archived person's representation with archived_at, or None if pk is not archived"""
+        serializer = PersonFastSerializer()
+        try:
+            row = archived_rows(ArchivedPerson.objects.filter(pk=pk), serializer.columns).first()
+        except ValueError:
+            row = None
+        if row is None:
+            return None
+        person = serializer.to_representation(row)
+        self.add_archived_at([person], [row])
+        return Response(person, status=status.HTTP_200_OK)
+    
+    def conditional_retrieve_response(self, request, *args, **kwargs):
+        """Serve one employee, or 304 if the client's validators still match"""
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        etag, last_modified = detail_validators(request, kwargs[lookup_url_kwarg])
+        
+        if etag is not None:
+            not_modified = not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+        
+        response = super().retrieve(request, *args, **kwargs)
+        return set_validator_headers(response, etag, last_modified)
+    
+    def get_bounded_int_param(self, name, default, maximum):
+        """
+        Read an integer query param in 1..maximum.
+        
+        Returns (value, None), or (None, 400 response) when it is not a number in range.
+        """
+        try:
+            value = int(self.request.query_params.get(name, default))
+        except ValueError:
+            value = 0
+        if not 1 <= value <= maximum:
+            return None, Response(
+                {"error": f"{name} must be between 1 and {maximum}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return value, None
+    
+    def filter_by_params(self, queryset):
+        """
+        Apply the ?department= and ?status= filters shared by filter_employees and export
+        """
+        department = self.request.query_params.get('department')
+        status_filter = self.request.query_params.get('status')
+        
+        if department:
+            queryset = queryset.filter(department=department)
+        
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
+        
+        return queryset
+    
     @action(detail=False, methods=['get'], url_path='filter_employees')
     def by_department(self, request):
         """
@@ -82,6 +475,11 @@ class PersonViewSet(viewsets.ModelViewSet):
         GET /api/employees/filter_employees/?department=Engineering
         GET /api/employees/filter_employees/?status=active
         GET /api/employees/filter_employees/?department=Engineering&status=active
+        GET /api/employees/filter_employees/?status=active&ordering=-start_date
+        
+        Results are cursor-paginated the same way as the list endpoint and
+        support If-None-Match (304 Not Modified). ?include_archived=1 adds
+        archived people.
         
         Headers:
             Authorization: Bearer <access_token>
@@ -95,16 +493,6 @@ class PersonViewSet(viewsets.ModelViewSet):
         department = request.query_params.get('department')
         status_filter = request.query_params.get('status')
         
-        # Start with all people
-        employees = Person.objects.all()
-        
-        # Apply filters if provided
-        if department:
-            employees = employees.filter(department=department)
-        
-        if status_filter:
-            employees = employees.filter(status=status_filter)
-        
         # If no filters provided, return error
         if not department and not status_filter:
             return Response(
@@ -112,9 +500,655 @@ class PersonViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        serializer = self.get_serializer(employees, many=True)
-        return Response(serializer.data)
+        # Apply department/status filters
+        employees = self.filter_by_params(Person.objects.all())
+        archived = self.filter_by_params(ArchivedPerson.objects.all()) if self.include_archived() else None
+        
+        return cached_response(self, request, lambda: self.conditional_list_response(employees, archived))
+    
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream the roster as a CSV or NDJSON download
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Accepts the same department/status filters as filter_employees.
+        With no filters the whole roster is exported.
+        
+        Examples:
+        GET /api/employees/export/?format=csv
+        GET /api/employees/export/?format=ndjson&department=Engineering
+        GET /api/employees/export/?format=csv&department=Sales&status=active
+        
+        Rows are streamed from a database cursor in chunks, so memory use and
+        time-to-first-byte stay flat regardless of roster size.
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success (streamed file)
+            400 - Unsupported format
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+        """
+        export_format = request.query_params.get('format', 'csv').lower()
+        
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"Unsupported format '{export_format}'. Use one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        employees = self.filter_by_params(Person.objects.order_by('full_name', 'pk'))
+        
+        response = StreamingHttpResponse(
+            stream_export(employees, export_format),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        response['Content-Disposition'] = f'attachment; filename="employees.{export_format}"'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Fuzzy search people by full name, ACDC email or personal email
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Results are ranked by trigram similarity (best field wins), so typos
+        and partial names still match. Each result carries a "score" (0-1).
+        
+        Examples:
+        GET /api/employees/search/?q=jon smth
+        GET /api/employees/search/?q=priya@acdc&limit=5
+        
+        Query params:
+            q     - search text (required)
+            limit - maximum results, 1-100 (default 20)
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            400 - Missing q or invalid limit
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+        """
+        query = request.query_params.get('q', '').strip()
+        
+        if not query:
+            return Response(
+                {"error": "Please provide a search query: q"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        limit, error = self.get_bounded_int_param('limit', SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT)
+        if error is not None:
+            return error
+        
+        ranked = search_people(query, limit)
+        
+        # One query for the matched rows, then restore rank order
+        serializer = PersonFastSerializer()
+        rows = Person.objects.filter(pk__in=[person_id for person_id, _ in ranked]).values(*serializer.columns)
+        rows_by_id = {row['id']: row for row in rows}
+        
+        results = []
+        for person_id, score in ranked:
+            row = rows_by_id.get(person_id)
+            if row is None:
+                continue
+            person = serializer.to_representation(row)
+            person['score'] = round(score, 4)
+            results.append(person)
+        
+        return Response({
+            "query": query,
+            "count": len(results),
+            "results": results
+        }, status=status.HTTP_200_OK)
     
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Typeahead suggestions for people pickers
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Matches the start of the full name, of any later word of the name, or
+        of either email (case- and accent-insensitive). Full-name matches come
+        first, then later-word matches, then emails.
+        
+        Served from an in-memory prefix index - no database query per keystroke.
+        
+        Examples:
+        GET /api/employees/autocomplete/?prefix=jo
+        GET /api/employees/autocomplete/?prefix=smi&limit=5
+        GET /api/employees/autocomplete/?prefix=john.d
+        
+        Query params:
+            prefix - typed text (required)
+            limit  - maximum suggestions, 1-50 (default 10)
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            400 - Missing prefix or invalid limit
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+        """
+        prefix = request.query_params.get('prefix', '').strip()
+        
+        if not prefix:
+            return Response(
+                {"error": "Please provide a prefix"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        limit, error = self.get_bounded_int_param('limit', AUTOCOMPLETE_DEFAULT_LIMIT, AUTOCOMPLETE_MAX_LIMIT)
+        if error is not None:
+            return error
+        
+        results = autocomplete_people(prefix, limit)
+        
+        return Response({
+            "prefix": prefix,
+            "count": len(results),
+            "results": results
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def stats(self, request):
+        """
+        Headcount and summed time_commitment, in total and broken down by
+        department, subteam, status and position
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Served from the headcount summary table (one row per group, kept up to
+        date by every write - see people/headcount.py), so the cost does not
+        grow with the roster. Accepts the same department/status filters as
+        filter_employees.
+        
+        Examples:
+        GET /api/employees/stats/
+        GET /api/employees/stats/?department=Engineering
+        GET /api/employees/stats/?status=active
+        
+        Response:
+            {
+                "total": {"headcount": 42, "time_commitment": 610},
+                "by_department": [{"department": "Design", "headcount": 5, "time_commitment": 80}, ...],
+                "by_subteam": [...], "by_status": [...], "by_position": [...]
+            }
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+        """
+        filters = {
+            field: request.query_params[field]
+            for field in ('department', 'status')
+            if request.query_params.get(field)
+        }
+        
+        return cached_response(
+            self, request,
+            lambda: Response(headcount_stats(filters), status=status.HTTP_200_OK)
+        )
+    
+    @action(detail=True, methods=['get'])
+    def reports(self, request, pk=None):
+        """
+        Everyone who reports to this person, directly or indirectly
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        One indexed join on the hierarchy closure table, whatever the depth
+        (see people/hierarchy.py). Cursor-paginated like the list endpoint.
+        
+        Examples:
+        GET /api/employees/12/reports/              - whole subtree
+        GET /api/employees/12/reports/?depth=1      - direct reports only
+        GET /api/employees/12/reports/?ordering=department
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            400 - Invalid depth
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+            404 - Person not found
+        """
+        person = get_object_or_404(Person.objects.only('id'), pk=pk)
+        
+        max_depth = None
+        if request.query_params.get('depth'):
+            max_depth, error = self.get_bounded_int_param('depth', None, REPORTS_MAX_DEPTH)
+            if error is not None:
+                return error
+        
+        return self.fast_page_response(reports_queryset(person.pk, max_depth))
+    
+    @action(detail=True, methods=['get'])
+    def chain(self, request, pk=None):
+        """
+        Management chain above this person, nearest manager first
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Example:
+        GET /api/employees/42/chain/
+        
+        Response:
+            {
+                "id": 42,
+                "count": 2,
+                "chain": [
+                    {"id": 12, "full_name": "...", ..., "level": 1},   # direct manager
+                    {"id": 3, "full_name": "...", ..., "level": 2}
+                ]
+            }
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+            404 - Person not found
+        """
+        person = get_object_or_404(Person.objects.only('id'), pk=pk)
+        
+        serializer = PersonFastSerializer()
+        chain = []
+        for row in management_chain_queryset(person.pk).values(*serializer.columns, 'level'):
+            manager = serializer.to_representation(row)
+            manager['level'] = row['level']
+            chain.append(manager)
+        
+        return Response({
+            "id": person.pk,
+            "count": len(chain),
+            "chain": chain
+        }, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['get'])
+    def org_chart(self, request):
+        """
+        Org chart as a tree, paged over the top-level people
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Top level = people without a manager, or the direct reports of ?root=.
+        Each node carries its nested "reports" down to ?depth= levels in total
+        and "total_reports" (everyone below it, shown or not), so the UI can
+        expand deeper branches with ?root=<id>.
+        
+        Examples:
+        GET /api/employees/org_chart/
+        GET /api/employees/org_chart/?depth=3
+        GET /api/employees/org_chart/?root=12&depth=1&page_size=20
+        
+        Top-level people are cursor-paginated like the list endpoint; each page
+        costs three queries whatever the depth.
+        
+        Query params:
+            root  - person whose reports form the top level (default: people without a manager)
+            depth - levels per page, 1-5 (default 2)
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            400 - Invalid depth
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+            404 - Root person not found
+        """
+        depth, error = self.get_bounded_int_param('depth', ORG_CHART_DEFAULT_DEPTH, ORG_CHART_MAX_DEPTH)
+        if error is not None:
+            return error
+        
+        root = request.query_params.get('root')
+        if root:
+            root = get_object_or_404(Person.objects.only('id'), pk=root)
+            top_level = Person.objects.filter(manager_id=root.pk)
+        else:
+            top_level = Person.objects.filter(manager__isnull=True)
+        
+        serializer = PersonFastSerializer()
+        page = self.paginate_queryset(top_level.values(*serializer.columns))
+        nodes = [serializer.to_representation(row) for row in page]
+        
+        build_org_chart(nodes, depth, serializer.columns, serializer.to_representation)
+        return self.get_paginated_response(nodes)
+    
+    @action(detail=True, methods=['get'])
+    def history(self, request, pk=None):
+        """
+        Field-level change history of one person, newest first
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Works for deleted people too - the history outlives the record.
+        Cursor-paginated over the (person_id, changed_at) index.
+        
+        Example:
+        GET /api/employees/42/history/
+        
+        Response:
+            {
+                "next": "http://.../api/employees/42/history/?cursor=...",
+                "previous": null,
+                "results": [
+                    {
+                        "id": 981,
+                        "action": "update",
+                        "changed_at": "2025-03-01T09:30:00Z",
+                        "changed_by": "hr.admin",
+                        "changes": {"status": ["Active", "Inactive"]}   # field: [old, new]
+                    },
+                    ...
+                ]
+            }
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+            404 - No history for this id and no such person (people with no
+                  recorded changes, e.g. created before the history existed,
+                  get an empty page)
+        """
+        try:
+            person_id = int(pk)
+        except ValueError:
+            person_id = None
+        
+        changes = PersonChange.objects.filter(person_id=person_id)
+        paginator = PersonHistoryCursorPagination()
+        page = paginator.paginate_queryset(
+            changes.values('id', 'action', 'changed_at', 'changed_by', 'changes'), request, view=self
+        )
+        if not page and request.query_params.get(paginator.cursor_query_param) is None and not (
+            Person.objects.filter(pk=person_id).exists() or ArchivedPerson.objects.filter(pk=person_id).exists()
+        ):
+            return Response(
+                {"error": f"No history for employee {pk}"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        changed_at = representation_of_updated_at()
+        for row in page:
+            row['changed_at'] = changed_at(row['changed_at'])
+        return paginator.get_paginated_response(page)
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta sync - people created/updated and deleted since a sync token
+        
+        SECURITY: Requires READ permission (IsReadOnlyOrAbove)
+        Allowed roles: HR_ReadOnly, HR_ReadWrite, HR_FullAccess, Superuser
+        
+        Call once without ?since= to download everyone, then keep sending the
+        returned "next" token. While "has_more" is true, call again straight
+        away. An in-sync client gets empty lists from one index probe per
+        stream (see people/sync.py).
+        
+        Examples:
+        GET /api/employees/changes/                  - initial sync
+        GET /api/employees/changes/?since=<token>    - changes since the last call
+        GET /api/employees/changes/?since=<token>&limit=1000
+        
+        Response:
+            {
+                "changed": [{"id": 7, "full_name": "...", ...}, ...],   # upsert these
+                "deleted": [12, 31],                                    # remove these ids
+                "has_more": false,
+                "next": "eyJjIjpbIjIwMjUt..."
+            }
+        
+        Query params:
+            since - token from a previous response
+            limit - changed rows and tombstones per call, 1-5000 (default 500)
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Success
+            400 - Invalid token or limit
+            401 - Not authenticated
+            403 - Insufficient permissions (not in any HR role)
+        """
+        limit, error = self.get_bounded_int_param('limit', SYNC_DEFAULT_LIMIT, SYNC_MAX_LIMIT)
+        if error is not None:
+            return error
+        
+        try:
+            changes = people_changes(request.query_params.get('since') or None, limit)
+        except InvalidSyncToken as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response(changes, status=status.HTTP_200_OK)
+    
+    @action(detail=False, methods=['post'])
+    def bulk(self, request):
+        """
+        Create or update many people in one request (upsert on acdc_email)
+        
+        SECURITY: Requires WRITE permission (IsReadWriteOrAbove)
+        Allowed roles: HR_ReadWrite, HR_FullAccess, Superuser
+        Denied roles: HR_ReadOnly (can only view)
+        
+        Example:
+        POST /api/employees/bulk/
+        Body: [
+            {"full_name": "Jane Doe", "acdc_email": "jane@acdc.com", "department": "Design", "start_date": "2025-01-06"},
+            {"full_name": "John Roe", "acdc_email": "john@acdc.com", "department": "Sales", "start_date": "2025-01-06"}
+        ]
+        
+        Each row is a full record: when acdc_email already exists, every field
+        of that person is replaced by the row. Valid rows are written in one
+        transaction; invalid rows are skipped and listed under "errors".
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response:
+        {
+            "created": 1,
+            "updated": 1,
+            "errors": [{"index": 2, "errors": {"start_date": ["This field is required."]}}],
+            "saved_by": "hr_manager"
+        }
+        
+        Response codes:
+            201 - All rows saved
+            207 - Some rows saved, others rejected (see "errors")
+            400 - Body is not a list, too many rows, or every row rejected
+            401 - Not authenticated
+            403 - Insufficient permissions (HR_ReadOnly cannot create)
+        """
+        rows = request.data
+        
+        if not isinstance(rows, list) or not rows:
+            return Response(
+                {"error": "Request body must be a non-empty list of people"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(rows) > BULK_MAX_ROWS:
+            return Response(
+                {"error": f"Too many rows ({len(rows)}). Send at most {BULK_MAX_ROWS} per request."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        result = bulk_upsert(rows)
+        result["saved_by"] = request.user.username
+        
+        if not result["errors"]:
+            response_status = status.HTTP_201_CREATED
+        elif result["created"] or result["updated"]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+        
+        return Response(result, status=response_status)
+
+    @action(detail=False, methods=['post'], url_path='import', parser_classes=[MultiPartParser])
+    def import_roster(self, request):
+        """
+        Import a CSV or XLSX roster (upsert on acdc_email)
+
+        SECURITY: Requires WRITE permission (IsReadWriteOrAbove)
+        Allowed roles: HR_ReadWrite, HR_FullAccess, Superuser
+        Denied roles: HR_ReadOnly (can only view)
+
+        Example:
+        POST /api/employees/import/
+        Content-Type: multipart/form-data
+            file=@roster.xlsx
+        POST /api/employees/import/?report=csv    (answer with the error report instead)
+
+        The first row names the columns ("full_name" or "Full Name", ...);
+        unknown columns are ignored. Rows are validated and written in chunks
+        of 5000, one transaction per chunk, like the bulk action (see
+        people/imports.py). The format comes from the file name, or from a
+        "file_format" form field (csv, xlsx). Uploads are read from Django's
+        temporary file, not loaded into memory; for files of hundreds of
+        thousands of rows prefer `python manage.py import_people` (no
+        request timeout).
+
+        Headers:
+            Authorization: Bearer <access_token>
+
+        Response:
+        {
+            "rows": 3,
+            "created": 1,
+            "updated": 1,
+            "rejected": 1,
+            "ignored_columns": ["id"],
+            "errors": [{"line": 4, "errors": {"start_date": ["This field is required."]}}],
+            "saved_by": "hr_manager"
+        }
+        ("errors" lists the first 100 rejected rows; ?report=csv returns all of
+        them as a CSV attachment: line, errors, then the original columns)
+
+        Response codes:
+            201 - All rows saved
+            207 - Some rows saved, others rejected (see "errors")
+            400 - No file, unknown format, no Person columns, or every row rejected
+            401 - Not authenticated
+            403 - Insufficient permissions (HR_ReadOnly cannot create)
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response({"error": 'Upload the roster as the "file" form field'},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        file_format = request.data.get('file_format') or detect_format(upload.name)
+        want_report = request.query_params.get('report') == 'csv'
+        report = tempfile.SpooledTemporaryFile(mode='w+', newline='') if want_report else None
+
+        try:
+            result = import_people(upload, file_format, report=report)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        if not result["rejected"]:
+            response_status = status.HTTP_201_CREATED
+        elif result["created"] or result["updated"]:
+            response_status = status.HTTP_207_MULTI_STATUS
+        else:
+            response_status = status.HTTP_400_BAD_REQUEST
+
+        if want_report:
+            report.seek(0)
+            response = HttpResponse(report.read(), content_type='text/csv; charset=utf-8',
+                                    status=response_status)
+            report.close()
+            response['Content-Disposition'] = 'attachment; filename="import-errors.csv"'
+            return response
+
+        result["saved_by"] = request.user.username
+        return Response(result, status=response_status)
+
+    @action(detail=True, methods=['post'])
+    def restore(self, request, pk=None):
+        """
+        Move an archived person back into the people table
+
+        SECURITY: Requires WRITE permission (IsReadWriteOrAbove)
+        Allowed roles: HR_ReadWrite, HR_FullAccess, Superuser
+        Denied roles: HR_ReadOnly (can only view)
+
+        Example:
+        POST /api/employees/42/restore/
+
+        The person keeps their id and created_at; the restore is recorded as a
+        create in their history. Their manager is kept if still in the people
+        table. Update their end_date/status if they are back for good - the
+        archive pass moves departed people again after PEOPLE_ARCHIVE_AFTER_DAYS
+        without changes (see people/archive.py).
+
+        Headers:
+            Authorization: Bearer <access_token>
+
+        Response:
+        {
+            "message": "Employee Jane Doe restored from the archive",
+            "restored_by": "hr_manager",
+            "person": {...}
+        }
+
+        Response codes:
+            200 - Restored
+            401 - Not authenticated
+            403 - Insufficient permissions (HR_ReadOnly cannot restore)
+            404 - No archived person with this id
+            409 - Their acdc_email or personal_email now belongs to someone else
+        """
+        try:
+            person = restore_person(int(pk))
+        except RestoreConflict as e:
+            return Response({"error": str(e)}, status=status.HTTP_409_CONFLICT)
+        except (ValueError, ArchivedPerson.DoesNotExist):
+            return Response({"error": f"No archived employee with id {pk}"}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response({
+            "message": f"Employee {person.full_name} restored from the archive",
+            "restored_by": request.user.username,
+            "person": PersonSerializer(person).data,
+        }, status=status.HTTP_200_OK)
+
     @action(detail=False, methods=['delete'])
     def delete_by_identifier(self, request):
         """
@@ -150,7 +1184,7 @@ class PersonViewSet(viewsets.ModelViewSet):
         
         # Prefer email if both are provided (more reliable identifier)
         if email:
-            person = get_object_or_404(Person, acdc_email__iexact=email)
+            person = get_object_or_404(Person.objects.matching(acdc_email=email))
             deleted_name = person.full_name
             person.delete()
             return Response(
@@ -164,7 +1198,7 @@ class PersonViewSet(viewsets.ModelViewSet):
         # Search by full name
         if full_name:
             # Case-insensitive search
-            matching_people = Person.objects.filter(full_name__iexact=full_name)
+            matching_people = Person.objects.matching(full_name=full_name)
             
             if matching_people.count() == 0:
                 return Response(
@@ -242,7 +1276,7 @@ class PersonViewSet(viewsets.ModelViewSet):
         
         # Prefer email if both provided
         if email:
-            person = get_object_or_404(Person, acdc_email__iexact=email)
+            person = get_object_or_404(Person.objects.matching(acdc_email=email))
             
             serializer = self.get_serializer(person, data=request.data, partial=True)
             
@@ -258,7 +1292,7 @@ class PersonViewSet(viewsets.ModelViewSet):
         
         # Update by full name
         if full_name:
-            matching_people = Person.objects.filter(full_name__iexact=full_name)
+            matching_people = Person.objects.matching(full_name=full_name)
             
             if matching_people.count() == 0:
                 return Response(
@@ -295,4 +1329,106 @@ class PersonViewSet(viewsets.ModelViewSet):
                     "updated_data": serializer.data
                 })
             
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    
+    @action(detail=False, methods=['patch'])
+    def bulk_update_by_identifier(self, request):
+        """
+        Apply the same changes to many people identified by ACDC email and/or full name
+        
+        SECURITY: Requires WRITE permission (IsReadWriteOrAbove)
+        Allowed roles: HR_ReadWrite, HR_FullAccess, Superuser
+        Denied roles: HR_ReadOnly (can only view)
+        
+        Example:
+        PATCH /api/employees/bulk_update_by_identifier/
+        Body: {
+            "emails": ["john.doe@acdc.com", "jane.doe@acdc.com"],
+            "full_names": ["Sam Smith"],
+            "changes": {"status": "inactive", "end_date": "2025-06-30"}
+        }
+        
+        All identifiers are resolved in one query and the changes are written
+        with a single UPDATE. Names that match several people are reported as
+        "ambiguous" (with matches, like the 409 of update_by_identifier) and skipped.
+        acdc_email and personal_email cannot be changed in bulk.
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Every identifier matched and was updated
+            207 - Some identifiers updated, others not_found/ambiguous/invalid (see "results")
+            400 - Missing identifiers, invalid changes or no updatable field in them
+            401 - Not authenticated
+            403 - Insufficient permissions (HR_ReadOnly cannot update)
+            404 - No identifier matched anyone
+            409 - Nothing updated because identifiers were ambiguous
+        """
+        emails, full_names, error_response = self.get_identifier_lists(request)
+        if error_response:
+            return error_response
+        
+        changes, errors = validate_bulk_changes(request.data.get('changes'))
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        people, results = resolve_identifiers(emails, full_names)
+        updated = bulk_update_people(people, results, changes)
+        
+        return Response(
+            {
+                "updated": updated,
+                "results": results,
+                "updated_by": request.user.username
+            },
+            status=self.bulk_identifier_status(results, updated)
+        )
+    
+    @action(detail=False, methods=['delete'])
+    def bulk_delete_by_identifier(self, request):
+        """
+        Delete many people identified by ACDC email and/or full name
+        
+        SECURITY: Requires DELETE permission (IsFullAccessUser)
+        Allowed roles: HR_FullAccess, Superuser ONLY
+        Denied roles: HR_ReadOnly, HR_ReadWrite
+        
+        Example:
+        DELETE /api/employees/bulk_delete_by_identifier/
+        Body: {
+            "emails": ["john.doe@acdc.com"],
+            "full_names": ["Sam Smith", "Alex Lee"]
+        }
+        
+        All identifiers are resolved in one query and the matching rows are
+        removed with a single DELETE. Names that match several people are
+        reported as "ambiguous" (with matches) and nobody with that name is deleted.
+        
+        Headers:
+            Authorization: Bearer <access_token>
+        
+        Response codes:
+            200 - Every identifier matched and was deleted
+            207 - Some identifiers deleted, others not_found/ambiguous (see "results")
+            400 - Missing identifiers
+            401 - Not authenticated
+            403 - Insufficient permissions (not HR_FullAccess)
+            404 - No identifier matched anyone
+            409 - Nothing deleted because identifiers were ambiguous
+        """
+        emails, full_names, error_response = self.get_identifier_lists(request)
+        if error_response:
+            return error_response
+        
+        people, results = resolve_identifiers(emails, full_names)
+        deleted = bulk_delete_people(people)
+        
+        return Response(
+            {
+                "deleted": deleted,
+                "results": results,
+                "deleted_by": request.user.username
+            },
+            status=self.bulk_identifier_status(results, deleted)
+        )